@@ -0,0 +1,84 @@
+"""
+Batch-scoring benchmark: rescoring a Fraud_Data-shaped CSV (and the same
+rows as Parquet) with an XGBoost inference bundle. The ad-hoc way - load_data
+the whole file, FraudPreprocessor.transform, ModelTrainer.predict_proba in one
+process - versus score_file (src.services.batch_scoring) with 1, 2, 4, ...
+worker processes: wall time, rows/s, speedup and parallel efficiency over
+one worker, and the time to resume a run with half its partitions missing.
+
+Usage:
+    python -m benchmarks.bench_batch_scoring [--rows 2000000] [--partition-rows 200000] [--workers 1 2 4]
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.batch_scoring import score_file
+from src.services.inference_bundle import save_bundle
+from src.utils.utils import load_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--train-rows', type=int, default=100_000)
+    parser.add_argument('--partition-rows', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='worker counts to run (defaults to powers of two up to the core count)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    cores = os.cpu_count() or 1
+    workers = args.workers or [2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores]
+
+    df = make_fraud_data(args.rows)
+    X, y = df.drop(columns='class'), df['class']
+    pre = FraudPreprocessor(mode='fraud_data').fit(X[:args.train_rows], y[:args.train_rows])
+    trainer = ModelTrainer('gbm')
+    trainer.train(pre.transform(X[:args.train_rows]), y[:args.train_rows])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = save_bundle(os.path.join(tmp, 'xgboost_fraud.bundle'), pre, trainer)
+        csv_path, parquet_path = os.path.join(tmp, 'transactions.csv'), os.path.join(tmp, 'transactions.parquet')
+        X.to_csv(csv_path, index=False)
+        X.to_parquet(parquet_path, index=False, row_group_size=args.partition_rows)
+        del df, X, y
+        print(f"{args.rows} rows, {os.path.getsize(csv_path) / 2**20:.0f} MiB CSV, {cores} cores")
+
+        start = time.perf_counter()
+        frame = load_data(csv_path)
+        trainer.predict_proba(pre.transform(frame))
+        adhoc = time.perf_counter() - start
+        del frame
+
+        print(f"\n{'input':>8} {'scorer':>18} {'seconds':>8} {'rows/s':>11} {'speedup':>8} {'efficiency':>11}")
+        print(f"{'csv':>8} {'ad hoc (1 proc)':>18} {adhoc:>8.2f} {args.rows / adhoc:>11,.0f}")
+        for name, path in (('csv', csv_path), ('parquet', parquet_path)):
+            base = None
+            for n in workers:
+                output = os.path.join(tmp, f'scores_{name}_{n}')
+                summary = score_file(bundle, path, output, workers=n, partition_rows=args.partition_rows)
+                base = base or summary['seconds']
+                speedup = base / summary['seconds']
+                print(f"{name:>8} {f'score_file x{n}':>18} {summary['seconds']:>8.2f} "
+                      f"{summary['rows_per_s']:>11,.0f} {speedup:>8.2f} {speedup * workers[0] / n:>11.0%}")
+                if n != workers[-1]:
+                    shutil.rmtree(output)
+
+        # Resume: half of the last run's part files lost in a crash
+        parts = sorted(p for p in os.listdir(output) if p.startswith('part-'))
+        for part in parts[::2]:
+            os.remove(os.path.join(output, part))
+        summary = score_file(bundle, parquet_path, output, workers=workers[-1], partition_rows=args.partition_rows)
+        print(f"\nresume with {len(parts[::2])}/{len(parts)} partitions missing: {summary['seconds']:.2f} s "
+              f"({summary['rows']} rows rescored, {summary['skipped']} partitions skipped)")
+
+
+if __name__ == '__main__':
+    main()
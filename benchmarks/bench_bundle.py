@@ -0,0 +1,69 @@
+"""
+Cold-start benchmark for inference bundles: builds a bundle from synthetic
+fraud data, then measures in fresh subprocesses how long it takes to import,
+load the bundle and score the first transaction, with and without mmap.
+
+Usage:
+    python -m benchmarks.bench_bundle [--rows 50000] [--runs 5]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import save_bundle
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from src.services.inference_bundle import load_bundle
+bundle = load_bundle(sys.argv[1], mmap=sys.argv[2] == '1')
+bundle.score([json.loads(sys.argv[3])])
+print(json.dumps({'total_s': time.perf_counter() - start,
+                  'load_s': bundle.load_time_s,
+                  'rss_delta_mib': bundle.rss_delta_bytes / 2**20}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger('src').setLevel(logging.WARNING)
+
+    df = make_fraud_data(args.rows)
+    X, y = df.drop(columns='class'), df['class']
+    pre = FraudPreprocessor(mode='fraud_data').fit(X, y)
+    trainer = ModelTrainer('gbm')
+    trainer.train(pre.transform(X), y)
+    record = json.dumps(X.iloc[0].to_dict(), default=lambda v: v.item())
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = save_bundle(os.path.join(tmp, 'xgboost_fraud.bundle'), pre, trainer)
+
+        print(f"{'mmap':>5} {'cold start ms':>14} {'load ms':>9} {'rss MiB':>8}")
+        for mmap in ('1', '0'):
+            results = []
+            for _ in range(args.runs):
+                out = subprocess.run([sys.executable, '-c', COLD_START, path, mmap, record],
+                                     cwd=root, capture_output=True, text=True, check=True)
+                results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+            total = np.median([r['total_s'] for r in results]) * 1000
+            load = np.median([r['load_s'] for r in results]) * 1000
+            rss = np.median([r['rss_delta_mib'] for r in results])
+            print(f"{mmap:>5} {total:>14.1f} {load:>9.2f} {rss:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
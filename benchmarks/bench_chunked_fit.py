@@ -0,0 +1,64 @@
+"""
+Peak-memory benchmark of the in-memory training preparation path
+(load_data -> clean_data -> FraudPreprocessor.fit) versus the chunked path
+(load_data_chunks -> clean_data_chunks -> FraudPreprocessor.fit_chunks).
+Each path runs in its own subprocess so peak RSS is measured independently.
+
+Usage:
+    python -m benchmarks.bench_chunked_fit [--rows 1000000] [--chunksize 100000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import make_fraud_data
+
+FEATURE_COLUMNS = ['purchase_value', 'device_id', 'source', 'browser', 'sex', 'age', 'class', 'country',
+                   'purchase_hour', 'purchase_dayofweek', 'time_since_signup', 'user_txn_count',
+                   'user_txn_velocity']
+
+RUNNER = """
+import json, logging, sys
+logging.disable(logging.INFO)
+from benchmarks.common import PeakRSS
+from config.settings import FRAUD_FEATURE_DTYPES
+from src.core.DataTransformer import FraudPreprocessor
+from src.utils.utils import load_data, clean_data, load_data_chunks, clean_data_chunks
+
+path, mode, chunksize = sys.argv[1], sys.argv[2], int(sys.argv[3])
+with PeakRSS() as peak:
+    if mode == 'full':
+        df = clean_data(load_data(path))
+        FraudPreprocessor().fit(df.drop(columns='class'), df['class'])
+    else:
+        chunks = clean_data_chunks(load_data_chunks(path, chunksize=chunksize, dtype=FRAUD_FEATURE_DTYPES))
+        FraudPreprocessor().fit_chunks(chunks)
+print(json.dumps({'seconds': peak.seconds, 'peak_rss_mib': peak.peak_mib}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'fraud.csv')
+        make_fraud_data(args.rows)[FEATURE_COLUMNS].to_csv(path, index=False)
+        print(f"{args.rows} rows, CSV size {os.path.getsize(path) / 2**20:.1f} MiB")
+
+        print(f"{'path':>8} {'seconds':>8} {'peak RSS MiB':>13}")
+        for mode in ('full', 'chunked'):
+            out = subprocess.run([sys.executable, '-c', RUNNER, path, mode, str(args.chunksize)],
+                                 cwd=root, capture_output=True, text=True, check=True)
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{mode:>8} {result['seconds']:>8.2f} {result['peak_rss_mib']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
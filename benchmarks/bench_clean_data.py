@@ -0,0 +1,88 @@
+"""
+clean_data on synthetic Fraud_Data-shaped frames (raw columns, 1% duplicate
+rows, 0.5% rows with nulls): the previous implementation (copy, dropna,
+drop_duplicates, format-inferring pd.to_datetime) versus the row-hash
+clean_data with datetime64 and int64 epoch time columns, and
+clean_data_chunks over 10^6-row chunks. Each variant runs in its own
+subprocess and reports time, rows/s and peak RSS growth. 10^7 rows need
+about 12 GiB of memory.
+
+Usage:
+    python -m benchmarks.bench_clean_data [--rows 10000000]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+RUNNER = """
+import json, logging, sys, time
+import numpy as np
+import pandas as pd
+logging.disable(logging.INFO)
+from benchmarks.common import PeakRSS
+from benchmarks.synthetic import make_fraud_data
+from src.utils.utils import clean_data, clean_data_chunks
+
+RAW_COLUMNS = ['user_id', 'signup_time', 'purchase_time', 'purchase_value', 'device_id', 'source',
+               'browser', 'sex', 'age', 'ip_address', 'class']
+TIME_COLUMNS = ['signup_time', 'purchase_time']
+
+
+def previous_clean_data(df, time_column=[]):
+    df_temp = df.copy()
+    df_temp.dropna(inplace=True)
+    df_temp.drop_duplicates(inplace=True)
+    for col in time_column:
+        if col in df_temp.columns:
+            df_temp[col] = pd.to_datetime(df_temp[col])
+    return df_temp
+
+
+variant, n_rows = sys.argv[1], int(sys.argv[2])
+rng = np.random.default_rng(0)
+df = make_fraud_data(n_rows)[RAW_COLUMNS]
+df = pd.concat([df, df.iloc[rng.integers(0, n_rows, n_rows // 100)]], ignore_index=True)
+for col in ('browser', 'signup_time'):
+    df.loc[rng.integers(0, len(df), n_rows // 400), col] = None
+
+with PeakRSS() as peak:
+    start = time.perf_counter()
+    if variant == 'previous':
+        out = previous_clean_data(df, TIME_COLUMNS)
+    elif variant == 'epoch':
+        out = clean_data(df, TIME_COLUMNS, epoch=True)
+    elif variant == 'chunks':
+        chunks = (df.iloc[i:i + 1_000_000] for i in range(0, len(df), 1_000_000))
+        out = pd.concat(clean_data_chunks(chunks, TIME_COLUMNS))
+    else:
+        out = clean_data(df, TIME_COLUMNS)
+    seconds = time.perf_counter() - start
+print(json.dumps({'rows_in': len(df), 'rows_out': len(out), 'seconds': seconds, 'peak_mib': peak.peak_mib}))
+"""
+
+VARIANTS = {
+    'previous clean_data': 'previous',
+    'clean_data': 'datetime',
+    'clean_data (epoch)': 'epoch',
+    'clean_data_chunks': 'chunks',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows before injected duplicates")
+    print(f"{'variant':>20} {'rows out':>10} {'seconds':>8} {'rows/s':>12} {'peak MiB':>9}")
+    for name, variant in VARIANTS.items():
+        proc = subprocess.run([sys.executable, '-c', RUNNER, variant, str(args.rows)],
+                              capture_output=True, text=True, check=True)
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{name:>20} {r['rows_out']:>10} {r['seconds']:>8.2f} {r['rows_in'] / r['seconds']:>12,.0f} "
+              f"{r['peak_mib']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Load-time and memory benchmark: load_data from CSV versus the content-hashed
+Parquet cache (cold build, warm full read and column-projected read) for
+credit-card-like and fraud-like datasets.
+
+Usage:
+    python -m benchmarks.bench_data_cache [--creditcard-rows 284807] [--fraud-rows 151112]
+"""
+import argparse
+import logging
+import os
+import tempfile
+
+from benchmarks.common import PeakRSS
+from benchmarks.synthetic import make_creditcard_data, make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.utils.utils import load_data
+
+FRAUD_COLUMNS = ['purchase_value', 'device_id', 'source', 'browser', 'sex', 'age', 'class', 'country',
+                 'purchase_hour', 'purchase_dayofweek', 'time_since_signup', 'user_txn_count',
+                 'user_txn_velocity']
+
+
+def report(label, path, **kwargs):
+    with PeakRSS() as peak:
+        df = load_data(path, **kwargs)
+    frame_mib = df.memory_usage(deep=True).sum() / 2**20
+    print(f"{label:>24} {peak.seconds:>8.3f} {peak.peak_mib:>10.1f} {frame_mib:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--creditcard-rows', type=int, default=284_807)
+    parser.add_argument('--fraud-rows', type=int, default=151_112)
+    args = parser.parse_args()
+
+    logging.getLogger('src').setLevel(logging.WARNING)
+
+    datasets = (
+        ('creditcard', make_creditcard_data(args.creditcard_rows), 'creditcard_data', 'Class'),
+        ('fraud', make_fraud_data(args.fraud_rows)[FRAUD_COLUMNS], 'fraud_data', 'class'),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, df, mode, target in datasets:
+            path = os.path.join(tmp, f'{name}.csv')
+            df.to_csv(path, index=False)
+            columns = FraudPreprocessor(mode=mode).input_columns() + [target]
+
+            print(f"\n{name}: {len(df)} rows, CSV {os.path.getsize(path) / 2**20:.1f} MiB")
+            print(f"{'path':>24} {'seconds':>8} {'peak MiB':>10} {'frame MiB':>10}")
+            report('csv', path)
+            report('csv, projected', path, columns=columns)
+            report('cache (cold build)', path, cache=True)
+            report('cache (warm)', path, cache=True)
+            report('cache (warm, projected)', path, columns=columns, cache=True)
+
+
+if __name__ == '__main__':
+    main()
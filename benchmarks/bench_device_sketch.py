@@ -0,0 +1,91 @@
+"""
+Device-id frequency encoding benchmark on high-cardinality synthetic data:
+the original value_counts dict, the exact array-backed FrequencyEncoder and
+the bounded-memory CountMinFrequencyEncoder (top-K table + count-min sketch).
+Reports fit time, lookup throughput, peak memory during fit, the retained
+footprint of each structure (keys, values and containers) and the
+sketch's frequency error against the exact encoding.
+
+Usage:
+    python -m benchmarks.bench_device_sketch [--devices 10000000] [--memory-mb 64] [--top-k 100000]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import PeakRSS
+from src.core.encoders import CountMinFrequencyEncoder, FrequencyEncoder
+
+
+def make_device_ids(n_rows, n_devices, seed=42):
+    rng = np.random.default_rng(seed)
+    # Mostly one-off devices with a heavy head of shared ones
+    idx = np.where(rng.random(n_rows) < 0.2, np.minimum(rng.zipf(1.2, n_rows), n_devices),
+                   rng.integers(0, n_devices, n_rows))
+    return pd.Series(np.char.add('DEV', idx.astype(str)), dtype=object)
+
+
+def footprint_mib(encoder):
+    """Deep size of the retained encoding structure, in MiB."""
+    if isinstance(encoder, dict):
+        size = sys.getsizeof(encoder) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in encoder.items())
+    elif isinstance(encoder, CountMinFrequencyEncoder):
+        size = encoder.sketch.nbytes + sys.getsizeof(encoder.heavy) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in encoder.heavy.items())
+    else:
+        size = (sys.getsizeof(encoder._slots) + sys.getsizeof(encoder._keys)
+                + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in encoder._slots.items())
+                + encoder._counts.nbytes)
+    return size / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--devices', type=int, default=10_000_000)
+    parser.add_argument('--rows', type=int, default=None, help='defaults to --devices')
+    parser.add_argument('--memory-mb', type=float, default=64)
+    parser.add_argument('--top-k', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    keys = make_device_ids(args.rows or args.devices, args.devices)
+    queries = keys.sample(min(args.queries, len(keys)), random_state=0).to_numpy()
+    print(f"{len(keys)} rows, {keys.nunique()} distinct devices")
+
+    encoders = {
+        'dict (value_counts)': lambda: keys.value_counts(normalize=True).to_dict(),
+        'FrequencyEncoder': lambda: FrequencyEncoder().partial_fit(keys),
+        'CountMinFrequencyEncoder': lambda: CountMinFrequencyEncoder(
+            top_k=args.top_k, memory_mb=args.memory_mb).partial_fit(keys),
+    }
+    lookups = {
+        'dict (value_counts)': lambda enc: pd.Series(queries).map(enc).fillna(0).to_numpy(),
+        'FrequencyEncoder': lambda enc: enc.lookup(queries, 0.0),
+        'CountMinFrequencyEncoder': lambda enc: enc.lookup(queries, 0.0),
+    }
+
+    print(f"{'encoder':>26} {'fit s':>7} {'fit peak MiB':>13} {'footprint MiB':>14} {'lookup M/s':>11}")
+    results = {}
+    for name, build in encoders.items():
+        with PeakRSS() as peak:
+            encoder = build()
+        start = time.perf_counter()
+        results[name] = lookups[name](encoder)
+        lookup_s = time.perf_counter() - start
+        print(f"{name:>26} {peak.seconds:>7.2f} {peak.peak_mib:>13.1f} {footprint_mib(encoder):>14.1f} "
+              f"{len(queries) / lookup_s / 1e6:>11.2f}")
+        if isinstance(encoder, CountMinFrequencyEncoder):
+            sketch = encoder
+        del encoder
+
+    error = results['CountMinFrequencyEncoder'] - results['FrequencyEncoder']
+    print(f"\nsketch: {sketch.depth}x{sketch.width} ({sketch.nbytes / 2**20:.1f} MiB), "
+          f"top-K table {len(sketch.heavy)} keys, epsilon bound {sketch.epsilon:.2e}")
+    print(f"frequency error: mean {error.mean():.2e}, p99 {np.percentile(error, 99):.2e}, max {error.max():.2e}")
+
+
+if __name__ == '__main__':
+    main()
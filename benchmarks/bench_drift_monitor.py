@@ -0,0 +1,66 @@
+"""
+Overhead of DriftMonitor on the scoring path: per-row cost of
+transform_batch + predict_proba with and without monitor.update (flushes
+included, amortized) at several batch sizes, monitoring every row and every
+10th row, plus the cost of report().
+
+Usage:
+    python -m benchmarks.bench_drift_monitor [--rows 200000] [--score-rows 20000]
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.core.drift import DriftMonitor
+from src.models.model_trainer import ModelTrainer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--score-rows', type=int, default=20_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    df = make_fraud_data(args.rows)
+    X, y = df.drop(columns='class'), df['class']
+    pre = FraudPreprocessor(mode='fraud_data').fit(X, y)
+    trainer = ModelTrainer('logistic_regression')
+    trainer.train(pre.transform(X, output='float32'), y)
+    records = make_fraud_data(args.score_rows, seed=7).drop(columns='class').to_dict(orient='records')
+
+    def run(batch_size, monitor):
+        start = time.perf_counter()
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            if monitor is not None:
+                monitor.update(batch)
+            trainer.predict_proba(pre.transform_batch(batch))
+        if monitor is not None:
+            monitor.flush()
+        return (time.perf_counter() - start) / len(records) * 1e6
+
+    print(f"{len(records)} scored rows, reference fitted on {args.rows} rows")
+    print(f"{'batch':>6} {'sample':>7} {'scoring us/row':>15} {'+ monitor us/row':>17} {'overhead':>9}")
+    for batch_size in (1, 64, 1024):
+        for sample_every in (1, 10):
+            # Interleaved repeats, best of each, so both sides see the same machine noise
+            base, monitored = [], []
+            for _ in range(5):
+                base.append(run(batch_size, None))
+                monitored.append(run(batch_size, DriftMonitor.from_preprocessor(pre, sample_every=sample_every)))
+            base, monitored = min(base), min(monitored)
+            print(f"{batch_size:>6} {f'1/{sample_every}':>7} {base:>15.1f} {monitored:>17.1f} "
+                  f"{(monitored - base) / base:>9.1%}")
+
+    monitor = DriftMonitor.from_preprocessor(pre)
+    monitor.update(records)
+    start = time.perf_counter()
+    report = monitor.report()
+    print(f"report(): {(time.perf_counter() - start) * 1000:.1f} ms, drifted columns: {report['drifted']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Evaluation benchmark at credit-card scale: the previous evaluate_model path
+(one sklearn call per metric, classification_report and roc_curve) versus
+the single-pass ScoreEvaluator, and a threshold sweep done with one
+confusion_matrix call per threshold versus ScoreEvaluator.threshold_sweep
+over every distinct score. No plots are rendered in either path.
+
+Usage:
+    python -m benchmarks.bench_evaluation [--rows 284807] [--thresholds 200]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import time
+
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score, auc, average_precision_score, classification_report, confusion_matrix,
+    f1_score, precision_score, recall_score, roc_auc_score, roc_curve,
+)
+
+from src.utils.evaluation import ScoreEvaluator
+from src.utils.training_and_evaluation_utils import evaluate_model
+
+
+def sklearn_evaluate(y_true, y_pred, y_proba):
+    """The metric passes evaluate_model made before it used ScoreEvaluator."""
+    metrics = {
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred),
+        "recall": recall_score(y_true, y_pred),
+        "f1": f1_score(y_true, y_pred),
+        "roc_auc": roc_auc_score(y_true, y_proba),
+        "average_precision": average_precision_score(y_true, y_proba),
+    }
+    classification_report(y_true, y_pred)
+    fpr, tpr, _ = roc_curve(y_true, y_proba)
+    auc(fpr, tpr)
+    return metrics
+
+
+def timed(fn, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=284_807)
+    parser.add_argument("--thresholds", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(42)
+    y_true = (rng.random(args.rows) < 0.0017).astype(np.int64)
+    y_proba = np.clip(rng.beta(1, 20, args.rows) + 0.6 * y_true * rng.random(args.rows), 0, 1).astype(np.float32)
+    y_pred = (y_proba > 0.5).astype(np.int64)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        old_s, old = timed(lambda: sklearn_evaluate(y_true, y_pred, y_proba))
+        new_s, new = timed(lambda: evaluate_model(y_true, y_pred, y_proba, plot=False))
+    assert all(np.isclose(old[k], new[k]) for k in old)
+    print(f"{args.rows} rows, {y_true.sum()} positives")
+    print(f"evaluate_model   sklearn passes: {old_s * 1000:8.1f} ms   single pass: {new_s * 1000:8.1f} ms "
+          f"({old_s / new_s:.1f}x)")
+
+    grid = np.linspace(0, 1, args.thresholds)
+    loop_s, _ = timed(lambda: [confusion_matrix(y_true, (y_proba >= t).astype(int)).ravel() for t in grid], repeat=1)
+    evaluator = ScoreEvaluator(y_true, y_proba)
+    sweep_s, sweep = timed(lambda: ScoreEvaluator(y_true, y_proba).operating_points(cost_fp=1, cost_fn=50))
+    n_distinct = len(evaluator.thresholds)
+    print(f"threshold sweep  confusion_matrix x {args.thresholds}: {loop_s * 1000:8.1f} ms   "
+          f"all {n_distinct} thresholds (incl. sort): {sweep_s * 1000:8.1f} ms")
+    print(f"min-cost threshold (FN = 50 x FP): {sweep['min_cost']['threshold']:.4f}, "
+          f"cost {sweep['min_cost']['cost']}, recall {sweep['min_cost']['recall']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Throughput benchmark of UserFeatureStore: vectorized replay of an event
+history (events/s) and per-event online features() calls, plus snapshot and
+restore times.
+
+Usage:
+    python -m benchmarks.bench_feature_store [--events 5000000] [--users 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.core.feature_store import UserFeatureStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=5_000_000)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--online-events', type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    start_ts = 1_420_070_400  # 2015-01-01
+    users = rng.integers(0, args.users, args.events)
+    times = start_ts + np.sort(rng.integers(0, 120 * 86400, args.events))
+    signups = times - rng.integers(60, 90 * 86400, args.events)
+
+    store = UserFeatureStore()
+    start = time.perf_counter()
+    store.replay(users, times, signups)
+    replay_s = time.perf_counter() - start
+
+    live_users = rng.integers(0, args.users, args.online_events).tolist()
+    live_times = (times[-1] + np.arange(args.online_events)).tolist()
+    start = time.perf_counter()
+    for user_id, ts in zip(live_users, live_times):
+        store.features(user_id, ts)
+    online_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'feature_store.npz')
+        start = time.perf_counter()
+        store.snapshot(path)
+        snapshot_s = time.perf_counter() - start
+        start = time.perf_counter()
+        UserFeatureStore.restore(path)
+        restore_s = time.perf_counter() - start
+        size_mib = os.path.getsize(path) / 2**20
+
+    print(f"{args.events} events, {len(store)} users")
+    print(f"replay:   {replay_s:.2f} s  ({args.events / replay_s / 1e6:.2f} M events/s)")
+    print(f"online:   {online_s / args.online_events * 1e6:.2f} us/event  "
+          f"({args.online_events / online_s / 1e3:.0f} k events/s)")
+    print(f"snapshot: {snapshot_s:.2f} s ({size_mib:.1f} MiB), restore: {restore_s:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Incremental retraining benchmark: a week of newly labelled Fraud_Data-shaped
+transactions arrives after the models were trained on the history, with a
+new fraud pattern (a fraud ring in a few countries). Compares, per model
+(training script grids, halving search), the previous model as it was, the
+warm-start update (FraudPreprocessor.partial_fit + ModelTrainer.train_incremental)
+and a full rebuild (preprocessor fit + search on history + new rows): wall time
+and ROC AUC on held-out rows of the new week.
+
+Usage:
+    python -m benchmarks.bench_incremental [--rows 200000] [--week-rows 20000] [--max-rounds 50]
+"""
+import argparse
+import copy
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_fraud_data
+from config.settings import TRAINING_CONFIG
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.utils.evaluation import ScoreEvaluator
+from src.utils.training_and_evaluation_utils import train_test_split_data
+
+
+def make_data(n_rows, seed, fraud_ring=False):
+    """Synthetic fraud data whose label depends on signup recency, amount and source (and the ring)."""
+    df = make_fraud_data(n_rows, seed=seed)
+    rng = np.random.default_rng(seed)
+    logit = (-3.2 + 3.0 * (df['time_since_signup'] < 240) + 0.01 * (df['purchase_value'] - 80)
+             + 0.8 * (df['source'] == 'Direct'))
+    if fraud_ring:
+        logit = logit + 2.5 * df['country'].isin([f'Country{i}' for i in range(5, 10)])
+    df['class'] = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(np.int64)
+    return df
+
+
+def auc(y, scores):
+    return ScoreEvaluator(y, scores).roc_auc()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--week-rows', type=int, default=20_000)
+    parser.add_argument('--max-rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings('ignore')
+    history, week = make_data(args.rows, seed=1), make_data(args.week_rows, seed=2, fraud_ring=True)
+    X_hist, y_hist = history.drop(columns='class'), history['class']
+    X_week, y_week = week.drop(columns='class'), week['class']
+    X_update, X_val, y_update, y_val = train_test_split_data(X_week, y_week, test_size=0.3, stratify=y_week)
+
+    pre = FraudPreprocessor(mode='fraud_data').fit(X_hist, y_hist)
+    X_hist_sampled, y_hist_sampled = pre.sample(pre.transform(X_hist), y_hist)
+    updated_pre = copy.deepcopy(pre)
+    start = time.perf_counter()
+    updated_pre.partial_fit(X_update, y_update)
+    encodings_seconds = time.perf_counter() - start
+    print(f"history {args.rows} rows, new week {len(y_update)} rows (+{len(y_val)} validation), "
+          f"encodings updated in {encodings_seconds * 1000:.1f} ms")
+
+    print(f"\n{'model':>20} {'variant':>26} {'seconds':>9} {'val AUC':>8}")
+    for name in ('logistic_regression', 'xgboost'):
+        model_config = TRAINING_CONFIG['models'][name]
+        search = {'param_grid': model_config['param_grid'], 'search_type': model_config['search_type']}
+
+        start = time.perf_counter()
+        trainer = ModelTrainer(model_config['model'])
+        trainer.train(X_hist_sampled, y_hist_sampled, **search)
+        previous_seconds = time.perf_counter() - start
+        previous_auc = auc(y_val, trainer.predict_proba(pre.transform(X_val)))
+
+        start = time.perf_counter()
+        X_new, y_new = updated_pre.sample(updated_pre.transform(X_update), y_update)
+        report = trainer.train_incremental(X_new, y_new, updated_pre.transform(X_val), y_val,
+                                           max_rounds=args.max_rounds)
+        incremental_seconds = time.perf_counter() - start + encodings_seconds
+
+        start = time.perf_counter()
+        X_all, y_all = pd.concat([X_hist, X_update]), pd.concat([y_hist, y_update])
+        full_pre = FraudPreprocessor(mode='fraud_data').fit(X_all, y_all)
+        full = ModelTrainer(model_config['model'])
+        full.train(*full_pre.sample(full_pre.transform(X_all), y_all), **search)
+        full_seconds = time.perf_counter() - start
+        full_auc = auc(y_val, full.predict_proba(full_pre.transform(X_val)))
+
+        for variant, seconds, score in (('previous model', previous_seconds, previous_auc),
+                                        (f"warm start ({report['mode']})", incremental_seconds, report['auc']),
+                                        ('full rebuild', full_seconds, full_auc)):
+            print(f"{name:>20} {variant:>26} {seconds:>9.2f} {score:>8.4f}")
+
+
+if __name__ == '__main__':
+    main()
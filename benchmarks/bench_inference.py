@@ -0,0 +1,57 @@
+"""
+Micro-benchmark of per-row scoring latency: FraudPreprocessor.transform
+(pandas + ColumnTransformer) versus the compiled transform_batch path.
+
+Usage:
+    python -m benchmarks.bench_inference [--rows 20000] [--repeats 200]
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+
+BATCH_SIZES = (1, 64, 4096)
+
+
+def per_row_latencies(fn, batch, batch_size, repeats):
+    """Returns per-row latencies in microseconds over `repeats` calls."""
+    samples = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(batch)
+        samples[i] = (time.perf_counter() - start) / batch_size * 1e6
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    logging.getLogger('src').setLevel(logging.WARNING)
+
+    df = make_fraud_data(args.rows)
+    X, y = df.drop(columns='class'), df['class']
+    pre = FraudPreprocessor(mode='fraud_data').fit(X, y)
+
+    print(f"{'batch':>6} {'path':>10} {'p50 us/row':>12} {'p99 us/row':>12}")
+    for batch_size in BATCH_SIZES:
+        frame = X.iloc[:batch_size]
+        records = frame.to_dict(orient='records')
+        repeats = max(5, args.repeats // max(1, batch_size // 64))
+
+        assert np.array_equal(pre.transform(frame).to_numpy(), pre.transform_batch(records))
+
+        for name, fn, batch in (('transform', pre.transform, frame),
+                                ('compiled', pre.transform_batch, records)):
+            lat = per_row_latencies(fn, batch, batch_size, repeats)
+            print(f"{batch_size:>6} {name:>10} {np.percentile(lat, 50):>12.2f} {np.percentile(lat, 99):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Cost of the instrumentation layer: a @profiled no-op call with the profiler
+disabled versus a plain call, per-transaction transform_for_inference latency
+with INFO logging on every call versus sampled logging, and the overhead of
+an enabled profiler (timing only, and with tracemalloc peak memory) on
+1-row and 10k-row transform() calls. Log output goes to os.devnull.
+
+Usage:
+    python -m benchmarks.bench_instrumentation [--rows 100000] [--calls 20000]
+"""
+import argparse
+import logging
+import os
+import time
+
+import src.core.DataTransformer as data_transformer
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.utils.profiling import profiled, profiler
+
+
+def plain(x):
+    return x
+
+
+@profiled("noop")
+def decorated(x):
+    return x
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--calls', type=int, default=20_000)
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.StreamHandler(open(os.devnull, 'w')))
+    root.setLevel(logging.INFO)
+
+    df = make_fraud_data(args.rows)
+    X, y = df.drop(columns='class'), df['class']
+    pre = FraudPreprocessor(mode='fraud_data').fit(X, y)
+    record = X.iloc[0].to_dict()
+
+    print(f"{'measurement':>46} {'us/call':>9}")
+    n = args.calls * 50
+    print(f"{'plain function call':>46} {per_call_us(lambda: plain(1), n):>9.3f}")
+    print(f"{'@profiled call, profiler disabled':>46} {per_call_us(lambda: decorated(1), n):>9.3f}")
+
+    sampled = data_transformer.sampled_logger
+    for label, every in (('transform_for_inference, log every call', 1),
+                         (f'transform_for_inference, log 1/{sampled.every}', sampled.every)):
+        sampled.every = every
+        best = min(per_call_us(lambda: pre.transform_for_inference(record), args.calls) for _ in range(3))
+        print(f"{label:>46} {best:>9.1f}")
+
+    row, batch = X.iloc[:1], X.iloc[:10_000]
+    for label, enable in (('disabled', None), ('timing only', False), ('timing + tracemalloc', True)):
+        profiler.reset()
+        if enable is not None:
+            profiler.enable(track_memory=enable)
+        single = min(per_call_us(lambda: pre.transform(row), args.calls // 10) for _ in range(3))
+        bulk = min(per_call_us(lambda: pre.transform(batch), 20) for _ in range(3))
+        profiler.disable()
+        print(f"{'profiler ' + label + ': 1-row transform':>46} {single:>9.1f}")
+        print(f"{'profiler ' + label + ': 10k-row transform':>46} {bulk:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
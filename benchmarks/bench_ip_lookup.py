@@ -0,0 +1,69 @@
+"""
+Throughput benchmark of IP-to-country mapping: map_ip_to_city (sort +
+merge_asof per call) versus a prebuilt IpRangeIndex (np.searchsorted), plus
+the index's memory-mapped load time and single-IP lookup latency.
+
+Usage:
+    python -m benchmarks.bench_ip_lookup [--ips 1000000]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_ip_ranges
+from src.core.ip_index import IpRangeIndex, map_ip_to_country
+from src.utils.utils import map_ip_to_city
+
+
+def best_of(fn, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ips', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    logging.getLogger('src').setLevel(logging.WARNING)
+
+    ip_map = make_ip_ranges()
+    rng = np.random.default_rng(0)
+    fraud = pd.DataFrame({'ip_address': rng.uniform(0, 2**32 - 1, args.ips)})
+
+    merge_s, merged = best_of(lambda: map_ip_to_city(fraud, ip_map))
+    build_s, index = best_of(lambda: IpRangeIndex.from_frame(ip_map))
+    lookup_s, mapped = best_of(lambda: map_ip_to_country(fraud, index))
+
+    order = fraud['ip_address'].argsort(kind='stable').to_numpy()
+    assert np.array_equal(mapped['country'].to_numpy()[order], merged['country'].to_numpy())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(os.path.join(tmp, 'ip_index'))
+        load_s, loaded = best_of(lambda: IpRangeIndex.load(os.path.join(tmp, 'ip_index')))
+        single = [float(ip) for ip in fraud['ip_address'].iloc[:10000]]
+        start = time.perf_counter()
+        for ip in single:
+            loaded.lookup_one(ip)
+        single_us = (time.perf_counter() - start) / len(single) * 1e6
+        del loaded
+
+    print(f"{args.ips} IPs, {len(ip_map)} ranges")
+    print(f"merge_asof (map_ip_to_city): {merge_s:.3f} s  ({args.ips / merge_s / 1e6:.2f} M IPs/s)")
+    print(f"IpRangeIndex bulk lookup:    {lookup_s:.3f} s  ({args.ips / lookup_s / 1e6:.2f} M IPs/s)")
+    print(f"IpRangeIndex build:          {build_s * 1000:.1f} ms")
+    print(f"IpRangeIndex mmap load:      {load_s * 1000:.2f} ms")
+    print(f"IpRangeIndex single lookup:  {single_us:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Model artifact benchmark: the joblib pickle written by ModelTrainer.save_model
+versus the native export (src.models.native) for logistic regression and
+XGBoost (calibrated, as the training script ships them), trained on
+synthetic credit-card data. Reports artifact size, and in fresh subprocesses
+the import time, load time and cold start (interpreter start to first
+scored row) of each, plus batch scoring throughput.
+
+Usage:
+    python -m benchmarks.bench_model_export [--rows 100000] [--runs 5]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import make_creditcard_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.utils.training_and_evaluation_utils import train_test_split_data
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+import numpy as np
+path, loader, engine = sys.argv[1], sys.argv[2], sys.argv[3]
+if loader == 'joblib':
+    import joblib
+    imported = time.perf_counter()
+    model = joblib.load(path)
+else:
+    from src.models.native import load_model
+    imported = time.perf_counter()
+    model = load_model(path, engine=engine)
+loaded = time.perf_counter()
+model.predict_proba(np.load(sys.argv[4])[:1])
+done = time.perf_counter()
+print(json.dumps({'import_s': imported - start, 'load_s': loaded - imported, 'total_s': done - start,
+                  'sklearn': 'sklearn' in sys.modules}))
+"""
+
+THROUGHPUT = """
+import json, sys, time
+import numpy as np
+path, loader, engine = sys.argv[1], sys.argv[2], sys.argv[3]
+if loader == 'joblib':
+    import joblib
+    model = joblib.load(path)
+else:
+    from src.models.native import load_model
+    model = load_model(path, engine=engine)
+X = np.load(sys.argv[4])
+model.predict_proba(X[:10])
+start = time.perf_counter()
+model.predict_proba(X)
+print(json.dumps({'rows_per_s': len(X) / (time.perf_counter() - start)}))
+"""
+
+
+def _size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def _run(script, *args):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', script, *args], cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    df = make_creditcard_data(args.rows)
+    X, y = df.drop(columns='Class'), df['Class']
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
+    X_fit, X_cal, y_fit, y_cal = train_test_split_data(X_train, y_train, stratify=y_train)
+    pre = FraudPreprocessor(mode='creditcard_data').fit(X_fit, y_fit)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        features = os.path.join(tmp, 'X_test.npy')
+        np.save(features, pre.transform(X_test, output='float32'))
+
+        print(f"{'model':>20} {'artifact':>16} {'size KiB':>9} {'import ms':>10} {'load ms':>8} "
+              f"{'cold start ms':>14} {'sklearn':>8} {'rows/s':>12}")
+        for model_name in ('logistic_regression', 'gbm'):
+            trainer = ModelTrainer(model_name)
+            trainer.train(pre.transform(X_fit, output='float32'), y_fit)
+            trainer.calibrate(pre.transform(X_cal, output='float32'), y_cal)
+            pickle_path = trainer.save_model(os.path.join(tmp, f'{model_name}.joblib'))
+            native_path = trainer.export_model(os.path.join(tmp, f'{model_name}.native'))
+
+            variants = [('joblib', pickle_path, 'joblib', '-'), ('native', native_path, 'native', 'numpy')]
+            if model_name == 'gbm':
+                variants.append(('native (xgboost)', native_path, 'native', 'xgboost'))
+            for label, path, loader, engine in variants:
+                runs = [_run(COLD_START, path, loader, engine, features) for _ in range(args.runs)]
+                speed = _run(THROUGHPUT, path, loader, engine, features)['rows_per_s']
+                median = {key: np.median([r[key] for r in runs]) * 1000 for key in ('import_s', 'load_s', 'total_s')}
+                print(f"{model_name:>20} {label:>16} {_size(path) / 1024:>9.1f} {median['import_s']:>10.1f} "
+                      f"{median['load_s']:>8.1f} {median['total_s']:>14.1f} {str(runs[0]['sklearn']):>8} "
+                      f"{speed:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
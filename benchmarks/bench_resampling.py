@@ -0,0 +1,74 @@
+"""
+Credit-card resampling benchmark: imblearn SMOTE on the transformed float64
+frame (the previous 'auto' behaviour) versus MiniBatchSMOTE (float32,
+partitioned neighbour search, batch-wise generation) versus no resampling
+with balanced instance weights. Each mode runs in its own subprocess and
+reports resampling time, training-set size, peak RSS growth over
+resample + XGBoost fit, fit time and holdout ROC AUC.
+
+Usage:
+    python -m benchmarks.bench_resampling [--rows 284807] [--fraud-rate 0.0017]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+RUNNER = """
+import json, logging, sys, time, warnings
+logging.disable(logging.INFO)
+warnings.filterwarnings('ignore')
+from sklearn.metrics import roc_auc_score
+from benchmarks.common import PeakRSS
+from benchmarks.synthetic import make_creditcard_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.utils.training_and_evaluation_utils import train_test_split_data
+
+n_rows, fraud_rate, sampler = int(sys.argv[1]), float(sys.argv[2]), sys.argv[3]
+df = make_creditcard_data(n_rows, fraud_rate=fraud_rate)
+X, y = df.drop(columns='Class'), df['Class']
+X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
+pre = FraudPreprocessor(mode='creditcard_data', sampler=sampler).fit(X_train, y_train)
+X_train_t, X_test_t = pre.transform(X_train), pre.transform(X_test)
+del df, X, X_train
+
+with PeakRSS() as peak:
+    start = time.perf_counter()
+    X_res, y_res = pre.sample(X_train_t, y_train)
+    resample_s = time.perf_counter() - start
+    del X_train_t
+    trainer = ModelTrainer('gbm')
+    start = time.perf_counter()
+    trainer.train(X_res, y_res, sample_weight=pre.sample_weight(y_res))
+    fit_s = time.perf_counter() - start
+auc = roc_auc_score(y_test, trainer.predict_proba(X_test_t))
+print(json.dumps({'resample_s': resample_s, 'fit_s': fit_s, 'rows': len(y_res),
+                  'train_mib': X_res.to_numpy().nbytes / 2**20, 'peak_mib': peak.peak_mib, 'auc': auc}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=284_807)
+    parser.add_argument('--fraud-rate', type=float, default=0.0017)
+    args = parser.parse_args()
+
+    modes = {
+        'imblearn SMOTE (float64)': 'smote',
+        'MiniBatchSMOTE (float32)': 'auto',
+        'instance weights': 'weights',
+    }
+    print(f"{args.rows} rows, fraud rate {args.fraud_rate}")
+    print(f"{'mode':>26} {'resample s':>11} {'train rows':>11} {'train MiB':>10} {'peak MiB':>9} "
+          f"{'fit s':>7} {'ROC AUC':>8}")
+    for name, sampler in modes.items():
+        out = subprocess.run([sys.executable, '-c', RUNNER, str(args.rows), str(args.fraud_rate), sampler],
+                             capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{name:>26} {r['resample_s']:>11.2f} {r['rows']:>11} {r['train_mib']:>10.1f} "
+              f"{r['peak_mib']:>9.1f} {r['fit_s']:>7.2f} {r['auc']:>8.4f}")
+
+
+if __name__ == '__main__':
+    main()
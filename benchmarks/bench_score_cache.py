@@ -0,0 +1,84 @@
+"""
+Score cache benchmark: per-request latency of scoring one transaction with an
+XGBoost bundle (transform_batch + predict_proba) without a cache, versus
+CachedScorer on an in-process hit, a shared diskcache hit and a miss
+(fingerprint and lookup overhead on top of scoring), and the mean latency
+over a request stream in which a fraction of requests are gateway retries of
+an earlier transaction.
+
+Usage:
+    python -m benchmarks.bench_score_cache [--requests 5000] [--retry-rate 0.3]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import load_bundle, save_bundle
+from src.services.score_cache import CachedScorer, DiskCacheBackend, ScoreCache
+
+
+def latencies(score, records):
+    result = np.empty(len(records))
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        score([record])
+        result[i] = time.perf_counter() - start
+    return result * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--retry-rate', type=float, default=0.3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    df = make_fraud_data(args.rows)
+    X, y = df.drop(columns='class'), df['class']
+    pre = FraudPreprocessor(mode='fraud_data').fit(X, y)
+    trainer = ModelTrainer('gbm')
+    trainer.train(pre.transform(X), y)
+    records = X.iloc[:args.requests].to_dict(orient='records')
+
+    # Request stream: each request is a retry of an earlier one with probability retry_rate
+    rng = np.random.default_rng(0)
+    stream = []
+    for i in range(args.requests):
+        retry = stream and rng.random() < args.retry_rate
+        stream.append(stream[rng.integers(len(stream))] if retry else records[i])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = load_bundle(save_bundle(os.path.join(tmp, 'xgboost_fraud.bundle'), pre, trainer))
+        memory = CachedScorer(bundle, ScoreCache())
+        shared = CachedScorer(bundle, ScoreCache(max_size=0, backend=DiskCacheBackend(os.path.join(tmp, 'cache'))))
+
+        rows = [
+            ('no cache', latencies(bundle.score, records)),
+            ('miss', latencies(memory.score, records)),
+            ('in-process hit', latencies(memory.score, records)),
+            ('diskcache miss', latencies(shared.score, records)),
+            ('diskcache hit', latencies(shared.score, records)),
+        ]
+        print(f"{'per request':>16} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+        for name, latency in rows:
+            print(f"{name:>16} {latency.mean():>9.1f} {np.percentile(latency, 50):>9.1f} "
+                  f"{np.percentile(latency, 99):>9.1f}")
+
+        fresh = CachedScorer(bundle, ScoreCache())
+        baseline, cached = latencies(bundle.score, stream), latencies(fresh.score, stream)
+        info = fresh.cache.cache_info()
+        print(f"\nstream of {len(stream)} requests, {args.retry_rate:.0%} retries: mean {baseline.mean():.1f} us "
+              f"without cache, {cached.mean():.1f} us with it (hit rate {info['hit_rate']:.1%})")
+        shared.cache.backend.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Load test of the micro-batching scoring server (src/services/scoring_server.py).
+Trains a bundle on synthetic fraud data, serves it on localhost and fires
+single-transaction requests from concurrent clients, once with micro-batching
+and once with per-request scoring (max batch size 1). Reports throughput,
+client-side p50/p99 latency and the server's mean batch size and queue depth.
+Client and server share one event loop, so absolute numbers are conservative.
+
+Usage:
+    python -m benchmarks.bench_scoring_server [--requests 20000] [--concurrency 64] [--model gbm]
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+import warnings
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import load_bundle, save_bundle
+from src.services.scoring_server import create_app
+
+
+def build_bundle(path, model_name, n_rows=50_000):
+    df = make_fraud_data(n_rows, fraud_rate=0.2)
+    pre = FraudPreprocessor(mode="fraud_data")
+    X, y = df[pre.input_columns()], df["class"]
+    pre.fit(X, y)
+    trainer = ModelTrainer(model_name)
+    trainer.train(pre.transform(X).to_numpy(), y)
+    save_bundle(path, pre, trainer)
+    return df[pre.input_columns()].head(5000).to_dict(orient="records")
+
+
+async def load_test(bundle, records, n_requests, concurrency, max_batch_size, max_wait_ms, n_workers):
+    app = create_app(bundle, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, n_workers=n_workers)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/score"
+
+    latencies = []
+    counter = iter(range(n_requests))
+
+    async def client(session):
+        for i in counter:
+            start = time.perf_counter()
+            async with session.post(url, json=records[i % len(records)]) as response:
+                await response.json()
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+        async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+            metrics = await response.json()
+    await runner.cleanup()
+
+    latencies = np.asarray(latencies) * 1000
+    return {
+        "throughput": n_requests / wall,
+        "p50_ms": np.percentile(latencies, 50),
+        "p99_ms": np.percentile(latencies, 99),
+        "mean_batch": metrics["batch_size"]["mean"],
+        "mean_queue": metrics["queue_depth"]["mean"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--model", default="gbm", choices=["gbm", "logistic_regression", "random_forest"])
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        records = build_bundle(f"{tmp}/model.bundle", args.model)
+        bundle = load_bundle(f"{tmp}/model.bundle")
+        modes = {
+            "per-request": (1, 0.0),
+            f"micro-batch ({args.max_batch_size}, {args.max_wait_ms:g} ms)": (args.max_batch_size, args.max_wait_ms),
+        }
+        print(f"{args.requests} requests, {args.concurrency} concurrent clients, model {args.model}")
+        print(f"{'mode':>26} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'mean batch':>11} {'mean queue':>11}")
+        for name, (max_batch_size, max_wait_ms) in modes.items():
+            result = asyncio.run(load_test(bundle, records, args.requests, args.concurrency,
+                                           max_batch_size, max_wait_ms, args.workers))
+            print(f"{name:>26} {result['throughput']:>8.0f} {result['p50_ms']:>7.1f} {result['p99_ms']:>7.1f} "
+                  f"{result['mean_batch']:>11.1f} {result['mean_queue']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
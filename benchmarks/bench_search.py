@@ -0,0 +1,79 @@
+"""
+Hyperparameter search benchmark: the current serial GridSearchCV over the
+24-point XGBoost grid from Train_Fraud_model.py versus HalvingSearch
+(successive halving on a process pool with early stopping). Reports wall
+time, number of model fits, best cross-validated ROC AUC and holdout ROC AUC
+of the selected model. Labels are drawn from a noisy function of the
+features so the AUCs are meaningful.
+
+Usage:
+    python -m benchmarks.bench_search [--rows 100000] [--n-jobs -1]
+"""
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import GridSearchCV
+
+from benchmarks.synthetic import make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.models.search import HalvingSearch
+from src.utils.training_and_evaluation_utils import train_test_split_data
+
+XGB_GRID = {
+    "n_estimators": [100, 300],
+    "max_depth": [3, 5, 7],
+    "learning_rate": [0.01, 0.1],
+    "subsample": [0.8, 1.0],
+}
+
+
+def make_labelled_data(n_rows, seed=42):
+    df = make_fraud_data(n_rows, seed=seed)
+    rng = np.random.default_rng(seed)
+    # Fraud concentrated in fast night-time purchases, plus an age x browser interaction
+    logit = (-3.0 - 0.02 * df["time_since_signup"] + 1.5 * (df["purchase_hour"] < 5)
+             + 0.02 * (df["age"] - 40) * (df["browser"] == "IE") + rng.normal(0, 2, n_rows))
+    y = (logit > np.quantile(logit, 0.9)).astype(int)
+    return df.drop(columns="class"), y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    X, y = make_labelled_data(args.rows)
+    pre = FraudPreprocessor(mode="fraud_data")
+    X = X[pre.input_columns()]
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
+    pre.fit(X_train, y_train)
+    X_train, X_test = pre.transform(X_train).to_numpy(), pre.transform(X_test).to_numpy()
+    print(f"{len(X_train)} training rows, {X_train.shape[1]} features")
+
+    estimator = ModelTrainer("gbm").model
+    searches = {
+        "GridSearchCV (serial)": lambda: GridSearchCV(estimator, XGB_GRID, cv=2, scoring="roc_auc"),
+        f"HalvingSearch (n_jobs={args.n_jobs})": lambda: HalvingSearch(estimator, XGB_GRID, cv=2,
+                                                                       n_jobs=args.n_jobs),
+    }
+    print(f"{'search':>28} {'wall s':>8} {'fits':>5} {'cv AUC':>7} {'test AUC':>9}  best params")
+    for name, build in searches.items():
+        search = build()
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        wall = time.perf_counter() - start
+        fits = len(search.cv_results_["params"]) * 2 if isinstance(search, GridSearchCV) else len(search.cv_results_) * 2
+        test_auc = roc_auc_score(y_test, search.best_estimator_.predict_proba(X_test)[:, 1])
+        print(f"{name:>28} {wall:>8.1f} {fits:>5} {search.best_score_:>7.4f} {test_auc:>9.4f}  {search.best_params_}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+FraudPreprocessor.transform output modes on synthetic fraud and credit-card
+data: the float64 DataFrame (copying the input, and with copy=False),
+float32 arrays and float32 CSR. Each mode runs in its own subprocess and
+reports transform time, rows/s, output size and peak RSS growth.
+
+Usage:
+    python -m benchmarks.bench_transform_output [--fraud-rows 1000000] [--creditcard-rows 284807]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+RUNNER = """
+import json, logging, sys, time
+logging.disable(logging.INFO)
+from benchmarks.common import PeakRSS
+from benchmarks.synthetic import make_creditcard_data, make_fraud_data
+from src.core.DataTransformer import FraudPreprocessor
+
+dataset, n_rows, output, copy = sys.argv[1], int(sys.argv[2]), sys.argv[3], sys.argv[4] == '1'
+if dataset == 'fraud_data':
+    df = make_fraud_data(n_rows)
+    X, y = df.drop(columns='class'), df['class']
+else:
+    df = make_creditcard_data(n_rows)
+    X, y = df.drop(columns='Class'), df['Class']
+del df
+pre = FraudPreprocessor(mode=dataset).fit(X.iloc[:100_000], y.iloc[:100_000])
+
+with PeakRSS() as peak:
+    start = time.perf_counter()
+    out = pre.transform(X, output=output, copy=copy)
+    seconds = time.perf_counter() - start
+if output == 'sparse':
+    nbytes = out.data.nbytes + out.indices.nbytes + out.indptr.nbytes
+else:
+    nbytes = out.to_numpy().nbytes if output == 'frame' else out.nbytes
+print(json.dumps({'seconds': seconds, 'out_mib': nbytes / 2**20, 'peak_mib': peak.peak_mib}))
+"""
+
+MODES = {
+    'frame (copy)': ('frame', True),
+    'frame (copy=False)': ('frame', False),
+    'float32': ('float32', True),
+    'sparse': ('sparse', True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fraud-rows', type=int, default=1_000_000)
+    parser.add_argument('--creditcard-rows', type=int, default=284_807)
+    args = parser.parse_args()
+
+    for dataset, n_rows in (('fraud_data', args.fraud_rows), ('creditcard_data', args.creditcard_rows)):
+        print(f"\n{dataset}: {n_rows} rows")
+        print(f"{'mode':>20} {'seconds':>8} {'rows/s':>12} {'output MiB':>11} {'peak MiB':>9}")
+        for name, (output, copy) in MODES.items():
+            if dataset == 'creditcard_data' and output == 'sparse':
+                continue  # no categorical columns, CSR would only add index overhead
+            proc = subprocess.run([sys.executable, '-c', RUNNER, dataset, str(n_rows), output, '1' if copy else '0'],
+                                  capture_output=True, text=True, check=True)
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{name:>20} {r['seconds']:>8.2f} {n_rows / r['seconds']:>12,.0f} {r['out_mib']:>11.1f} "
+                  f"{r['peak_mib']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
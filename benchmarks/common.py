@@ -0,0 +1,41 @@
+import threading
+import time
+
+import psutil
+
+
+class PeakRSS:
+    """
+    Context manager that samples the process RSS on a background thread and
+    records the peak growth over the RSS at entry, in MiB.
+    ru_maxrss is not usable here because library imports already set a high
+    watermark before the measured section starts.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak_mib = 0.0
+        self.seconds = 0.0
+
+    def __enter__(self):
+        self._process = psutil.Process()
+        self._start_rss = self._process.memory_info().rss
+        self._peak = self._start_rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        self._start = time.perf_counter()
+        return self
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self._peak = max(self._peak, self._process.memory_info().rss)
+            time.sleep(self.interval)
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self._stop.set()
+        self._thread.join()
+        self._peak = max(self._peak, self._process.memory_info().rss)
+        self.peak_mib = (self._peak - self._start_rss) / 2**20
+        return False
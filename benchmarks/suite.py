@@ -0,0 +1,215 @@
+"""
+End-to-end benchmark suite of the training pipeline on synthetic fraud and
+credit-card data (10^4 to 10^7 rows): load_data, clean_data, map_ip_to_city,
+FraudPreprocessor.fit/transform/sample, ModelTrainer.train/predict_proba and
+evaluate_model, each timed (wall and CPU) and memory-profiled (peak RSS
+growth). Every run is appended to a JSON history; --check compares the run
+with a stored baseline of the same size and exits non-zero on regressions.
+
+Usage:
+    python -m benchmarks.suite [--rows 100000] [--datasets fraud creditcard] [--models logistic_regression gbm]
+    python -m benchmarks.suite --rows 100000 --save-baseline
+    python -m benchmarks.suite --rows 100000 --check [--tolerance 0.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import PeakRSS
+from benchmarks.synthetic import make_creditcard_data, make_fraud_data, make_ip_ranges
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.utils.training_and_evaluation_utils import evaluate_model, train_test_split_data
+from src.utils.utils import clean_data, load_data, map_ip_to_city
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+HISTORY_PATH = os.path.join(RESULTS_DIR, 'history.json')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+
+# Differences below these floors are treated as noise by --check
+MIN_SECONDS = 0.05
+MIN_MIB = 16.0
+
+
+class Suite:
+    """Runs named steps and records wall/CPU seconds, rows, rows/s and peak RSS growth of each."""
+
+    def __init__(self):
+        self.results = {}
+
+    def step(self, name, fn, rows):
+        cpu_start = time.process_time()
+        with PeakRSS() as peak:
+            result = fn()
+        wall = peak.seconds
+        self.results[name] = {
+            'wall_s': round(wall, 4),
+            'cpu_s': round(time.process_time() - cpu_start, 4),
+            'rows': rows,
+            'rows_per_s': round(rows / wall) if wall else None,
+            'peak_rss_mib': round(peak.peak_mib, 1),
+        }
+        print(f"{name:>46} {wall:>9.3f} {self.results[name]['cpu_s']:>9.3f} {rows:>11} "
+              f"{self.results[name]['rows_per_s'] or 0:>12,} {peak.peak_mib:>10.1f}", flush=True)
+        return result
+
+
+def run_models(suite, prefix, X_train, y_train, X_test, y_test, models):
+    for model in models:
+        trainer = ModelTrainer(model)
+        suite.step(f'{prefix}.train[{model}]', lambda: trainer.train(X_train, y_train), len(y_train))
+        y_proba = suite.step(f'{prefix}.predict_proba[{model}]', lambda: trainer.predict_proba(X_test), len(y_test))
+        y_pred = (y_proba >= 0.5).astype(int)
+        suite.step(f'{prefix}.evaluate[{model}]', lambda: _quiet_evaluate(y_test, y_pred, y_proba, model), len(y_test))
+
+
+def _quiet_evaluate(y_test, y_pred, y_proba, model):
+    # evaluate_model prints its report; keep the suite's table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return evaluate_model(y_test, y_pred, y_proba, model_name=model, plot=False)
+
+
+def run_fraud(suite, n_rows, models, tmp):
+    path = os.path.join(tmp, 'fraud.csv')
+    make_fraud_data(n_rows).to_csv(path, index=False)
+    ip_ranges = make_ip_ranges()
+
+    df = suite.step('fraud.load_data', lambda: load_data(path), n_rows)
+    df = suite.step('fraud.clean_data', lambda: clean_data(df, time_column=['signup_time', 'purchase_time']), n_rows)
+    # The synthetic frame already carries the mapped country, as after the real merge
+    raw = df.drop(columns='country')
+    suite.step('fraud.map_ip_to_city', lambda: map_ip_to_city(raw, ip_ranges), n_rows)
+    del raw
+
+    X, y = df.drop(columns='class'), df['class']
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
+    pre = FraudPreprocessor(mode='fraud_data')
+    suite.step('fraud.fit', lambda: pre.fit(X_train, y_train), len(X_train))
+    X_train_t = suite.step('fraud.transform', lambda: pre.transform(X_train), len(X_train))
+    X_res, y_res = suite.step('fraud.sample', lambda: pre.sample(X_train_t, y_train), len(X_train))
+    run_models(suite, 'fraud', X_res, y_res, pre.transform(X_test), y_test, models)
+
+
+def run_creditcard(suite, n_rows, models, tmp):
+    path = os.path.join(tmp, 'creditcard.csv')
+    make_creditcard_data(n_rows).to_csv(path, index=False)
+
+    df = suite.step('creditcard.load_data', lambda: load_data(path), n_rows)
+    df = suite.step('creditcard.clean_data', lambda: clean_data(df), n_rows)
+
+    X, y = df.drop(columns='Class'), df['Class']
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
+    pre = FraudPreprocessor(mode='creditcard_data')
+    suite.step('creditcard.fit', lambda: pre.fit(X_train, y_train), len(X_train))
+    X_train_t = suite.step('creditcard.transform', lambda: pre.transform(X_train), len(X_train))
+    X_res, y_res = suite.step('creditcard.sample', lambda: pre.sample(X_train_t, y_train), len(X_train))
+    run_models(suite, 'creditcard', X_res, y_res, pre.transform(X_test), y_test, models)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def compare(run, baseline, tolerance):
+    """
+    Steps slower (wall time) or hungrier (peak RSS) than the baseline by more
+    than tolerance, ignoring differences below MIN_SECONDS / MIN_MIB.
+
+    Returns:
+    - list of (step, metric, baseline value, current value)
+    """
+    regressions = []
+    for name, current in run['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        for metric, floor in (('wall_s', MIN_SECONDS), ('peak_rss_mib', MIN_MIB)):
+            if current[metric] > base[metric] * (1 + tolerance) and current[metric] - base[metric] > floor:
+                regressions.append((name, metric, base[metric], current[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='rows per dataset (10^4 to 10^7)')
+    parser.add_argument('--datasets', nargs='+', choices=['fraud', 'creditcard'], default=['fraud', 'creditcard'])
+    parser.add_argument('--models', nargs='+', choices=['logistic_regression', 'gbm'],
+                        default=['logistic_regression', 'gbm'])
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--check', action='store_true', help='exit 1 if a step regressed against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown for --check')
+    args = parser.parse_args()
+    if args.rows < 10_000:
+        parser.error("--rows must be at least 10000 (smaller samples leave too few fraud rows to resample)")
+    logging.disable(logging.INFO)
+
+    suite = Suite()
+    print(f"{args.rows} rows per dataset")
+    print(f"{'step':>46} {'wall s':>9} {'cpu s':>9} {'rows':>11} {'rows/s':>12} {'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        if 'fraud' in args.datasets:
+            run_fraud(suite, args.rows, args.models, tmp)
+        if 'creditcard' in args.datasets:
+            run_creditcard(suite, args.rows, args.models, tmp)
+
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'rows': args.rows,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': suite.results,
+    }
+    history = _read_json(args.history, [])
+    history.append(run)
+    _write_json(args.history, history)
+    print(f"Appended run to {args.history} ({len(history)} runs)")
+
+    if args.save_baseline:
+        _write_json(args.baseline, run)
+        print(f"Saved baseline to {args.baseline}")
+    if args.check:
+        baseline = _read_json(args.baseline, None)
+        if baseline is None:
+            sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first")
+        if baseline['rows'] != run['rows']:
+            sys.exit(f"Baseline was recorded at {baseline['rows']} rows, this run used {run['rows']}")
+        regressions = compare(run, baseline, args.tolerance)
+        for name, metric, before, after in regressions:
+            print(f"REGRESSION {name} {metric}: {before} -> {after}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against baseline {baseline.get('commit')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+SOURCES = ['SEO', 'Ads', 'Direct']
+BROWSERS = ['Chrome', 'Safari', 'FireFox', 'IE', 'Opera']
+SEXES = ['M', 'F']
+
+
+def make_fraud_data(n_rows, n_devices=None, n_countries=180, fraud_rate=0.094, seed=42):
+    """
+    Generates a synthetic frame shaped like Feature_engineered_fraud_data.csv.
+
+    Parameters:
+    - n_rows: number of transactions
+    - n_devices: number of distinct device ids (defaults to ~90% of n_rows)
+    - n_countries: number of distinct countries
+    - fraud_rate: share of rows labelled as fraud
+    - seed: random seed
+
+    Returns:
+    - DataFrame with the raw, engineered and target columns
+    """
+    rng = np.random.default_rng(seed)
+    n_devices = n_devices or max(1, int(n_rows * 0.9))
+
+    signup = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 200 * 86400, n_rows), unit='s')
+    purchase = signup + pd.to_timedelta(rng.integers(60, 120 * 86400, n_rows), unit='s')
+    time_since_signup = (purchase - signup).total_seconds() / 3600
+
+    # Zipf-like device popularity so a few devices are shared by many users
+    device_idx = np.minimum(rng.zipf(1.3, n_rows) - 1, n_devices - 1)
+    country_idx = np.minimum(rng.zipf(1.5, n_rows) - 1, n_countries - 1)
+    user_txn_count = rng.integers(1, 4, n_rows)
+
+    return pd.DataFrame({
+        'user_id': np.arange(n_rows),
+        'signup_time': signup.strftime('%Y-%m-%d %H:%M:%S'),
+        'purchase_time': purchase.strftime('%Y-%m-%d %H:%M:%S'),
+        'purchase_value': rng.integers(9, 155, n_rows),
+        'device_id': np.char.add('DEV', device_idx.astype(str)),
+        'source': rng.choice(SOURCES, n_rows),
+        'browser': rng.choice(BROWSERS, n_rows),
+        'sex': rng.choice(SEXES, n_rows),
+        'age': rng.integers(18, 77, n_rows),
+        'ip_address': rng.integers(16777216, 4294967295, n_rows, dtype=np.int64).astype(np.float64),
+        'class': (rng.random(n_rows) < fraud_rate).astype(np.int64),
+        'country': np.char.add('Country', country_idx.astype(str)),
+        'purchase_hour': purchase.hour.to_numpy(),
+        'purchase_dayofweek': purchase.dayofweek.to_numpy(),
+        'time_since_signup': time_since_signup.to_numpy(),
+        'user_txn_count': user_txn_count,
+        'user_txn_velocity': user_txn_count / np.maximum(time_since_signup.to_numpy(), 1e-3),
+    })
+
+
+def make_creditcard_data(n_rows, fraud_rate=0.0017, seed=42):
+    """
+    Generates a synthetic frame shaped like cleaned_creditcard_data.csv
+    (Time, V1-V28, Amount, Class).
+    """
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n_rows) < fraud_rate).astype(np.int64)
+    components = rng.standard_normal((n_rows, 28))
+    # Shift fraud rows so the models have some signal to find
+    components[y == 1, :5] += 2.0
+
+    df = pd.DataFrame(components, columns=[f'V{i}' for i in range(1, 29)])
+    df.insert(0, 'Time', np.sort(rng.integers(0, 172792, n_rows)).astype(np.float64))
+    df['Amount'] = np.round(rng.lognormal(3.0, 1.5, n_rows), 2)
+    df['Class'] = y
+    return df
+
+
+def make_ip_ranges(n_ranges=138846, n_countries=235, coverage=0.8, seed=42):
+    """
+    Generates a synthetic frame shaped like IpAddress_to_Country.csv: disjoint
+    [lower, upper] ranges covering roughly `coverage` of the IPv4 space.
+    """
+    rng = np.random.default_rng(seed)
+    bounds = np.sort(rng.choice(2**32 - 1, size=2 * n_ranges, replace=False))
+    lower, upper = bounds[0::2], bounds[1::2]
+    # Shrink the gaps so the requested share of the space is covered
+    gaps = np.diff(np.concatenate([[0], lower]))
+    lower = lower - (gaps * coverage).astype(np.int64) // 2
+    lower = np.maximum(lower, np.concatenate([[0], upper[:-1] + 1]))
+    return pd.DataFrame({
+        'lower_bound_ip_address': lower.astype(np.float64),
+        'upper_bound_ip_address': upper.astype(np.int64),
+        'country': np.char.add('Country', rng.integers(0, n_countries, n_ranges).astype(str)),
+    })
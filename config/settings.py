@@ -2,4 +2,82 @@
 Configuration settings for the application.
 """
 
-# Add your configuration here
+# Explicit column dtypes for reading the processed datasets, so chunked reads
+# don't re-infer types per chunk and small integers don't default to int64.
+FRAUD_FEATURE_DTYPES = {
+    "purchase_value": "int32",
+    "device_id": "object",
+    "source": "category",
+    "browser": "category",
+    "sex": "category",
+    "age": "int16",
+    "class": "int8",
+    "country": "object",
+    "purchase_hour": "int8",
+    "purchase_dayofweek": "int8",
+    "time_since_signup": "float64",
+    "user_txn_count": "int32",
+    "user_txn_velocity": "float64",
+}
+
+CREDITCARD_DTYPES = {
+    "Time": "float64",
+    **{f"V{i}": "float64" for i in range(1, 29)},
+    "Amount": "float64",
+    "Class": "int8",
+}
+
+# Declarative training config for scripts/train_models.py: every dataset is
+# trained with every model listed under its "models" key. Paths are relative
+# to the project root. "calibration" holds out a share of the training split
+# (before resampling) to calibrate probabilities and pick the decision
+# threshold minimizing cost_fp per false alert + cost_column of missed fraud.
+# "cascade" screens every row with the "screen" model and escalates only an
+# uncertainty band, chosen on the calibration rows to hold target_recall (the
+# escalation model's own recall when None), to the "model" (see
+# src.models.cascade). "preprocessor_path" keeps the fitted preprocessor with
+# its online encoders for scripts/Retrain_Fraud_model.py.
+TRAINING_CONFIG = {
+    "datasets": {
+        "fraud": {
+            "path": "data/processed/Feature_engineered/Feature_engineered_fraud_data.csv",
+            "mode": "fraud_data",
+            "target": "class",
+            "output_dir": "models/Fraud Model",
+            "suffix": "fraud",
+            "mappings_path": "models/Fraud Model/Mappings/fraud_encoding_maps.json",
+            "preprocessor_path": "models/Fraud Model/fraud_preprocessor.pkl",
+            "calibration": {"method": "isotonic", "size": 0.2, "cost_column": "purchase_value", "cost_fp": 10.0},
+            "cascade": {"screen": "logistic_regression", "model": "xgboost", "target_recall": None},
+            "models": ["logistic_regression", "xgboost"],
+        },
+        "creditcard": {
+            "path": "data/processed/cleaned_creditcard_data.csv",
+            "mode": "creditcard_data",
+            "target": "Class",
+            "output_dir": "models/CreditCard Model",
+            "suffix": "creditcard",
+            "calibration": {"method": "isotonic", "size": 0.2, "cost_column": "Amount", "cost_fp": 10.0},
+            "cascade": {"screen": "logistic_regression", "model": "xgboost", "target_recall": None},
+            "models": ["logistic_regression", "xgboost"],
+        },
+    },
+    "models": {
+        "logistic_regression": {
+            "model": "logistic_regression",
+            "search_type": "halving",
+            "param_grid": {"C": [0.1, 1, 10], "penalty": ["l2"], "solver": ["liblinear"]},
+        },
+        "xgboost": {
+            "model": "gbm",
+            "search_type": "halving",
+            "param_grid": {
+                "n_estimators": [100, 300],
+                "max_depth": [3, 5, 7],
+                "learning_rate": [0.01, 0.1],
+                "subsample": [0.8, 1.0],
+            },
+        },
+    },
+    "timings_path": "models/training_timings.json",
+}
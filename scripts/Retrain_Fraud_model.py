@@ -0,0 +1,143 @@
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import time
+
+import joblib
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+from config.settings import TRAINING_CONFIG
+from src.models.calibration import CalibratedModel
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import save_bundle
+from src.utils.evaluation import ScoreEvaluator
+from src.utils.training_and_evaluation_utils import train_test_split_data
+from src.utils.utils import load_data
+
+# -------------------------
+# ✅ Logging setup
+# -------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SPEC = TRAINING_CONFIG["datasets"]["fraud"]
+
+# -------------------------
+# ✅ Arguments
+# -------------------------
+parser = argparse.ArgumentParser(description="Update the fraud models with newly labelled transactions.")
+parser.add_argument("--new-data", required=True, help="CSV of newly labelled, feature-engineered transactions")
+parser.add_argument("--models", nargs="+", choices=SPEC["models"], default=SPEC["models"])
+parser.add_argument("--max-rounds", type=int, default=50, help="boosting rounds added to the XGBoost model")
+parser.add_argument("--max-auc-drop", type=float, default=0.005,
+                    help="largest validation ROC AUC loss accepted before falling back to a full retrain")
+parser.add_argument("--compare-full", action="store_true",
+                    help="also run a full rebuild (search included) and report its time and AUC")
+
+
+def _path(relative):
+    return os.path.join(PROJECT_ROOT, relative)
+
+
+def _features(preprocessor, X, trainer):
+    # The same feature format the model was trained on: frames from Train_Fraud_model.py, arrays from train_models.py
+    estimator = trainer.model.estimator if isinstance(trainer.model, CalibratedModel) else trainer.model
+    if hasattr(estimator, "feature_names_in_"):
+        return preprocessor.transform(X)
+    return preprocessor.transform(X, output="float32")
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    models_dir = _path(SPEC["output_dir"])
+    target = SPEC["target"]
+    calibration = SPEC["calibration"]
+    report = {}
+
+    # -------------------------
+    # ✅ Previous preprocessor, new batch and history
+    # -------------------------
+    preprocessor = joblib.load(_path(SPEC["preprocessor_path"]))
+    columns = preprocessor.input_columns() + [target]
+    new = load_data(args.new_data, columns=columns)
+    X_new, y_new = new.drop(columns=target), new[target]
+
+    # Recent rows held out (not resampled) for calibration and for the validation gate
+    X_update, X_hold, y_update, y_hold = train_test_split_data(X_new, y_new, test_size=0.4, stratify=y_new)
+    X_cal, X_val, y_cal, y_val = train_test_split_data(X_hold, y_hold, test_size=0.5, stratify=y_hold)
+
+    history = load_data(_path(SPEC["path"]), columns=columns, cache=True)
+    X_full = pd.concat([history.drop(columns=target), X_update], ignore_index=True)
+    y_full = pd.concat([history[target], y_update], ignore_index=True)
+
+    # -------------------------
+    # ✅ Update the encodings with the new batch (the previous ones are kept for the previous models)
+    # -------------------------
+    previous_preprocessor = copy.deepcopy(preprocessor)
+    preprocessor.partial_fit(X_update, y_update)
+    kept_previous = []
+
+    for name in args.models:
+        model_config = TRAINING_CONFIG["models"][name]
+        trainer = ModelTrainer(model_config["model"])
+        trainer.model = joblib.load(f"{models_dir}/{name}_{SPEC['suffix']}.pkl")
+
+        X_update_sampled, y_update_sampled = preprocessor.sample(_features(preprocessor, X_update, trainer), y_update)
+        X_val_t = _features(preprocessor, X_val, trainer)
+        full_train = {}
+
+        def build_full_train():
+            # Transforming and resampling the whole history is only paid for a full retrain
+            if not full_train:
+                X_full_sampled, y_full_sampled = preprocessor.sample(_features(preprocessor, X_full, trainer), y_full)
+                full_train.update({
+                    "X_train": X_full_sampled, "y_train": y_full_sampled,
+                    "param_grid": model_config["param_grid"], "search_type": model_config["search_type"],
+                    "n_jobs": -1, "sample_weight": preprocessor.sample_weight(y_full_sampled),
+                })
+            return full_train
+
+        # -------------------------
+        # ✅ Incremental update, gated on validation AUC
+        # -------------------------
+        logger.info(f"⚙️ Updating model: {name}")
+        report[name] = trainer.train_incremental(
+            X_update_sampled, y_update_sampled, X_val_t, y_val,
+            max_rounds=args.max_rounds, max_auc_drop=args.max_auc_drop,
+            sample_weight=preprocessor.sample_weight(y_update_sampled), fallback=build_full_train,
+            X_val_previous=_features(previous_preprocessor, X_val, trainer))
+        # The model and its bundle keep the encodings the model was trained with
+        model_preprocessor = preprocessor
+        if report[name]["mode"] == "kept_previous":
+            model_preprocessor = previous_preprocessor
+            kept_previous.append(name)
+        trainer.calibrate(_features(model_preprocessor, X_cal, trainer), y_cal, method=calibration["method"],
+                          cost_fp=calibration["cost_fp"], cost_fn=X_cal[calibration["cost_column"]].to_numpy())
+
+        if args.compare_full:
+            start = time.perf_counter()
+            full = ModelTrainer(model_config["model"])
+            full.train(**build_full_train())
+            report[name]["full_rebuild_seconds"] = time.perf_counter() - start
+            report[name]["full_rebuild_auc"] = ScoreEvaluator(y_val, full.predict_proba(X_val_t)).roc_auc()
+
+        # -------------------------
+        # ✅ Save model and bundle
+        # -------------------------
+        trainer.save_model(f"{models_dir}/{name}_{SPEC['suffix']}.pkl")
+        save_bundle(f"{models_dir}/{name}_{SPEC['suffix']}.bundle", model_preprocessor, trainer)
+        logger.info(f"📊 {name}: {json.dumps(report[name])}")
+
+    if not kept_previous:
+        joblib.dump(preprocessor, _path(SPEC["preprocessor_path"]))
+    else:
+        logger.warning(f"⚠️ {kept_previous} kept their previous model; {SPEC['preprocessor_path']} keeps the "
+                       f"previous encodings")
+    with open(f"{models_dir}/incremental_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"✅ Incremental retraining report saved to {models_dir}/incremental_report.json")
@@ -12,6 +12,7 @@ from src.utils.training_and_evaluation_utils import (
     plot_confusion_matrix
 )
 from src.core.DataTransformer import FraudPreprocessor
+from src.services.inference_bundle import save_bundle
 
 # -------------------------
 # ✅ Logging setup
@@ -29,18 +30,26 @@ models_dir = "../models/CreditCard Model"
 plot_dir = "../models/CreditCard Model/plots"
 
 # -------------------------
-# ✅ Load creditcard dataset
+# ✅ Initialize preprocessor
+# -------------------------
+logger.info("Initializing FraudPreprocessor (creditcard mode)")
+preprocessor = FraudPreprocessor(mode="creditcard_data", sampler="auto")
+
+# -------------------------
+# ✅ Load creditcard dataset (columnar cache, only the columns the preprocessor uses)
 # -------------------------
 logger.info("Loading creditcard_data.csv")
-df = load_data("../data/processed/cleaned_creditcard_data.csv")
+df = load_data(
+    "../data/processed/cleaned_creditcard_data.csv",
+    columns=preprocessor.input_columns() + ["Class"],
+    cache=True
+)
 X = df.drop(columns="Class")
 y = df["Class"]
 
 # -------------------------
-# ✅ Initialize and fit preprocessor
+# ✅ Fit preprocessor
 # -------------------------
-logger.info("Initializing FraudPreprocessor (creditcard mode)")
-preprocessor = FraudPreprocessor(mode="creditcard_data", sampler="auto")
 preprocessor.fit(X, y)
 
 # -------------------------
@@ -49,6 +58,11 @@ preprocessor.fit(X, y)
 logger.info("Splitting creditcard dataset into training and test sets")
 X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
 
+# Calibration split, held out before resampling so it keeps the real fraud rate
+X_train, X_cal, y_train, y_cal = train_test_split_data(X_train, y_train, test_size=0.2, stratify=y_train)
+X_cal_transformed = preprocessor.transform(X_cal)
+REVIEW_COST = 10.0  # cost of investigating one false alert; a missed fraud costs its Amount
+
 # -------------------------
 # ✅ Transform + apply SMOTE
 # -------------------------
@@ -85,7 +99,12 @@ models = {
 for name, trainer in models.items():
     logger.info(f"⚙️ Training model: {name}")
     param_grid = param_grids.get(name)
-    trainer.train(X_train_sampled, y_train_sampled, param_grid=param_grid, search_type="grid")
+    trainer.train(X_train_sampled, y_train_sampled, param_grid=param_grid, search_type="halving", n_jobs=-1,
+                  sample_weight=preprocessor.sample_weight(y_train_sampled))
+
+    # Calibrate probabilities and pick the threshold with the lowest expected loss
+    trainer.calibrate(X_cal_transformed, y_cal, method="isotonic",
+                      cost_fp=REVIEW_COST, cost_fn=X_cal["Amount"].to_numpy())
 
     # -------------------------
     # ✅ Inference and evaluation
@@ -110,6 +129,7 @@ for name, trainer in models.items():
     # -------------------------
     logger.info(f"💾 Saving model: {name}")
     trainer.save_model(f"{models_dir}/{name}_creditcard.pkl")
+    save_bundle(f"{models_dir}/{name}_creditcard.bundle", preprocessor, trainer)
 
 logger.info("✅ All creditcard models trained.")
 logger.info("✅ All creditcard models evaluated.")
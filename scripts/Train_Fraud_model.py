@@ -1,6 +1,7 @@
 import pandas as pd
 import logging
 import json
+import joblib
 import os
 import sys
 
@@ -13,6 +14,7 @@ from src.utils.training_and_evaluation_utils import (
     plot_confusion_matrix
 )
 from src.core.DataTransformer import FraudPreprocessor
+from src.services.inference_bundle import save_bundle
 
 # -------------------------
 # ✅ Logging setup
@@ -32,18 +34,26 @@ plot_dir = "../models/Fraud Model/plots"
 mappings_dir = "../models/Fraud Model/Mappings"
 
 # -------------------------
-# ✅ Load fraud dataset
+# ✅ Initialize preprocessor
+# -------------------------
+logger.info("Initializing FraudPreprocessor")
+preprocessor = FraudPreprocessor(mode="fraud_data", sampler="auto")
+
+# -------------------------
+# ✅ Load fraud dataset (columnar cache, only the columns the preprocessor uses)
 # -------------------------
 logger.info("Loading fraud_data.csv")
-df = load_data("../data/processed/Feature_engineered/Feature_engineered_fraud_data.csv")
+df = load_data(
+    "../data/processed/Feature_engineered/Feature_engineered_fraud_data.csv",
+    columns=preprocessor.input_columns() + ["class"],
+    cache=True
+)
 X = df.drop(columns="class")
 y = df["class"]
 
 # -------------------------
-# ✅ Initialize and fit preprocessor
+# ✅ Fit preprocessor
 # -------------------------
-logger.info("Initializing FraudPreprocessor")
-preprocessor = FraudPreprocessor(mode="fraud_data", sampler="auto")
 preprocessor.fit(X, y)
 
 # -------------------------
@@ -54,11 +64,19 @@ mappings = preprocessor.save_mappings()
 with open(f"{mappings_dir}/fraud_encoding_maps.json", "w") as f:
     json.dump(mappings, f)
 
+# Fitted preprocessor with its online encoders, updated by Retrain_Fraud_model.py
+joblib.dump(preprocessor, f"{models_dir}/fraud_preprocessor.pkl")
+
 # -------------------------
 # ✅ Train/test split
 # -------------------------
 X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
 
+# Calibration split, held out before resampling so it keeps the real fraud rate
+X_train, X_cal, y_train, y_cal = train_test_split_data(X_train, y_train, test_size=0.2, stratify=y_train)
+X_cal_transformed = preprocessor.transform(X_cal)
+REVIEW_COST = 10.0  # cost of investigating one false alert; a missed fraud costs its purchase_value
+
 # -------------------------
 # ✅ Transform + sampling (RUS)
 # -------------------------
@@ -94,7 +112,12 @@ models = {
 for name, trainer in models.items():
     logger.info(f"⚙️ Training model: {name}")
     param_grid = param_grids.get(name)
-    trainer.train(X_train_sampled, y_train_sampled, param_grid=param_grid, search_type="grid")
+    trainer.train(X_train_sampled, y_train_sampled, param_grid=param_grid, search_type="halving", n_jobs=-1,
+                  sample_weight=preprocessor.sample_weight(y_train_sampled))
+
+    # Calibrate probabilities and pick the threshold with the lowest expected loss
+    trainer.calibrate(X_cal_transformed, y_cal, method="isotonic",
+                      cost_fp=REVIEW_COST, cost_fn=X_cal["purchase_value"].to_numpy())
 
     y_pred = trainer.predict(X_test_transformed)
     y_proba = trainer.predict_proba(X_test_transformed)
@@ -114,6 +137,9 @@ for name, trainer in models.items():
     # Save model
     trainer.save_model(f"{models_dir}/{name}_fraud.pkl")
 
+    # Save fused inference bundle (preprocessor state + model + feature schema)
+    save_bundle(f"{models_dir}/{name}_fraud.bundle", preprocessor, trainer)
+
 logger.info("✅ All fraud models trained.")
 logger.info("✅ All fraud models evaluated.")
 logger.info("✅ All fraud models saved.")
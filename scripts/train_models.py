@@ -0,0 +1,48 @@
+import argparse
+import logging
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")  # plots are rendered on a background thread, never shown
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECT_ROOT)
+from config.settings import TRAINING_CONFIG
+from src.services.training_orchestrator import TrainingOrchestrator
+from src.utils.profiling import profiler
+
+# -------------------------
+# ✅ Logging setup
+# -------------------------
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# ✅ Arguments
+# -------------------------
+parser = argparse.ArgumentParser(description="Train every configured dataset x model concurrently.")
+parser.add_argument("--datasets", nargs="+", choices=list(TRAINING_CONFIG["datasets"]), default=None)
+parser.add_argument("--models", nargs="+", choices=list(TRAINING_CONFIG["models"]), default=None)
+parser.add_argument("--cores", type=int, default=None, help="core budget (defaults to all cores)")
+parser.add_argument("--profile", default=None, metavar="PREFIX",
+                    help="profile every stage and write PREFIX.json and PREFIX.trace.json (Chrome trace)")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable()
+
+    # -------------------------
+    # ✅ Train, evaluate and save all models
+    # -------------------------
+    orchestrator = TrainingOrchestrator(TRAINING_CONFIG, root=PROJECT_ROOT, n_cores=args.cores)
+    orchestrator.run(datasets=args.datasets, models=args.models)
+
+    for (dataset, model), metrics in orchestrator.results.items():
+        logger.info(f"📊 {dataset} / {model}: ROC AUC {metrics['roc_auc']:.4f}")
+    logger.info(f"✅ Stage timings saved to {TRAINING_CONFIG['timings_path']}")
+
+    if args.profile:
+        profiler.to_json(f"{args.profile}.json")
+        profiler.to_chrome_trace(f"{args.profile}.trace.json")
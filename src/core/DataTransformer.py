@@ -1,28 +1,69 @@
 import pandas as pd
 import numpy as np
 import logging
+from collections.abc import Mapping
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from imblearn.over_sampling import SMOTE
 from imblearn.under_sampling import RandomUnderSampler
+from src.core.drift import build_reference
+from src.core.encoders import CountMinFrequencyEncoder, FrequencyEncoder, SmoothedTargetEncoder
+from src.core.lookup import ArrayLookup
+from src.core.resampling import MiniBatchSMOTE, balanced_sample_weight
+from src.utils.profiling import SampledLogger, profiled
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Per-call messages of the scoring path are sampled and formatted lazily
+sampled_logger = SampledLogger(logger)
+
+# Numeric fraud_data columns taken as-is; the encoded device/country columns follow them
+FRAUD_RAW_NUM_COLS = ("purchase_value", 'age', 'purchase_hour', 'purchase_dayofweek',
+                      'time_since_signup', 'user_txn_count', 'user_txn_velocity')
+
+# Batches up to this size encode categoricals with dict lookups instead of Index.get_indexer
+_SMALL_BATCH = 256
 
 class FraudPreprocessor(BaseEstimator, TransformerMixin):
-    def __init__(self, mode='fraud_data', sampler='auto'):
+    def __init__(self, mode='fraud_data', sampler='auto', smoothing=0.0, decay=1.0,
+                 device_encoding='exact', sketch_params=None):
         self.mode = mode
         self.sampler = sampler
+        self.smoothing = smoothing  # pseudo-count for the country target encoding
+        self.decay = decay  # count decay applied at each partial_fit call
+        self.device_encoding = device_encoding  # 'exact' or 'sketch' (top-K table + count-min sketch)
+        self.sketch_params = sketch_params  # kwargs for CountMinFrequencyEncoder
         self.device_freq_map = None
         self.country_fraud_map = None
         self.global_fraud_rate = None
         self.num_cols = []
         self.cat_cols = []
         self.column_transformer = None
+        self.scoring_tables = None
+        self.reference_profile = None  # fit-data snapshot for DriftMonitor
+
+    def input_columns(self):
+        """
+        Raw columns this mode reads from the dataset (excluding the target),
+        e.g. for column-projected loading with load_data(columns=...).
+        """
+        if self.mode == 'fraud_data':
+            return list(FRAUD_RAW_NUM_COLS) + ['device_id', 'country', 'source', 'browser', 'sex']
+        if self.num_cols:
+            return list(self.num_cols)
+        return [f'V{i}' for i in range(1, 29)] + ['Amount']
 
+    def _make_device_encoder(self, decay):
+        if self.device_encoding == 'sketch':
+            return CountMinFrequencyEncoder(decay=decay, **(self.sketch_params or {}))
+        if self.device_encoding == 'exact':
+            return FrequencyEncoder(decay=decay)
+        raise ValueError(f"Unknown device_encoding: {self.device_encoding}")
+
+    @profiled('fit', rows='X')
     def fit(self, X, y):
         logger.info(f"Fitting FraudPreprocessor for mode: {self.mode}")
         df = X.copy()
@@ -30,17 +71,15 @@ class FraudPreprocessor(BaseEstimator, TransformerMixin):
 
         if self.mode == 'fraud_data':
             # Frequency encoding
-            self.device_freq_map = df['device_id'].value_counts(normalize=True).to_dict()
-            df['device_id_freq'] = df['device_id'].map(self.device_freq_map).fillna(0)
+            self.device_freq_map = self._make_device_encoder(self.decay).partial_fit(df['device_id'])
+            df['device_id_freq'] = _encode(self.device_freq_map, df['device_id'], 0)
 
             # Target encoding
-            self.country_fraud_map = df.groupby('country')['class'].mean().to_dict()
-            self.global_fraud_rate = df['class'].mean()
-            df['country_encoded'] = df['country'].map(self.country_fraud_map).fillna(self.global_fraud_rate)
+            self.country_fraud_map = SmoothedTargetEncoder(self.smoothing, self.decay).partial_fit(df['country'], df['class'])
+            self.global_fraud_rate = self.country_fraud_map.prior
+            df['country_encoded'] = _encode(self.country_fraud_map, df['country'], self.global_fraud_rate)
 
-            self.num_cols = ["purchase_value", 'age', 'purchase_hour', 'purchase_dayofweek',
-                             'time_since_signup', 'user_txn_count', 'user_txn_velocity',
-                             'device_id_freq', 'country_encoded']
+            self.num_cols = list(FRAUD_RAW_NUM_COLS) + ['device_id_freq', 'country_encoded']
             self.cat_cols = ['source', 'browser', 'sex']
 
         elif self.mode == 'creditcard_data':
@@ -54,33 +93,201 @@ class FraudPreprocessor(BaseEstimator, TransformerMixin):
 
         self.column_transformer.fit(df.drop(columns='class'))
         logger.info("ColumnTransformer fitted")
+        self.reference_profile = build_reference(df, self.num_cols, self.cat_cols)
 
+        self.compile_scoring()
         return self
 
-    def transform(self, X):
-        logger.info("Transforming data with trained encoders/scalers")
-        df = X.copy()
+    @profiled('fit')
+    def fit_chunks(self, chunks, target='class', reference_rows=100_000):
+        """
+        Fits on an iterable of DataFrame chunks (features + target column) without
+        holding the dataset in memory. Device counts, per-country target sums and
+        scaler moments are accumulated incrementally; the resulting maps and
+        scaler statistics match fit() on the concatenated data. The drift
+        reference is built from a uniform sample of reference_rows rows drawn
+        across all chunks, with the encoded columns from the finished encoders.
+        """
+        logger.info(f"Fitting FraudPreprocessor on chunks for mode: {self.mode}")
+        raw_scaler = StandardScaler()
+        # Decay only applies to later partial_fit calls, not between chunks of one fit
+        device_encoder = self._make_device_encoder(decay=1.0)
+        country_encoder = SmoothedTargetEncoder(smoothing=self.smoothing)
+        categories = {}
+        raw_cols = None
+        # Bottom-k sample on random priorities: uniform over all chunks in bounded memory
+        rng = np.random.default_rng(42)
+        sample, priorities = None, np.empty(0)
+        n_rows = 0
+
+        for chunk in chunks:
+            y = chunk[target]
+            if raw_cols is None:
+                if self.mode == 'fraud_data':
+                    raw_cols = list(FRAUD_RAW_NUM_COLS)
+                    self.cat_cols = ['source', 'browser', 'sex']
+                else:
+                    raw_cols = [col for col in chunk.columns if col.startswith('V')] + ['Amount']
+                    self.cat_cols = []
+                categories = {col: set() for col in self.cat_cols}
 
+            chunk_priorities = rng.random(len(chunk))
+            if len(chunk_priorities):
+                sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+                priorities = np.concatenate([priorities, chunk_priorities])
+                if len(priorities) > reference_rows:
+                    keep = np.argpartition(priorities, reference_rows)[:reference_rows]
+                    sample, priorities = sample.iloc[keep].reset_index(drop=True), priorities[keep]
+
+            if self.mode == 'fraud_data':
+                device_encoder.partial_fit(chunk['device_id'])
+                country_encoder.partial_fit(chunk['country'], y)
+                for col in self.cat_cols:
+                    categories[col].update(chunk[col].dropna().unique().tolist())
+
+            raw_scaler.partial_fit(chunk[raw_cols])
+            n_rows += len(chunk)
+
+        if n_rows == 0:
+            raise ValueError("fit_chunks received no rows")
+
+        mean, var = list(raw_scaler.mean_), list(raw_scaler.var_)
+        self.num_cols = list(raw_cols)
         if self.mode == 'fraud_data':
-            df['device_id_freq'] = df['device_id'].map(self.device_freq_map).fillna(0)
-            df['country_encoded'] = df['country'].map(self.country_fraud_map).fillna(self.global_fraud_rate)
+            device_encoder.decay = country_encoder.decay = self.decay
+            self.device_freq_map = device_encoder
+            self.country_fraud_map = country_encoder
+            self.global_fraud_rate = country_encoder.prior
+
+            # Row-weighted moments of the encoded columns, from the per-key counts
+            for encoder in (device_encoder, country_encoder):
+                col_mean, col_var = encoder.row_moments()
+                mean.append(col_mean)
+                var.append(col_var)
+            self.num_cols += ['device_id_freq', 'country_encoded']
+
+        # Fit the ColumnTransformer structure on a tiny frame covering every
+        # category, then install the streamed scaler moments.
+        n_summary = max([2] + [len(values) for values in categories.values()])
+        summary = {col: np.zeros(n_summary) for col in self.num_cols}
+        for col in self.cat_cols:
+            values = sorted(categories[col])
+            summary[col] = [values[i % len(values)] for i in range(n_summary)]
+        self.column_transformer = ColumnTransformer([
+            ('num', StandardScaler(), self.num_cols),
+            ('cat', OneHotEncoder(drop='first', sparse_output=False), self.cat_cols)
+        ])
+        self.column_transformer.fit(pd.DataFrame(summary))
+
+        scaler = self.column_transformer.named_transformers_['num']
+        scaler.mean_ = np.asarray(mean, dtype=np.float64)
+        scaler.var_ = np.asarray(var, dtype=np.float64)
+        scaler.scale_ = np.where(scaler.var_ > 0, np.sqrt(scaler.var_), 1.0)
+        scaler.n_samples_seen_ = n_rows
+        logger.info(f"ColumnTransformer fitted on {n_rows} streamed rows")
+
+        # Drift reference from the sample, including the encoded columns the model receives
+        if self.mode == 'fraud_data':
+            sample = sample.copy()
+            sample['device_id_freq'] = _encode(self.device_freq_map, sample['device_id'], 0)
+            sample['country_encoded'] = _encode(self.country_fraud_map, sample['country'], self.global_fraud_rate)
+        self.reference_profile = build_reference(sample, self.num_cols, self.cat_cols)
+        self.reference_profile['n_rows'] = n_rows
+
+        self.compile_scoring()
+        return self
+
+    def sample_chunks(self, chunks, target='class'):
+        """
+        Transforms and resamples chunk by chunk, so only the (much smaller)
+        resampled training set is ever held in memory. Meant for undersampling;
+        oversamplers such as SMOTE only see the minority rows of one chunk.
+        """
+        X_parts, y_parts = [], []
+        for chunk in chunks:
+            y = chunk[target].reset_index(drop=True)
+            X_resampled, y_resampled = self.sample(self.transform(chunk.drop(columns=target)), y)
+            X_parts.append(X_resampled)
+            y_parts.append(pd.Series(y_resampled, name=target))
+        return pd.concat(X_parts, ignore_index=True), pd.concat(y_parts, ignore_index=True)
+
+    @profiled('transform', rows='X')
+    def transform(self, X, output='frame', copy=True):
+        """
+        Applies the fitted encoders and scaler.
+
+        Parameters:
+        - X: raw feature frame
+        - output: 'frame' (float64 DataFrame, as before), 'float32' (NumPy
+          float32 array) or 'sparse' (float32 CSR matrix, one-hot block kept sparse).
+          The array outputs are computed from the compiled scoring tables with
+          no intermediate DataFrame, and equal the frame values cast to float32.
+          CSR stores every numeric value explicitly at 8 bytes (value + int32
+          column index) against 4 per float32 cell, so 'sparse' only saves
+          memory when the one-hot block is more than about twice as wide as
+          the numeric block plus the one-hot hits per row; on the fraud schema
+          (9 numeric + 7 one-hot columns) it is larger than 'float32'.
+        - copy: with output='frame', copy=False writes the encoded device/country
+          columns into X instead of copying it first (X is modified)
+        """
+        sampled_logger.info("Transforming data with trained encoders/scalers")
+        if output not in ('frame', 'float32', 'sparse'):
+            raise ValueError(f"Unknown transform output: {output}")
+        if output != 'frame' or (self.column_transformer is None and getattr(self, 'scoring_tables', None) is not None):
+            # Array outputs, or rebuilt from an inference bundle (no ColumnTransformer): use the compiled tables
+            if getattr(self, 'scoring_tables', None) is None:
+                # Preprocessor pickled before the tables existed
+                self.compile_scoring()
+            columns = {col: X[col].to_numpy() for col in X.columns}
+            dtype = np.float64 if output == 'frame' else np.float32
+            X_transformed = self._transform_columns(columns, len(X), dtype=dtype, sparse=output == 'sparse')
+            if output != 'frame':
+                sampled_logger.info("Transformation complete → shape: %s (%s)", X_transformed.shape, output)
+                return X_transformed
+            return pd.DataFrame(X_transformed, columns=self._feature_names())
+
+        df = X.copy() if copy else X
+
+        if self.mode == 'fraud_data':
+            df['device_id_freq'] = _encode(self.device_freq_map, df['device_id'], 0)
+            df['country_encoded'] = _encode(self.country_fraud_map, df['country'], self.global_fraud_rate)
 
         X_transformed = self.column_transformer.transform(df)
-        feature_names = self.column_transformer.get_feature_names_out()
-        logger.info(f"Transformation complete → shape: {X_transformed.shape}")
+        sampled_logger.info("Transformation complete → shape: %s", X_transformed.shape)
+
+        return pd.DataFrame(X_transformed, columns=self._feature_names(), copy=False)
+
+    def _feature_names(self):
+        # Cached at fit time; asked from the ColumnTransformer for preprocessors pickled before the cache
+        if getattr(self, 'scoring_tables', None) is not None:
+            return self.scoring_tables['feature_names']
+        return self.column_transformer.get_feature_names_out().tolist()
 
-        return pd.DataFrame(X_transformed, columns=feature_names)
+    def get_feature_names_out(self, input_features=None):
+        """Output feature names, cached when the preprocessor was fitted."""
+        return np.asarray(self._feature_names(), dtype=object)
 
+    @profiled('sample', rows='X')
     def sample(self, X, y):
+        """
+        Rebalances the training set. sampler='auto' undersamples fraud_data and
+        oversamples creditcard_data with MiniBatchSMOTE (float32, partitioned
+        neighbour search); 'smote' uses imblearn's SMOTE; 'weights' leaves the
+        rows as they are (float32) for training with sample_weight() instead.
+        """
         logger.info(f"Applying sampling method: {self.sampler}")
+        if self.sampler == 'weights':
+            return X.astype(np.float32), y
         if self.sampler == 'auto':
             if self.mode == 'creditcard_data':
-                sampler = SMOTE(random_state=42) 
+                sampler = MiniBatchSMOTE(random_state=42)
             else:
                 sampler = RandomUnderSampler(
                 sampling_strategy=0.25,  # keep minority, reduce majority so it’s 4x larger
                 random_state=42
                 )
+        elif self.sampler == 'smote':
+            sampler = SMOTE(random_state=42)
         else:
             sampler = self.sampler # If custom sampler passed
 
@@ -88,25 +295,294 @@ class FraudPreprocessor(BaseEstimator, TransformerMixin):
         logger.info(f"Resampled data → new shape: {X_resampled.shape}")
         return X_resampled, y_resampled
 
+    def sample_weight(self, y):
+        """Balanced instance weights when sampler='weights', otherwise None (rows already resampled)."""
+        if self.sampler != 'weights':
+            return None
+        return balanced_sample_weight(y)
+
+    def partial_fit(self, X, y):
+        """
+        Updates the device frequency and country target encodings with a new
+        labelled batch in O(batch), applying the configured decay to the
+        existing counts first. The scaler and one-hot categories stay as fitted.
+        """
+        if self.mode != 'fraud_data':
+            return self
+        if not hasattr(self.device_freq_map, 'partial_fit'):
+            raise RuntimeError("partial_fit requires encoders from fit(), not a frozen inference bundle")
+
+        logger.info(f"Updating encodings with {len(X)} rows")
+        self.device_freq_map.partial_fit(X['device_id'])
+        self.country_fraud_map.partial_fit(X['country'], y)
+        self.global_fraud_rate = self.country_fraud_map.prior
+        return self
+
     def save_mappings(self):
         logger.info("Saving encoding maps for deployment or later inference")
         return {
-            'device_freq_map': self.device_freq_map,
-            'country_fraud_map': self.country_fraud_map,
-            'global_fraud_rate': self.global_fraud_rate
+            'device_freq_map': _as_dict(self.device_freq_map),
+            'country_fraud_map': _as_dict(self.country_fraud_map),
+            'global_fraud_rate': None if self.global_fraud_rate is None else float(self.global_fraud_rate)
         }
 
     def transform_for_inference(self, user_dict):
         """
         Accepts a single user query (dict-like), returns transformed row for prediction
         """
-        logger.info("Transforming user input for prediction")
+        sampled_logger.info("Transforming user input for prediction")
+        if getattr(self, 'scoring_tables', None) is not None:
+            return self.transform_batch([user_dict])
+
         df = pd.DataFrame([user_dict])
 
         if self.mode == 'fraud_data':
-            df['device_id_freq'] = df['device_id'].map(self.device_freq_map).fillna(0)
-            df['country_encoded'] = df['country'].map(self.country_fraud_map).fillna(self.global_fraud_rate)
+            df['device_id_freq'] = _encode(self.device_freq_map, df['device_id'], 0)
+            df['country_encoded'] = _encode(self.country_fraud_map, df['country'], self.global_fraud_rate)
 
         transformed = self.column_transformer.transform(df)
-        logger.info("Transformation for inference complete")
-        return transformed
\ No newline at end of file
+        return transformed
+
+    def compile_scoring(self):
+        """
+        Freezes the fitted encoders and scaler into flat NumPy arrays and lookup
+        tables so that transform_batch can score without pandas or sklearn.
+        """
+        scaler = self.column_transformer.named_transformers_['num']
+        categories, dropped = [], []
+        if self.cat_cols:
+            encoder = self.column_transformer.named_transformers_['cat']
+            drop_idx = encoder.drop_idx_
+            for i, feature_categories in enumerate(encoder.categories_):
+                categories.append(feature_categories.tolist())
+                dropped.append(None if drop_idx is None or drop_idx[i] is None else int(drop_idx[i]))
+
+        self._build_scoring_tables(
+            mean=np.asarray(scaler.mean_, dtype=np.float64),
+            scale=np.asarray(scaler.scale_, dtype=np.float64),
+            categories=categories,
+            dropped=dropped,
+            feature_names=self.column_transformer.get_feature_names_out().tolist(),
+        )
+        logger.info(f"Compiled scoring tables → {self.scoring_tables['n_features']} features")
+        return self
+
+    def _build_scoring_tables(self, mean, scale, categories, dropped, feature_names):
+        tables = {
+            'num_cols': list(self.num_cols),
+            'mean': mean,
+            'scale': scale,
+            'cat_cols': list(self.cat_cols),
+            'categories': categories,
+            'dropped': dropped,
+            'cat_lookup': [],
+            'cat_index': [],
+            'cat_columns': [],
+            'cat_offsets': [],
+            'feature_names': feature_names,
+        }
+
+        offset = len(self.num_cols)
+        for feature_categories, drop in zip(categories, dropped):
+            # Column index inside the one-hot block, -1 for the dropped category
+            lookup = {}
+            col = 0
+            for j, category in enumerate(feature_categories):
+                if j == drop:
+                    lookup[category] = -1
+                else:
+                    lookup[category] = col
+                    col += 1
+            tables['cat_lookup'].append(lookup)
+            # Vectorized form: category position (Index.get_indexer) -> one-hot column
+            tables['cat_index'].append(pd.Index(feature_categories, dtype=object))
+            tables['cat_columns'].append(np.array([lookup[c] for c in feature_categories], dtype=np.int64))
+            tables['cat_offsets'].append(offset)
+            offset += col
+        tables['n_features'] = offset
+
+        self.scoring_tables = tables
+
+    def export_state(self):
+        """
+        Returns the fitted state as (metadata, arrays): a JSON-serializable dict
+        and a dict of NumPy arrays, enough to rebuild the scoring path with
+        from_state() without the ColumnTransformer.
+        """
+        tables = self.scoring_tables
+        meta = {
+            'mode': self.mode,
+            'num_cols': tables['num_cols'],
+            'cat_cols': tables['cat_cols'],
+            'categories': tables['categories'],
+            'dropped': tables['dropped'],
+            'feature_names': tables['feature_names'],
+            'global_fraud_rate': None if self.global_fraud_rate is None else float(self.global_fraud_rate),
+        }
+        if getattr(self, 'reference_profile', None) is not None:
+            meta['reference'] = self.reference_profile
+        arrays = {'scaler_mean': tables['mean'], 'scaler_scale': tables['scale']}
+        if self.mode == 'fraud_data':
+            mappings = [('device', self.device_freq_map), ('country', self.country_fraud_map)]
+            if isinstance(self.device_freq_map, CountMinFrequencyEncoder):
+                # The sketch is exported as-is; only the country map becomes a lookup
+                meta['device_sketch'], sketch_arrays = self.device_freq_map.export_state()
+                arrays.update({f'device_sketch_{name}': array for name, array in sketch_arrays.items()})
+                mappings = mappings[1:]
+            for name, mapping in mappings:
+                if hasattr(mapping, 'to_lookup'):
+                    mapping = mapping.to_lookup()
+                elif not isinstance(mapping, ArrayLookup):
+                    mapping = ArrayLookup.from_dict(mapping)
+                arrays[f'{name}_keys'] = mapping.keys
+                arrays[f'{name}_values'] = mapping.values
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        """Rebuilds a scoring-ready FraudPreprocessor from export_state() output."""
+        pre = cls(mode=meta['mode'])
+        pre.num_cols = list(meta['num_cols'])
+        pre.cat_cols = list(meta['cat_cols'])
+        pre.global_fraud_rate = meta['global_fraud_rate']
+        pre.reference_profile = meta.get('reference')
+        if 'device_sketch' in meta:
+            pre.device_encoding = 'sketch'
+            pre.device_freq_map = CountMinFrequencyEncoder.from_state(
+                meta['device_sketch'],
+                {name: arrays[f'device_sketch_{name}'] for name in ('keys', 'counts', 'sketch')})
+        elif pre.mode == 'fraud_data':
+            pre.device_freq_map = ArrayLookup(arrays['device_keys'], arrays['device_values'])
+        if pre.mode == 'fraud_data':
+            pre.country_fraud_map = ArrayLookup(arrays['country_keys'], arrays['country_values'])
+        pre._build_scoring_tables(
+            mean=arrays['scaler_mean'],
+            scale=arrays['scaler_scale'],
+            categories=meta['categories'],
+            dropped=meta['dropped'],
+            feature_names=meta['feature_names'],
+        )
+        return pre
+
+    def transform_batch(self, batch):
+        """
+        Vectorized, DataFrame-free equivalent of transform for online scoring.
+        Accepts a list of dicts (one per transaction) or a columnar mapping of
+        column name -> sequence, and returns a float64 feature matrix whose
+        values are identical to transform().
+        """
+        tables = self.scoring_tables
+        if tables is None:
+            raise RuntimeError("FraudPreprocessor must be fitted before transform_batch")
+
+        if isinstance(batch, Mapping):
+            columns = batch
+            n_rows = len(next(iter(batch.values()))) if batch else 0
+        else:
+            rows = list(batch)
+            n_rows = len(rows)
+            needed = tables['num_cols'] + tables['cat_cols']
+            if self.mode == 'fraud_data':
+                needed = needed + ['device_id', 'country']
+            columns = {col: [row.get(col) for row in rows] for col in needed
+                       if col not in ('device_id_freq', 'country_encoded')}
+
+        return self._transform_columns(columns, n_rows)
+
+    def _transform_columns(self, columns, n_rows, dtype=np.float64, sparse=False):
+        """
+        Shared array path of transform_batch and the array outputs of transform.
+        For float32 each numeric column is scaled in float64 before it is stored,
+        so the output equals the float64 result cast to float32 without a
+        full-size float64 buffer.
+        """
+        tables = self.scoring_tables
+        n_num = len(tables['num_cols'])
+        num_block = np.empty((n_rows, n_num if sparse else tables['n_features']), dtype=dtype)
+        if not sparse:
+            num_block[:, n_num:] = 0
+
+        for j, col in enumerate(tables['num_cols']):
+            if col == 'device_id_freq':
+                values = _lookup_many(self.device_freq_map, columns['device_id'], 0.0)
+            elif col == 'country_encoded':
+                values = _lookup_many(self.country_fraud_map, columns['country'], self.global_fraud_rate)
+            else:
+                values = columns[col]
+            if dtype == np.float64:
+                num_block[:, j] = values
+            else:
+                num_block[:, j] = (np.asarray(values, dtype=np.float64) - tables['mean'][j]) / tables['scale'][j]
+        if dtype == np.float64:
+            # Same operations as StandardScaler, on the whole block at once
+            scaled = num_block[:, :n_num]
+            scaled -= tables['mean']
+            scaled /= tables['scale']
+
+        hot_rows, hot_cols = [], []
+        for col, lookup, index, cat_columns, offset in zip(tables['cat_cols'], tables['cat_lookup'], tables['cat_index'],
+                                                           tables['cat_columns'], tables['cat_offsets']):
+            values = columns[col]
+            # One-hot column of each row, -1 for the dropped category
+            if n_rows <= _SMALL_BATCH:
+                # Dict lookups beat Index.get_indexer's fixed overhead on a few rows
+                try:
+                    column_of = np.fromiter((lookup[v] for v in values), dtype=np.int64, count=n_rows)
+                except KeyError as e:
+                    raise ValueError(f"Found unknown category {e.args[0]!r} in column '{col}' during transform")
+            else:
+                values = np.asarray(values, dtype=object)
+                positions = index.get_indexer(values)
+                if (positions < 0).any():
+                    raise ValueError(f"Found unknown category {values[positions < 0][0]!r} in column '{col}' "
+                                     "during transform")
+                column_of = cat_columns[positions]
+            hit = column_of >= 0
+            if sparse:
+                hot_rows.append(hit)
+                hot_cols.append(offset + column_of[hit])
+            else:
+                num_block[hit, offset + column_of[hit]] = 1.0
+
+        if sparse:
+            from scipy import sparse as sp
+
+            # CSR arrays written directly (numeric entries, then each categorical's hit per row),
+            # without COO intermediates or a sparse copy of the dense numeric block
+            row_nnz = np.full(n_rows, n_num, dtype=np.int64)
+            for hit in hot_rows:
+                row_nnz += hit
+            indptr = np.zeros(n_rows + 1, dtype=np.int64)
+            np.cumsum(row_nnz, out=indptr[1:])
+            data = np.empty(indptr[-1], dtype=dtype)
+            indices = np.empty(indptr[-1], dtype=np.int32)
+            position = indptr[:-1].copy()
+            for j in range(n_num):
+                data[position] = num_block[:, j]
+                indices[position] = j
+                position += 1
+            for hit, cols in zip(hot_rows, hot_cols):
+                data[position[hit]] = 1.0
+                indices[position[hit]] = cols
+                position += hit
+            return sp.csr_matrix((data, indices, indptr), shape=(n_rows, tables['n_features']))
+        return num_block
+
+
+def _lookup_many(mapping, keys, default):
+    if hasattr(mapping, 'lookup'):
+        return mapping.lookup(keys, default)
+    return [mapping.get(k, default) for k in keys]
+
+
+def _encode(mapping, series, default):
+    # Plain dicts come from preprocessors pickled before the online encoders
+    if isinstance(mapping, dict):
+        return series.map(mapping).fillna(default)
+    return mapping.lookup(series.to_numpy(), default)
+
+
+def _as_dict(mapping):
+    if mapping is None or isinstance(mapping, dict):
+        return mapping
+    return mapping.to_dict()
\ No newline at end of file
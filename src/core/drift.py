@@ -0,0 +1,299 @@
+import logging
+import threading
+from collections.abc import Mapping
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Encoded numeric features -> (raw column, preprocessor attribute holding the map)
+ENCODED_SOURCES = {'device_id_freq': ('device_id', 'device_freq_map'),
+                   'country_encoded': ('country', 'country_fraud_map')}
+
+# Conventional PSI alert level; the binned KS statistic is flagged above KS_ALERT
+PSI_ALERT = 0.2
+KS_ALERT = 0.1
+
+_EPS = 1e-4
+
+
+def _bin_counts(values, edges):
+    """Counts per bin (len(edges) + 1 bins, values equal to an edge go right) and the number of NaNs."""
+    missing = np.isnan(values)
+    n_missing = int(missing.sum())
+    if n_missing:
+        values = values[~missing]
+    bins = np.searchsorted(edges, values, side='right')
+    return np.bincount(bins, minlength=len(edges) + 1), n_missing
+
+
+def _as_float(values):
+    """Float64 array of the values; None and non-numeric entries become NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64)
+
+
+def population_stability_index(expected, actual):
+    """PSI between two binned distributions given as proportions (empty bins floored at 1e-4)."""
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), _EPS)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), _EPS)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected, actual):
+    """Largest CDF gap at the bin edges: the KS statistic restricted to the reference bin edges."""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+def build_reference(df, numeric_cols, categorical_cols, n_bins=20):
+    """
+    Reference snapshot of the fit data for DriftMonitor: per numeric column the
+    interior quantile edges of n_bins bins with their proportions, per
+    categorical column the category proportions. JSON-serializable.
+
+    Parameters:
+    - df: fit frame including the encoded device_id_freq / country_encoded columns
+    - numeric_cols, categorical_cols: columns to profile (missing ones are skipped)
+    - n_bins: number of quantile bins per numeric column (fewer for discrete columns)
+    """
+    reference = {'n_rows': int(len(df)), 'numeric': {}, 'categorical': {}}
+    for col in numeric_cols:
+        if col not in df:
+            continue
+        values = _as_float(df[col])
+        finite = values[~np.isnan(values)]
+        if len(finite) == 0:
+            continue
+        edges = np.unique(np.quantile(finite, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        counts, n_missing = _bin_counts(values, edges)
+        reference['numeric'][col] = {
+            'edges': edges.tolist(),
+            'proportions': (counts / len(finite)).tolist(),
+            'missing_rate': n_missing / len(values),
+            'min': float(finite.min()),
+            'max': float(finite.max()),
+        }
+    for col in categorical_cols:
+        if col not in df:
+            continue
+        counts = df[col].astype(object).value_counts(dropna=False)
+        reference['categorical'][col] = {
+            'categories': counts.index.tolist(),
+            'proportions': (counts.to_numpy() / len(df)).tolist(),
+        }
+    return reference
+
+
+class DriftMonitor:
+    """
+    Streaming drift and data-quality monitor for scoring traffic.
+
+    update() only buffers the batch (O(1) per row on the scoring path); every
+    flush_rows rows the buffer is binned in one vectorized pass into fixed-size
+    histograms over the reference quantile edges, so memory does not grow with
+    traffic. report() compares them with the fit-time reference: PSI and binned
+    KS per column, missing rates, histogram quantile estimates, unseen-category
+    rates for the one-hot columns, and the share of device_id / country values
+    the encoders do not know (scored with the 0 / global_fraud_rate fallback).
+    With sample_every=k only every k-th row is kept (systematic sampling
+    across batches), cutting the cost by k for high-volume batch scoring.
+    Thread-safe, so the scoring workers can share one monitor.
+    """
+
+    def __init__(self, reference, encoders=None, flush_rows=1024, sample_every=1):
+        self.reference = reference
+        self.encoders = encoders or {}  # encoded column -> (raw column, mapping with lookup(), fallback value)
+        self.flush_rows = flush_rows
+        self.sample_every = sample_every
+        self._edges = {col: np.asarray(spec['edges'], dtype=np.float64) for col, spec in reference['numeric'].items()}
+        self._categories = {col: pd.Index(spec['categories'], dtype=object)
+                            for col, spec in reference['categorical'].items()}
+        self._needed = sorted((set(self._edges) - set(self.encoders)) | set(self._categories) |
+                              {source for source, _, _ in self.encoders.values()})
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor, flush_rows=1024, sample_every=1):
+        """Monitor against the reference stored by FraudPreprocessor.fit (also kept in inference bundles)."""
+        reference = getattr(preprocessor, 'reference_profile', None)
+        if reference is None:
+            raise ValueError("The preprocessor has no reference profile; refit it to monitor drift")
+        encoders = {}
+        for col, (source, attr) in ENCODED_SOURCES.items():
+            mapping = getattr(preprocessor, attr, None)
+            if mapping is not None:
+                fallback = 0.0 if col == 'device_id_freq' else preprocessor.global_fraud_rate
+                encoders[col] = (source, mapping, fallback)
+        return cls(reference, encoders, flush_rows, sample_every)
+
+    def reset(self):
+        with self._lock:
+            self._records = []
+            self._frames = []
+            self._pending_rows = 0
+            self._offered = 0
+            self.n_rows = 0
+            self._counts = {col: np.zeros(len(edges) + 1, dtype=np.int64) for col, edges in self._edges.items()}
+            self._missing = dict.fromkeys(self._edges, 0)
+            self._range = {col: (np.inf, -np.inf) for col in self._edges}
+            self._category_counts = {col: np.zeros(len(index) + 1, dtype=np.int64)
+                                     for col, index in self._categories.items()}
+            self._unseen = {source: 0 for source, _, _ in self.encoders.values()}
+
+    def update(self, batch):
+        """Buffers a scoring batch: a list of dicts, a columnar mapping or a DataFrame."""
+        with self._lock:
+            if isinstance(batch, pd.DataFrame):
+                n_rows = len(batch)
+            elif isinstance(batch, Mapping):
+                n_rows = len(next(iter(batch.values()))) if batch else 0
+            else:
+                batch = list(batch)
+                n_rows = len(batch)
+            if self.sample_every > 1:
+                # Rows whose position in the whole stream is a multiple of sample_every
+                start = -self._offered % self.sample_every
+                self._offered += n_rows
+                if isinstance(batch, pd.DataFrame):
+                    batch = batch.iloc[start::self.sample_every]
+                elif isinstance(batch, Mapping):
+                    batch = {col: values[start::self.sample_every] for col, values in batch.items()}
+                else:
+                    batch = batch[start::self.sample_every]
+                n_rows = len(range(start, n_rows, self.sample_every))
+                if not n_rows:
+                    return
+            if isinstance(batch, list):
+                self._records.extend(batch)
+            else:
+                self._frames.append((batch, n_rows))
+            self._pending_rows += n_rows
+            if self._pending_rows >= self.flush_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending_rows:
+            return
+        parts = self._frames
+        if self._records:
+            parts.append((self._record_columns(self._records), len(self._records)))
+        self._records, self._frames, self._pending_rows = [], [], 0
+        for columns, n in parts:
+            if n:
+                self._accumulate(columns, n)
+
+    def _record_columns(self, records):
+        """Columns of the monitored fields; fields absent from a record become None."""
+        try:
+            rows = list(map(itemgetter(*self._needed), records))
+        except KeyError:
+            return {col: [row.get(col) for row in records] for col in self._needed}
+        if len(self._needed) == 1:
+            return {self._needed[0]: rows}
+        return dict(zip(self._needed, zip(*rows)))
+
+    def _accumulate(self, df, n):
+        self.n_rows += n
+
+        # Unseen keys are counted for every encoder, whether or not its column has reference edges
+        encoded = {}
+        for col, (source, mapping, fallback) in self.encoders.items():
+            if source not in df:
+                continue
+            values = np.asarray(mapping.lookup(np.asarray(df[source], dtype=object), np.nan), dtype=np.float64)
+            unseen = np.isnan(values)
+            self._unseen[source] += int(unseen.sum())
+            # Bin the value the model actually receives
+            values[unseen] = fallback
+            encoded[col] = values
+
+        for col, edges in self._edges.items():
+            if col in self.encoders:
+                values = encoded.get(col, np.full(n, np.nan))
+            else:
+                values = _as_float(df[col]) if col in df else np.full(n, np.nan)
+            counts, n_missing = _bin_counts(values, edges)
+            self._counts[col] += counts
+            self._missing[col] += n_missing
+            if n_missing < n:
+                lo, hi = self._range[col]
+                self._range[col] = (min(lo, np.nanmin(values)), max(hi, np.nanmax(values)))
+
+        for col, index in self._categories.items():
+            positions = index.get_indexer(np.asarray(df[col], dtype=object)) if col in df else np.full(n, -1)
+            # The last slot counts categories absent from the reference
+            positions[positions < 0] = len(index)
+            self._category_counts[col] += np.bincount(positions, minlength=len(index) + 1)
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def quantiles(self, col, qs=(0.5, 0.9, 0.99)):
+        """Quantile estimates of a numeric column, interpolated within the reference bins."""
+        with self._lock:
+            self._flush()
+            counts = self._counts[col]
+            lo, hi = self._range[col]
+        spec = self.reference['numeric'][col]
+        total = counts.sum()
+        if total == 0:
+            return {q: None for q in qs}
+        bounds = np.concatenate([[min(lo, spec['min'])], self._edges[col], [max(hi, spec['max'])]])
+        cdf = np.concatenate([[0.0], np.cumsum(counts) / total])
+        return {q: float(np.interp(q, cdf, bounds)) for q in qs}
+
+    def report(self, psi_alert=PSI_ALERT, ks_alert=KS_ALERT):
+        """
+        Drift statistics of all traffic seen since the last reset().
+
+        Returns:
+        - dict with n_rows, per-column statistics under "features", encoder
+          unseen rates under "unseen_rate" and the drifted columns under "drifted"
+        """
+        with self._lock:
+            self._flush()
+            counts = {col: c.copy() for col, c in self._counts.items()}
+            category_counts = {col: c.copy() for col, c in self._category_counts.items()}
+            missing = dict(self._missing)
+            unseen = dict(self._unseen)
+            n_rows = self.n_rows
+
+        features, drifted = {}, []
+        for col, col_counts in counts.items():
+            spec = self.reference['numeric'][col]
+            n_valid = int(col_counts.sum())
+            stats = {'type': 'numeric', 'missing_rate': missing[col] / n_rows if n_rows else None,
+                     'reference_missing_rate': spec['missing_rate']}
+            if n_valid:
+                actual = col_counts / n_valid
+                stats.update(psi=population_stability_index(spec['proportions'], actual),
+                             ks=binned_ks(spec['proportions'], actual),
+                             quantiles=self.quantiles(col))
+                if stats['psi'] >= psi_alert or stats['ks'] >= ks_alert:
+                    drifted.append(col)
+            features[col] = stats
+
+        for col, col_counts in category_counts.items():
+            spec = self.reference['categorical'][col]
+            stats = {'type': 'categorical'}
+            if n_rows:
+                actual = col_counts / n_rows
+                stats.update(psi=population_stability_index(spec['proportions'] + [0.0], actual),
+                             unseen_rate=float(actual[-1]))
+                if stats['psi'] >= psi_alert:
+                    drifted.append(col)
+            features[col] = stats
+
+        return {
+            'n_rows': n_rows,
+            'sample_every': self.sample_every,
+            'features': features,
+            'unseen_rate': {source: count / n_rows if n_rows else None for source, count in unseen.items()},
+            'drifted': drifted,
+        }
@@ -0,0 +1,340 @@
+from abc import abstractmethod
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.core.lookup import ArrayLookup
+
+# Below this, decayed counts are folded back into the arrays to avoid underflow
+_MIN_SCALE = 1e-200
+# Same for the float32 count-min sketch: counts are added divided by the scale, and
+# float32 overflows at ~3.4e38, so the sketch is folded back much earlier
+_MIN_SKETCH_SCALE = 1e-20
+
+
+class _CountingEncoder(Mapping):
+    """
+    Shared state of the online encoders: a key -> slot dict (interning) and
+    parallel float64 count arrays grown by doubling. Counts are stored divided
+    by a global `scale`, so decaying every count is O(1) (scale *= decay) and
+    partial_fit stays O(batch) no matter how many keys have been seen.
+    """
+
+    def __init__(self, decay=1.0):
+        self.decay = decay
+        self._slots = {}
+        self._keys = []
+        self._counts = np.zeros(16)
+        self._total = 0.0
+        self._scale = 1.0
+
+    def _intern(self, keys):
+        """Returns per-row slot indices (-1 for nulls) and per-unique row counts."""
+        codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+        slots = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = len(self._keys)
+                self._keys.append(key)
+            slots[i] = slot
+        self._ensure_capacity(len(self._keys))
+        return codes, slots
+
+    def _ensure_capacity(self, n):
+        if n > len(self._counts):
+            capacity = max(n, 2 * len(self._counts))
+            self._grow(capacity)
+
+    def _grow(self, capacity):
+        self._counts = np.concatenate([self._counts, np.zeros(capacity - len(self._counts))])
+
+    def _apply_decay(self):
+        if self.decay < 1.0 and self._total > 0:
+            self._scale *= self.decay
+            if self._scale < _MIN_SCALE:
+                self._rescale()
+
+    def _rescale(self):
+        self._counts *= self._scale
+        self._total *= self._scale
+        self._scale = 1.0
+
+    def _slot_of(self, items):
+        """Vectorized key -> slot lookup, -1 for unseen keys and nulls."""
+        codes, uniques = pd.factorize(np.asarray(items, dtype=object))
+        get = self._slots.get
+        unique_slots = np.fromiter((get(k, -1) for k in uniques), dtype=np.int64, count=len(uniques))
+        return np.where(codes >= 0, unique_slots[codes], -1)
+
+    @property
+    def counts_(self):
+        """Current (decayed) row count per key, in key order."""
+        return self._counts[:len(self._keys)] * self._scale
+
+    @abstractmethod
+    def _values_at(self, slots):
+        """Encoded values of the keys at slots (an index or an index array)."""
+
+    @property
+    def values_(self):
+        """Encoded value per key, in key order."""
+        return self._values_at(np.arange(len(self._keys)))
+
+    def lookup(self, items, default):
+        slots = self._slot_of(items)
+        # Only the keys asked for are encoded, so a lookup is O(batch), not O(keys seen)
+        found = slots >= 0
+        result = np.full(len(slots), default, dtype=np.float64)
+        result[found] = self._values_at(slots[found])
+        return result
+
+    def row_moments(self):
+        """Row-weighted mean and variance of the encoded value over the data seen."""
+        weights, values = self.counts_, self.values_
+        total = weights.sum()
+        mean = np.dot(weights, values) / total
+        return mean, np.dot(weights, (values - mean) ** 2) / total
+
+    def to_lookup(self):
+        """Frozen, sorted-array copy for serving (see ArrayLookup)."""
+        keys = np.array([str(k) for k in self._keys])
+        order = np.argsort(keys, kind='stable')
+        return ArrayLookup(keys[order], self.values_[order])
+
+    def to_dict(self):
+        return dict(zip(self._keys, self.values_.tolist()))
+
+    def __getitem__(self, key):
+        return float(self._values_at(self._slots[key]))
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class FrequencyEncoder(_CountingEncoder):
+    """
+    Online frequency encoder: value = count(key) / total rows. With decay=1.0
+    the values equal value_counts(normalize=True) on all data seen so far.
+
+    Parameters:
+    - decay: factor applied to all existing counts at each partial_fit call
+    """
+
+    def partial_fit(self, keys):
+        self._apply_decay()
+        codes, slots = self._intern(keys)
+        valid = codes >= 0
+        per_unique = np.bincount(codes[valid], minlength=len(slots))
+        self._counts[slots] += per_unique / self._scale
+        self._total += valid.sum() / self._scale
+        return self
+
+    def _values_at(self, slots):
+        counts = self._counts[slots]
+        return counts / self._total if self._total else counts * 0.0
+
+
+class SmoothedTargetEncoder(_CountingEncoder):
+    """
+    Online target (mean) encoder with additive smoothing towards the global rate:
+    value = (positives(key) + smoothing * prior) / (count(key) + smoothing).
+    With smoothing=0 and decay=1.0 the values equal groupby(key)[target].mean().
+
+    Parameters:
+    - smoothing: pseudo-count pulling rare keys towards the prior
+    - decay: factor applied to all existing counts at each partial_fit call
+    """
+
+    def __init__(self, smoothing=0.0, decay=1.0):
+        super().__init__(decay=decay)
+        self.smoothing = smoothing
+        self._positives = np.zeros(len(self._counts))
+        self._total_positives = 0.0
+
+    def _grow(self, capacity):
+        super()._grow(capacity)
+        self._positives = np.concatenate([self._positives, np.zeros(capacity - len(self._positives))])
+
+    def _rescale(self):
+        self._positives *= self._scale
+        self._total_positives *= self._scale
+        super()._rescale()
+
+    def partial_fit(self, keys, y):
+        self._apply_decay()
+        codes, slots = self._intern(keys)
+        valid = codes >= 0
+        y = np.asarray(y, dtype=np.float64)
+        self._counts[slots] += np.bincount(codes[valid], minlength=len(slots)) / self._scale
+        self._positives[slots] += np.bincount(codes[valid], weights=y[valid], minlength=len(slots)) / self._scale
+        self._total += len(y) / self._scale
+        self._total_positives += y.sum() / self._scale
+        return self
+
+    @property
+    def prior(self):
+        """Global target rate over all (decayed) rows, the fallback for unseen keys."""
+        return self._total_positives / self._total if self._total else 0.0
+
+    def _values_at(self, slots):
+        counts, positives = self._counts[slots], self._positives[slots]
+        if not self.smoothing:
+            return positives / counts
+        m = self.smoothing / self._scale  # pseudo-count in stored (scaled) units
+        return (positives + m * self.prior) / (counts + m)
+
+
+class CountMinFrequencyEncoder:
+    """
+    Bounded-memory frequency encoder for very high-cardinality keys (device_id).
+
+    Every key is counted in a count-min sketch of `depth` x `width` float32
+    counters; the `top_k` heaviest keys are additionally kept in an exact
+    table. Keys outside the table are estimated from the sketch, which never
+    underestimates and, with probability 1 - delta, overestimates a frequency
+    by at most epsilon = e / width.
+
+    Parameters:
+    - top_k: size of the exact heavy-hitter table
+    - memory_mb: sketch memory budget; sets the width (overrides epsilon)
+    - epsilon: additive frequency error bound, used when memory_mb is None
+    - delta: failure probability of the bound; sets the depth
+    - decay: factor applied to all existing counts at each partial_fit call
+    """
+
+    def __init__(self, top_k=10000, memory_mb=None, epsilon=1e-6, delta=0.01, decay=1.0, seed=0):
+        self.top_k = top_k
+        self.decay = decay
+        self.seed = seed
+        self.depth = int(np.ceil(np.log(1.0 / delta)))
+        if memory_mb is not None:
+            self.width = int(memory_mb * 2**20 // (self.depth * 4))
+        else:
+            self.width = int(np.ceil(np.e / epsilon))
+        self.sketch = np.zeros((self.depth, self.width), dtype=np.float32)
+        self.heavy = {}
+        self._total = 0.0
+        self._scale = 1.0
+
+    @property
+    def epsilon(self):
+        return np.e / self.width
+
+    @property
+    def nbytes(self):
+        return self.sketch.nbytes
+
+    def _buckets(self, keys):
+        """Row-wise bucket index of every key, shape (depth, n)."""
+        h = pd.util.hash_array(np.asarray(keys, dtype=object), hash_key=f"{self.seed:016d}")
+        h1, h2 = h & np.uint64(0xFFFFFFFF), (h >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def _estimate(self, keys):
+        """Sketch estimate in stored (scaled) units."""
+        if len(keys) == 0:
+            return np.zeros(0)
+        buckets = self._buckets(keys)
+        return self.sketch[np.arange(self.depth)[:, None], buckets].min(axis=0).astype(np.float64)
+
+    def partial_fit(self, keys):
+        if self.decay < 1.0 and self._total > 0:
+            self._scale *= self.decay
+            if self._scale < _MIN_SKETCH_SCALE:
+                self.sketch *= np.float32(self._scale)
+                self.heavy = {k: v * self._scale for k, v in self.heavy.items()}
+                self._total *= self._scale
+                self._scale = 1.0
+
+        codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+        valid = codes >= 0
+        added = np.bincount(codes[valid], minlength=len(uniques)) / self._scale
+        self._total += valid.sum() / self._scale
+        if len(uniques) == 0:
+            return self
+
+        buckets = self._buckets(uniques)
+        for row in range(self.depth):
+            np.add.at(self.sketch[row], buckets[row], added.astype(np.float32))
+
+        # Exact counts for keys already in the table; admit new heavy hitters
+        heavy = self.heavy
+        in_table = np.fromiter((k in heavy for k in uniques), dtype=bool, count=len(uniques))
+        for key, count in zip(uniques[in_table], added[in_table]):
+            heavy[key] += count
+        candidates = np.flatnonzero(~in_table)
+        if len(candidates):
+            estimates = self.sketch[np.arange(self.depth)[:, None], buckets[:, candidates]].min(axis=0)
+            floor = min(heavy.values()) if len(heavy) >= self.top_k else 0.0
+            # Only the batch's top_k candidates can end up in the table
+            candidates = candidates[estimates > floor]
+            counts = added[candidates]
+            if len(candidates) > self.top_k:
+                keep = np.argpartition(-counts, self.top_k)[:self.top_k]
+                candidates, counts = candidates[keep], counts[keep]
+            estimates = self._estimate(uniques[candidates])
+            for key, estimate in zip(uniques[candidates], estimates):
+                heavy[key] = estimate
+            if len(heavy) > self.top_k:
+                ranked = sorted(heavy.items(), key=lambda kv: kv[1], reverse=True)
+                self.heavy = dict(ranked[:self.top_k])
+        return self
+
+    def lookup(self, items, default):
+        codes, uniques = pd.factorize(np.asarray(items, dtype=object))
+        values = np.empty(len(uniques))
+        get = self.heavy.get
+        exact = np.fromiter((get(k, -1.0) for k in uniques), dtype=np.float64, count=len(uniques))
+        hit = exact >= 0
+        values[hit] = exact[hit]
+        values[~hit] = self._estimate(uniques[~hit])
+        values = values / self._total if self._total else np.zeros(len(uniques))
+        # A zero estimate means the key was never seen
+        values = np.where(values > 0, values, default)
+        return np.where(codes >= 0, values[np.maximum(codes, 0)] if len(values) else default, default)
+
+    def get(self, key, default=None):
+        value = self.lookup([key], default=np.nan)[0]
+        return default if np.isnan(value) else float(value)
+
+    def row_moments(self):
+        """
+        Approximate row-weighted mean and variance of the encoded frequency,
+        from the sketch's second and third frequency moments.
+        """
+        counts = self.sketch.astype(np.float64)
+        total = self._total
+        mean = (counts ** 2).sum(axis=1).min() / total ** 2
+        second = (counts ** 3).sum(axis=1).min() / total ** 3
+        return mean, max(second - mean ** 2, 0.0)
+
+    def to_dict(self):
+        """Exact frequencies of the heavy-hitter table (the sketch is not enumerable)."""
+        return {k: v / self._total for k, v in self.heavy.items()}
+
+    def export_state(self):
+        """Returns (metadata, arrays) for the inference bundle; see from_state."""
+        meta = {'top_k': self.top_k, 'width': self.width, 'depth': self.depth, 'seed': self.seed,
+                'decay': self.decay, 'total': self._total, 'scale': self._scale}
+        arrays = {
+            'keys': np.array([str(k) for k in self.heavy]),
+            'counts': np.fromiter(self.heavy.values(), dtype=np.float64, count=len(self.heavy)),
+            'sketch': self.sketch,
+        }
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        encoder = cls.__new__(cls)
+        encoder.top_k, encoder.decay, encoder.seed = meta['top_k'], meta['decay'], meta['seed']
+        encoder.width, encoder.depth = meta['width'], meta['depth']
+        encoder._total, encoder._scale = meta['total'], meta['scale']
+        encoder.sketch = arrays['sketch']
+        encoder.heavy = dict(zip(arrays['keys'].tolist(), arrays['counts'].tolist()))
+        return encoder
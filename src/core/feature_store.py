@@ -0,0 +1,269 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Sliding windows for the user_txn_count_<name> features, in seconds
+DEFAULT_WINDOWS = {'1h': 3600, '24h': 86400, '7d': 7 * 86400}
+_SECONDS_PER_HOUR = 3600.0
+
+
+def to_epoch_seconds(value):
+    """Converts a number (epoch seconds), string, datetime or Timestamp to int epoch seconds."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return int(value)
+    return pd.Timestamp(value).value // 10**9
+
+
+def _to_epoch_array(values):
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.int64)
+    return pd.to_datetime(values).to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+
+def _drop_expired(recent, cutoff):
+    # Times are appended in order, so expired ones form a prefix
+    k = 0
+    while k < len(recent) and recent[k] <= cutoff:
+        k += 1
+    if k:
+        del recent[:k]
+
+
+class UserFeatureStore:
+    """
+    In-process store of per-user state for computing the behavioural features
+    of a live transaction: time_since_signup, user_txn_count, user_txn_velocity
+    (active span in hours / transaction count, as in the feature engineering
+    notebook) and sliding-window transaction counts.
+
+    Per user it keeps first/last purchase time, signup time and count in flat
+    int64 arrays, plus a short list of the purchase times still inside the
+    longest window, so each event is O(1) amortized. Times are int epoch
+    seconds (UTC).
+    """
+
+    def __init__(self, windows=None):
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.horizon = max(self.windows.values())
+        self._slots = {}
+        self._user_ids = []
+        self.first_purchase = np.zeros(1024, dtype=np.int64)
+        self.last_purchase = np.zeros(1024, dtype=np.int64)
+        self.signup_time = np.zeros(1024, dtype=np.int64)
+        self.txn_count = np.zeros(1024, dtype=np.int64)
+        self._recent = {}
+
+    def __len__(self):
+        return len(self._user_ids)
+
+    def _slot(self, user_id):
+        slot = self._slots.get(user_id)
+        if slot is None:
+            slot = self._slots[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+            if slot >= len(self.txn_count):
+                self._grow(2 * len(self.txn_count))
+        return slot
+
+    def _slots_for(self, user_ids):
+        """Vectorized _slot: interns each distinct id once instead of once per event."""
+        codes, uniques = pd.factorize(user_ids)
+        if self._user_ids:
+            unique_slots = pd.Index(self._user_ids).get_indexer(uniques)
+        else:
+            unique_slots = np.full(len(uniques), -1, dtype=np.int64)
+        new = np.flatnonzero(unique_slots < 0)
+        if len(new):
+            first_new = len(self._user_ids)
+            new_ids = uniques[new].tolist()
+            unique_slots[new] = first_new + np.arange(len(new))
+            self._user_ids.extend(new_ids)
+            self._slots.update(zip(new_ids, range(first_new, first_new + len(new))))
+            if len(self._user_ids) > len(self.txn_count):
+                self._grow(max(len(self._user_ids), 2 * len(self.txn_count)))
+        return unique_slots[codes].astype(np.int64)
+
+    def _grow(self, capacity):
+        for name in ('first_purchase', 'last_purchase', 'signup_time', 'txn_count'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def features(self, user_id, purchase_time, signup_time=None, update=True):
+        """
+        Features of one live transaction, counting the transaction itself. With
+        update=True (default) the event is also recorded in the store.
+        """
+        t = to_epoch_seconds(purchase_time)
+        slot = self._slots.get(user_id)
+        known = slot is not None
+        if signup_time is not None:
+            signup = to_epoch_seconds(signup_time)
+        elif known:
+            signup = int(self.signup_time[slot])
+        else:
+            signup = t
+
+        count = (int(self.txn_count[slot]) if known else 0) + 1
+        first = min(int(self.first_purchase[slot]), t) if known else t
+        recent = self._recent.get(slot, ()) if known else ()
+
+        features = {
+            'time_since_signup': (t - signup) / _SECONDS_PER_HOUR,
+            'user_txn_count': count,
+            'user_txn_velocity': (t - first) / _SECONDS_PER_HOUR / count,
+            'purchase_hour': (t // 3600) % 24,
+            'purchase_dayofweek': (t // 86400 + 3) % 7,  # 1970-01-01 was a Thursday
+        }
+        for name, width in self.windows.items():
+            features[f'user_txn_count_{name}'] = 1 + sum(1 for ts in recent if ts > t - width)
+
+        if update:
+            if not known:
+                slot = self._slot(user_id)
+            self.first_purchase[slot] = first
+            self.last_purchase[slot] = max(t, int(self.last_purchase[slot])) if known else t
+            self.signup_time[slot] = signup
+            self.txn_count[slot] = count
+            self._remember(slot, t)
+        return features
+
+    def _remember(self, slot, t):
+        recent = self._recent.get(slot)
+        if recent is None:
+            self._recent[slot] = [t]
+            return
+        recent.append(t)
+        _drop_expired(recent, t - self.horizon)
+
+    def prune(self, now):
+        """Drops the recent-time buffers of users with no event inside the longest window."""
+        cutoff = to_epoch_seconds(now) - self.horizon
+        for slot in [slot for slot, recent in self._recent.items() if not recent or recent[-1] <= cutoff]:
+            del self._recent[slot]
+
+    def replay(self, user_ids, purchase_times, signup_times=None):
+        """
+        Vectorized bulk update from a history of events (e.g. the training
+        set). Returns the point-in-time features of every event, in input
+        order, identical to calling features() on the events in time order.
+        Events should not predate what the store has already seen.
+        """
+        user_ids = np.asarray(user_ids)
+        times = _to_epoch_array(purchase_times)
+        n = len(times)
+        slots = self._slots_for(user_ids)
+        if signup_times is not None:
+            signups = _to_epoch_array(signup_times)
+        else:
+            signups = None
+
+        # (slot, time) order, ties broken by input order
+        order = np.argsort((slots << 32) + times, kind='stable')
+        s_slots, s_times = slots[order], times[order]
+        starts = np.r_[True, s_slots[1:] != s_slots[:-1]]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+        position = np.arange(n) - group_start
+
+        prior_count = self.txn_count[s_slots]
+        known = prior_count > 0
+        count = prior_count + position + 1
+        batch_first = s_times[group_start]
+        first = np.where(known, np.minimum(self.first_purchase[s_slots], batch_first), batch_first)
+
+        if signups is not None:
+            s_signup = signups[order]
+        else:
+            s_signup = np.where(known, self.signup_time[s_slots], batch_first)
+
+        sorted_features = {
+            'time_since_signup': (s_times - s_signup) / _SECONDS_PER_HOUR,
+            'user_txn_count': count,
+            'user_txn_velocity': (s_times - first) / _SECONDS_PER_HOUR / count,
+            'purchase_hour': (s_times // 3600) % 24,
+            'purchase_dayofweek': (s_times // 86400 + 3) % 7,
+        }
+
+        # Sliding-window counts: events of the batch are sorted by (slot, time)
+        # keys, so the count in (t - width, t] is a searchsorted away; times
+        # already held for these users are counted from a second key array
+        event_keys = (s_slots << 32) + s_times
+        prior_keys = np.sort(np.fromiter(
+            ((slot << 32) + ts for slot in np.unique(s_slots[known]).tolist() for ts in self._recent.get(slot, ())),
+            dtype=np.int64))
+        idx = np.arange(n)
+        for name, width in self.windows.items():
+            lower_keys = event_keys - width
+            in_batch = idx - np.searchsorted(event_keys, lower_keys, side='right') + 1
+            in_prior = (np.searchsorted(prior_keys, event_keys, side='right')
+                        - np.searchsorted(prior_keys, lower_keys, side='right'))
+            sorted_features[f'user_txn_count_{name}'] = in_batch + in_prior
+
+        # Write back the final state of every user in the batch
+        ends = np.r_[s_slots[1:] != s_slots[:-1], True]
+        end_slots = s_slots[ends]
+        self.first_purchase[end_slots] = first[ends]
+        self.last_purchase[end_slots] = np.where(
+            known[ends], np.maximum(self.last_purchase[end_slots], s_times[ends]), s_times[ends])
+        self.signup_time[end_slots] = s_signup[ends]
+        self.txn_count[end_slots] = count[ends]
+
+        # Keep the times that can still fall inside a window of a later event
+        user_last = s_times[ends][np.cumsum(starts) - 1]
+        keep = s_times > user_last - self.horizon
+        k_slots, k_times = s_slots[keep], s_times[keep].tolist()
+        bounds = np.flatnonzero(np.r_[True, k_slots[1:] != k_slots[:-1]]) if len(k_slots) else np.empty(0, int)
+        for slot, lo, hi in zip(k_slots[bounds].tolist(), bounds.tolist(), np.r_[bounds[1:], len(k_slots)].tolist()):
+            recent = self._recent.get(slot)
+            if recent is None:
+                self._recent[slot] = k_times[lo:hi]
+            else:
+                recent.extend(k_times[lo:hi])
+                _drop_expired(recent, k_times[hi - 1] - self.horizon)
+
+        inverse = np.empty(n, dtype=np.int64)
+        inverse[order] = np.arange(n)
+        return pd.DataFrame({name: values[inverse] for name, values in sorted_features.items()})
+
+    def snapshot(self, path):
+        """Writes the store to a single .npz file (flat arrays, no pickling)."""
+        n = len(self._user_ids)
+        recent_slots = np.fromiter((slot for slot, recent in self._recent.items() for _ in recent), dtype=np.int64)
+        recent_times = np.fromiter((ts for recent in self._recent.values() for ts in recent), dtype=np.int64)
+        user_ids = np.asarray(self._user_ids)
+        if user_ids.dtype == object:
+            user_ids = user_ids.astype(str)
+        np.savez(
+            path,
+            user_ids=user_ids,
+            first_purchase=self.first_purchase[:n],
+            last_purchase=self.last_purchase[:n],
+            signup_time=self.signup_time[:n],
+            txn_count=self.txn_count[:n],
+            recent_slots=recent_slots,
+            recent_times=recent_times,
+            windows=np.array(json.dumps(self.windows)),
+        )
+        logger.info(f"Feature store snapshot → {n} users, {len(recent_times)} recent events")
+        return path
+
+    @classmethod
+    def restore(cls, path):
+        with np.load(path) as data:
+            store = cls(windows=json.loads(str(data['windows'])))
+            store._user_ids = data['user_ids'].tolist()
+            store._slots = {user_id: slot for slot, user_id in enumerate(store._user_ids)}
+            store._grow(max(1024, len(store._user_ids)))
+            for name in ('first_purchase', 'last_purchase', 'signup_time', 'txn_count'):
+                getattr(store, name)[:len(store._user_ids)] = data[name]
+            for slot, ts in zip(data['recent_slots'].tolist(), data['recent_times'].tolist()):
+                store._recent.setdefault(slot, []).append(ts)
+        return store
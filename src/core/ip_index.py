@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_COUNTRY = 'Unknown'
+# Bucket width of the directory: one int32 entry per 2**12 addresses (4 MiB)
+DIRECTORY_SHIFT = 12
+
+
+class IpRangeIndex:
+    """
+    Prebuilt IP-to-country index over IpAddress_to_Country.csv.
+
+    Ranges are stored as sorted uint32 lower/upper bound arrays plus an int16
+    code per range into an interned array of country names. Lookups are a
+    bucket-directory probe (equivalent to np.searchsorted on the lower bounds,
+    without its cache misses on unsorted input), keep the caller's order and
+    return 'Unknown' for IPs that fall in a gap between ranges.
+    """
+
+    def __init__(self, lower, upper, codes, countries, directory=None):
+        self.lower = lower
+        self.upper = upper
+        self.codes = codes
+        self.countries = countries
+        if directory is None:
+            # Last range whose lower bound is <= the first address of each bucket
+            bucket_starts = np.arange(2 ** (32 - DIRECTORY_SHIFT), dtype=np.uint64) << DIRECTORY_SHIFT
+            directory = (np.searchsorted(lower, bucket_starts, side='right') - 1).astype(np.int32)
+        self.directory = directory
+
+    @classmethod
+    def from_frame(cls, ip_map_df, lower_col='lower_bound_ip_address',
+                   upper_col='upper_bound_ip_address', country_col='country'):
+        ranges = ip_map_df.sort_values(by=lower_col, kind='stable')
+        codes, countries = pd.factorize(ranges[country_col], sort=True)
+        logger.info(f"Built IP range index → {len(ranges)} ranges, {len(countries)} countries")
+        return cls(
+            lower=ranges[lower_col].to_numpy(dtype=np.float64).astype(np.uint32),
+            upper=ranges[upper_col].to_numpy(dtype=np.float64).astype(np.uint32),
+            codes=codes.astype(np.int16),
+            countries=np.asarray(countries, dtype=str),
+        )
+
+    @classmethod
+    def from_csv(cls, file_path):
+        return cls.from_frame(pd.read_csv(file_path))
+
+    def __len__(self):
+        return len(self.lower)
+
+    def lookup_codes(self, ips):
+        """Returns the country code of every IP, -1 where no range contains it."""
+        ips = np.atleast_1d(np.asarray(ips, dtype=np.float64))
+        valid = (ips >= 0) & (ips < 2**32)  # also False for NaN
+        ip_int = np.where(valid, ips, 0).astype(np.uint32)
+
+        pos = self.directory[ip_int >> DIRECTORY_SHIFT].astype(np.int64)
+        # Advance within the bucket past every range starting at or before the IP
+        active = np.arange(len(ip_int))
+        last = len(self.lower) - 1
+        while len(active):
+            nxt = pos[active] + 1
+            advance = nxt <= last
+            advance[advance] = self.lower[nxt[advance]] <= ip_int[active[advance]]
+            active = active[advance]
+            pos[active] += 1
+
+        found = valid & (pos >= 0)
+        pos = np.maximum(pos, 0)
+        # Compare the raw value against the upper bound: IPs in the dataset
+        # carry a fractional part, and x.5 lies outside a range ending at x
+        found &= ips <= self.upper[pos]
+        return np.where(found, self.codes[pos], -1)
+
+    def lookup(self, ips):
+        """Returns country names for an array of IPs, in input order."""
+        codes = self.lookup_codes(ips)
+        names = np.append(self.countries, UNKNOWN_COUNTRY).astype(object)
+        return names[codes]  # code -1 picks the trailing 'Unknown'
+
+    def lookup_one(self, ip):
+        """Scalar path for scoring a single transaction."""
+        if not 0 <= ip < 2**32:  # also False for NaN
+            return UNKNOWN_COUNTRY
+        ip_int = int(ip)
+        pos = int(self.directory[ip_int >> DIRECTORY_SHIFT])
+        while pos + 1 < len(self.lower) and self.lower[pos + 1] <= ip_int:
+            pos += 1
+        if pos < 0 or ip > self.upper[pos]:
+            return UNKNOWN_COUNTRY
+        return str(self.countries[self.codes[pos]])
+
+    def save(self, path):
+        """Writes the index as a directory of .npy files that load() can memory-map."""
+        os.makedirs(path, exist_ok=True)
+        for name in ('lower', 'upper', 'codes', 'countries', 'directory'):
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(path, 'index.json'), 'w') as f:
+            json.dump({'n_ranges': len(self), 'n_countries': len(self.countries)}, f)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                  for name in ('lower', 'upper', 'codes', 'countries', 'directory')}
+        return cls(**arrays)
+
+
+def map_ip_to_country(df, ip_index, ip_col='ip_address', country_col='country'):
+    """
+    Order-preserving replacement for map_ip_to_city: returns a copy of df with
+    a country column looked up from a prebuilt IpRangeIndex.
+    """
+    return df.assign(**{country_col: ip_index.lookup(df[ip_col].to_numpy())})
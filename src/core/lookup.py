@@ -0,0 +1,41 @@
+import numpy as np
+
+
+class ArrayLookup:
+    """
+    Read-only mapping backed by a sorted key array and a parallel value array.
+    Lookups are vectorized with np.searchsorted, and both arrays can be
+    memory-mapped from .npy files so several processes share the same pages.
+    """
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, mapping):
+        keys = np.array([str(k) for k in mapping.keys()])
+        values = np.fromiter(mapping.values(), dtype=np.float64, count=len(mapping))
+        order = np.argsort(keys, kind='stable')
+        return cls(keys[order], values[order])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, items, default):
+        """Returns the value for every item, `default` where the key is unknown."""
+        items = np.asarray(items).astype(str)
+        if len(self.keys) == 0:
+            return np.full(items.shape, default, dtype=np.float64)
+        pos = np.minimum(np.searchsorted(self.keys, items), len(self.keys) - 1)
+        found = self.keys[pos] == items
+        return np.where(found, self.values[pos], default)
+
+    def get(self, key, default=None):
+        pos = int(np.searchsorted(self.keys, str(key)))
+        if pos < len(self.keys) and self.keys[pos] == str(key):
+            return float(self.values[pos])
+        return default
+
+    def to_dict(self):
+        return dict(zip(self.keys.tolist(), self.values.tolist()))
@@ -0,0 +1,157 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def balanced_sample_weight(y, sampling_strategy=1.0):
+    """
+    Instance weights that stand in for oversampling: minority rows weigh
+    sampling_strategy * n_majority / n_minority, majority rows 1.
+
+    Returns:
+    - float32 array aligned with y
+    """
+    y = np.asarray(y)
+    n_pos = int((y == 1).sum())
+    weights = np.ones(len(y), dtype=np.float32)
+    if n_pos:
+        weights[y == 1] = sampling_strategy * (len(y) - n_pos) / n_pos
+    return weights
+
+
+def _block_knn(queries, candidates, k, query_ids=None, candidate_ids=None, block_size=2048):
+    """Exact k nearest candidates of each query (squared L2 via one GEMM per block), excluding itself."""
+    cand_sq = np.einsum('ij,ij->i', candidates, candidates)
+    k_eff = min(k, len(candidates) - 1)
+    out = np.empty((len(queries), k_eff), dtype=np.int64)
+    for start in range(0, len(queries), block_size):
+        block = queries[start:start + block_size]
+        d2 = cand_sq[None, :] - 2.0 * (block @ candidates.T)
+        if query_ids is not None:
+            # Exclude each point from its own neighbour list
+            rows = np.arange(len(block))
+            self_cols = np.searchsorted(candidate_ids, query_ids[start:start + block_size])
+            d2[rows, self_cols] = np.inf
+        nearest = np.argpartition(d2, k_eff - 1, axis=1)[:, :k_eff]
+        out[start:start + len(block)] = nearest if candidate_ids is None else candidate_ids[nearest]
+    return out
+
+
+def partitioned_knn(points, k=5, partition_size=4096, random_state=42):
+    """
+    k nearest neighbours of every point among the others.
+
+    Up to partition_size points this is exact. Above it, points are sorted
+    along their first principal axis and each contiguous partition searches
+    only itself plus half a partition on either side, so cost and memory are
+    O(n * partition_size) instead of O(n^2); neighbours across distant
+    partitions can be missed, which SMOTE tolerates.
+
+    Returns:
+    - (n, k) int64 array of neighbour indices into points
+    """
+    n = len(points)
+    ids = np.arange(n)
+    if n <= partition_size:
+        return _block_knn(points, points, k, query_ids=ids, candidate_ids=ids)
+
+    rng = np.random.default_rng(random_state)
+    sample = points[rng.choice(n, size=min(n, 10_000), replace=False)]
+    _, _, vt = np.linalg.svd(sample - sample.mean(axis=0), full_matrices=False)
+    order = np.argsort(points @ vt[0], kind='stable')
+
+    neighbors = np.empty((n, min(k, n - 1)), dtype=np.int64)
+    half = partition_size // 2
+    for start in range(0, n, partition_size):
+        stop = min(n, start + partition_size)
+        lo, hi = max(0, start - half), min(n, stop + half)
+        window = np.sort(order[lo:hi])
+        query = order[start:stop]
+        neighbors[query] = _block_knn(points[query], points[window], k, query_ids=query, candidate_ids=window)
+    return neighbors
+
+
+class MiniBatchSMOTE:
+    """
+    SMOTE with float32 storage, partitioned neighbour search and lazy
+    mini-batch generation.
+
+    fit keeps only the minority rows (float32) and their k nearest minority
+    neighbours. Synthetic rows are interpolated like imblearn's SMOTE
+    (x + gap * (neighbour - x), gap ~ U[0, 1)) but generated batch by batch:
+    iter_batches streams the resampled set without materializing it, and
+    fit_resample writes it once into a preallocated float32 array.
+    """
+
+    def __init__(self, k_neighbors=5, sampling_strategy=1.0, batch_size=65536, partition_size=4096,
+                 random_state=42):
+        self.k_neighbors = k_neighbors
+        self.sampling_strategy = sampling_strategy  # minority / majority ratio after resampling
+        self.batch_size = batch_size
+        self.partition_size = partition_size
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        minority = y == 1
+        self.minority_ = np.ascontiguousarray(np.asarray(X, dtype=np.float32)[minority])
+        n_minority = len(self.minority_)
+        n_majority = len(y) - n_minority
+        self.n_synthetic_ = max(0, int(self.sampling_strategy * n_majority) - n_minority)
+        if self.n_synthetic_ == 0:
+            # Nothing to generate, so no neighbours to search
+            self.neighbors_ = np.empty((n_minority, 0), dtype=np.int64)
+        elif n_minority < 2:
+            raise ValueError(f"MiniBatchSMOTE needs at least 2 minority rows to interpolate between, "
+                             f"got {n_minority}")
+        else:
+            self.neighbors_ = partitioned_knn(self.minority_, self.k_neighbors, self.partition_size,
+                                              self.random_state)
+        logger.info(f"MiniBatchSMOTE: {len(self.minority_)} minority rows, {self.n_synthetic_} synthetic rows to add")
+        return self
+
+    def _synthetic(self, rng, n):
+        base = rng.integers(0, len(self.minority_), n)
+        neighbor = self.neighbors_[base, rng.integers(0, self.neighbors_.shape[1], n)]
+        gap = rng.random(n, dtype=np.float32)[:, None]
+        start = self.minority_[base]
+        start += gap * (self.minority_[neighbor] - start)
+        return start
+
+    def iter_synthetic(self):
+        """Yields the synthetic minority rows in float32 batches of at most batch_size."""
+        rng = np.random.default_rng(self.random_state)
+        for start in range(0, self.n_synthetic_, self.batch_size):
+            yield self._synthetic(rng, min(self.batch_size, self.n_synthetic_ - start))
+
+    def iter_batches(self, X, y):
+        """Yields (X_batch, y_batch) float32 mini-batches of the original rows, then the synthetic ones."""
+        X_values, y_values = np.asarray(X), np.asarray(y)
+        for start in range(0, len(y_values), self.batch_size):
+            stop = start + self.batch_size
+            yield X_values[start:stop].astype(np.float32), y_values[start:stop]
+        for batch in self.iter_synthetic():
+            yield batch, np.ones(len(batch), dtype=y_values.dtype)
+
+    def fit_resample(self, X, y):
+        """
+        Original rows followed by the synthetic ones, in one preallocated
+        float32 array (a DataFrame with the same columns when X is one).
+        """
+        self.fit(X, y)
+        X_values, y_values = np.asarray(X), np.asarray(y)
+        X_out = np.empty((len(y_values) + self.n_synthetic_, X_values.shape[1]), dtype=np.float32)
+        X_out[:len(y_values)] = X_values
+        offset = len(y_values)
+        for batch in self.iter_synthetic():
+            X_out[offset:offset + len(batch)] = batch
+            offset += len(batch)
+        y_out = np.concatenate([y_values, np.ones(self.n_synthetic_, dtype=y_values.dtype)])
+
+        if isinstance(X, pd.DataFrame):
+            X_out = pd.DataFrame(X_out, columns=X.columns, copy=False)
+            y_out = pd.Series(y_out, name=getattr(y, 'name', None))
+        return X_out, y_out
@@ -0,0 +1,183 @@
+import json
+import logging
+import math
+import os
+
+import joblib
+import numpy as np
+
+from src.utils.evaluation import ScoreEvaluator, classification_metrics, confusion_counts
+
+logger = logging.getLogger(__name__)
+
+
+def _positive_scores(model, X):
+    return np.asarray(model.predict_proba(X)[:, 1], dtype=np.float64)
+
+
+def _metrics(y, flagged):
+    return classification_metrics(*confusion_counts(y, flagged))
+
+
+def choose_bands(screen_scores, model_scores, y, threshold=0.5, target_recall=None):
+    """
+    Picks the cascade's uncertainty band [low, high) on validation scores.
+    Rows the screen scores at or above high are flagged without the model:
+    high is the lowest screen score above which the screen alone is at least
+    as precise as the model. low is then the highest cutoff that keeps the
+    cascade's recall at target_recall (the model's own recall at threshold
+    by default), so as few rows as possible are escalated.
+
+    Parameters:
+    - screen_scores, model_scores: fraud probabilities of the cheap and the expensive model
+    - y: true labels
+    - threshold: decision threshold on model_scores
+    - target_recall: recall to hold; the model-only recall when None
+
+    Returns:
+    - dict with low, high, threshold, target_recall, escalation_rate and the
+      recall/precision of the cascade and of the model alone
+    """
+    s = np.asarray(screen_scores, dtype=np.float64)
+    y = np.asarray(y) == 1
+    model_flag = np.asarray(model_scores, dtype=np.float64) >= threshold
+    n_pos = int(y.sum())
+    if n_pos == 0:
+        raise ValueError("Choosing cascade bands needs fraud rows in the validation data")
+    model_only = _metrics(y, model_flag)
+    if target_recall is None:
+        target_recall = model_only["recall"]
+
+    evaluator = ScoreEvaluator(y, s)
+    precision = evaluator.tps / (evaluator.tps + evaluator.fps)
+    confident = np.flatnonzero(precision >= model_only["precision"])
+    high = float(evaluator.thresholds[confident[-1]]) if len(confident) else math.inf
+
+    # Fraud the screen flags on its own, and fraud only an escalation to the model catches
+    caught_by_screen = int((y & (s >= high)).sum())
+    escalation_hits = np.sort(s[y & (s < high) & model_flag])[::-1]
+    needed = math.ceil(target_recall * n_pos - 1e-9) - caught_by_screen
+    if needed <= 0:
+        low = high
+    elif needed > len(escalation_hits):
+        logger.warning(f"Recall {target_recall:.4f} is out of the cascade's reach; escalating every row below {high}")
+        low = -math.inf
+    else:
+        low = float(escalation_hits[needed - 1])
+
+    escalate = (s >= low) & (s < high)
+    cascade = _metrics(y, np.where(escalate, model_flag, s >= high))
+    return {
+        "low": low,
+        "high": high,
+        "threshold": float(threshold),
+        "target_recall": float(target_recall),
+        "escalation_rate": float(escalate.mean()),
+        "recall": cascade["recall"],
+        "precision": cascade["precision"],
+        "model_recall": model_only["recall"],
+        "model_precision": model_only["precision"],
+        "n_rows": int(len(y)),
+    }
+
+
+class CascadeModel:
+    """
+    Two-stage scorer: a cheap screen (logistic regression) scores every row
+    and only rows with a screen score in [low, high) are escalated to the
+    expensive model (XGBoost). Rows below low are cleared and rows at or above
+    high flagged on the screen score alone. Both stages take the same
+    FraudPreprocessor output, so the cascade can stand in for
+    ModelTrainer.model. predict_proba returns the model's probability for
+    escalated rows and the screen's otherwise, clipped to the side of
+    threshold the cascade decided (flagged rows >= threshold, cleared rows
+    below), so thresholding it agrees with predict. n_scored / n_escalated
+    count the traffic.
+    """
+
+    def __init__(self, screen, model, low, high=math.inf, threshold=0.5, report=None):
+        self.screen = screen
+        self.model = model
+        self.low = low
+        self.high = high
+        self.threshold = threshold
+        self.report = report
+        self.classes_ = np.array([0, 1])
+        self.n_scored = 0
+        self.n_escalated = 0
+
+    @classmethod
+    def fit(cls, screen, model, X_val, y_val, target_recall=None, threshold=None):
+        """
+        Cascade with bands chosen on validation rows (see choose_bands); the
+        decision threshold defaults to the model's calibrated one, else 0.5.
+        """
+        if threshold is None:
+            threshold = getattr(model, "threshold", 0.5)
+        report = choose_bands(_positive_scores(screen, X_val), _positive_scores(model, X_val), y_val,
+                              threshold=threshold, target_recall=target_recall)
+        logger.info(f"Cascade band [{report['low']:.4f}, {report['high']:.4f}) escalates "
+                    f"{report['escalation_rate']:.1%} of rows at recall {report['recall']:.4f} "
+                    f"(model alone {report['model_recall']:.4f})")
+        return cls(screen, model, report["low"], report["high"], threshold, report)
+
+    @property
+    def escalation_rate(self):
+        return self.n_escalated / self.n_scored if self.n_scored else None
+
+    def _score(self, X):
+        screen = _positive_scores(self.screen, X)
+        escalate = (screen >= self.low) & (screen < self.high)
+        n_escalated = int(escalate.sum())
+        self.n_scored += len(screen)
+        self.n_escalated += n_escalated
+        model = None
+        if n_escalated:
+            model = _positive_scores(self.model, X[escalate] if n_escalated < len(screen) else X)
+        return screen, escalate, model
+
+    def predict_proba(self, X):
+        screen, escalate, model = self._score(X)
+        # Screen-decided rows: the screen score, moved across threshold where it disagrees with the decision
+        flagged = screen >= self.high
+        p = np.where(flagged, np.maximum(screen, self.threshold),
+                     np.minimum(screen, np.nextafter(self.threshold, -np.inf)))
+        if model is not None:
+            p[escalate] = model
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        screen, escalate, model = self._score(X)
+        flagged = screen >= self.high
+        if model is not None:
+            flagged[escalate] = model >= self.threshold
+        return flagged.astype(np.int64)
+
+    def save(self, path, screen_file, model_file):
+        """
+        Writes the bands and validation report as JSON next to the two
+        ModelTrainer.save_model files it refers to (by file name).
+        """
+        state = {
+            "screen": screen_file,
+            "model": model_file,
+            "low": None if self.low == -math.inf else self.low,
+            "high": None if self.high == math.inf else self.high,
+            "threshold": self.threshold,
+            "report": {k: (None if isinstance(v, float) and math.isinf(v) else v) for k, v in (self.report or {}).items()},
+        }
+        with open(path, "w") as f:
+            json.dump(state, f, indent=2)
+        return path
+
+
+def load_cascade(path):
+    """Loads a cascade written by CascadeModel.save together with its two models."""
+    with open(path) as f:
+        state = json.load(f)
+    directory = os.path.dirname(path)
+    screen = joblib.load(os.path.join(directory, state["screen"]))
+    model = joblib.load(os.path.join(directory, state["model"]))
+    low = -math.inf if state["low"] is None else state["low"]
+    high = math.inf if state["high"] is None else state["high"]
+    return CascadeModel(screen, model, low, high, state["threshold"], state["report"])
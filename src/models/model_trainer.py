@@ -1,13 +1,26 @@
+import copy
 import logging
-from sklearn.linear_model import LogisticRegression
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
 from xgboost import XGBClassifier
 import joblib
+from src.models.search import HalvingSearch
+from src.models.calibration import CalibratedModel, fit_calibration
+from src.models.native import export_model
+from src.utils.evaluation import ScoreEvaluator
+from src.utils.profiling import SampledLogger, profiled
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+sampled_logger = SampledLogger(logger)
+
+# Step size of the SGD passes that update a logistic regression on standardized features
+_SGD_ETA0 = 0.01
 
 class ModelTrainer:
     def __init__(self, model_name="logistic_regression"):
@@ -25,33 +38,172 @@ class ModelTrainer:
         else:
             raise ValueError(f"Unknown model: {self.model_name}")
 
-    def train(self, X_train, y_train, param_grid=None, search_type="grid"):
+    @profiled("train", rows="X_train")
+    def train(self, X_train, y_train, param_grid=None, search_type="grid", n_jobs=None, sample_weight=None):
+        """
+        Fits the model, optionally with a hyperparameter search.
+
+        search_type is "grid", "random" or "halving" (successive halving on a
+        process pool, with XGBoost early stopping); n_jobs is passed to the search.
+        sample_weight (e.g. FraudPreprocessor.sample_weight) is passed to every fit.
+        """
+        fit_params = {} if sample_weight is None else {"sample_weight": np.asarray(sample_weight)}
         logger.info(f"Training model: {self.model_name}")
         if param_grid:
             logger.info(f"Running hyperparameter search: {search_type}")
             if search_type == "grid":
-                search = GridSearchCV(self.model, param_grid, cv=2, scoring="roc_auc")
+                search = GridSearchCV(self.model, param_grid, cv=2, scoring="roc_auc", n_jobs=n_jobs)
+            elif search_type == "halving":
+                search = HalvingSearch(self.model, param_grid, cv=2, n_jobs=-1 if n_jobs is None else n_jobs)
             else:
-                search = RandomizedSearchCV(self.model, param_grid, cv=2, scoring="roc_auc", n_iter=10)
-            search.fit(X_train, y_train)
+                search = RandomizedSearchCV(self.model, param_grid, cv=2, scoring="roc_auc", n_iter=10,
+                                            n_jobs=n_jobs)
+            search.fit(X_train, y_train, **fit_params)
             logger.info(f"Best parameters for {self.model_name}: {search.best_params_}")
             self.model = search.best_estimator_
             logger.info(f"Best model selected: {self.model}")
             return search
         else:
-            self.model.fit(X_train, y_train)
+            self.model.fit(X_train, y_train, **fit_params)
             logger.info("Training complete without search")
             return self.model
 
+    @profiled("train", rows="X_new")
+    def train_incremental(self, X_new, y_new, X_val, y_val, max_rounds=50, max_auc_drop=0.005,
+                          sample_weight=None, fallback=None, max_epochs=1, X_val_previous=None):
+        """
+        Updates the trained model with a new labelled batch instead of
+        retraining from scratch: XGBoost keeps boosting its booster for at most
+        max_rounds extra trees on the new rows, logistic regression takes
+        max_epochs SGD passes over them starting from its previous coefficients
+        (a bounded step, so the history the coefficients encode is blended
+        with the batch rather than replaced by it). A validation gate
+        keeps the update only if its ROC AUC on (X_val, y_val) is no more than
+        max_auc_drop below the previous model's; otherwise the model is fully
+        retrained with train(**fallback), or kept as it was when fallback is None.
+
+        X_new must have the features the model was trained on (transform with
+        the same preprocessor, after its partial_fit on the batch). When that
+        partial_fit changed the encodings, pass the validation rows transformed
+        by the preprocessor before it as X_val_previous, so the previous model
+        is judged on the features it was trained on. An updated or retrained
+        model is uncalibrated: call calibrate() again.
+
+        Parameters:
+        - X_new, y_new: new training rows (resampled like the original training set)
+        - X_val, y_val: held-out recent rows for the gate, not resampled
+        - max_rounds: boosting rounds added to an XGBoost model
+        - max_epochs: SGD passes over the new rows for a logistic regression
+        - max_auc_drop: largest tolerated ROC AUC loss against the previous model
+        - sample_weight: weights of the new rows
+        - fallback: keyword arguments of train() for the full retrain, e.g.
+          {"X_train": ..., "y_train": ..., "param_grid": ..., "search_type": "halving"},
+          or a function returning them, called only when the gate rejects the update
+        - X_val_previous: X_val with the previous model's features (defaults to X_val)
+
+        Returns:
+        - dict with mode ("incremental", "full_retrain" or "kept_previous"),
+          previous_auc, incremental_auc, auc of the resulting model, rows,
+          incremental_seconds and, after a fallback, full_seconds
+        """
+        estimator = self.model.estimator if isinstance(self.model, CalibratedModel) else self.model
+        fit_params = {} if sample_weight is None else {"sample_weight": np.asarray(sample_weight)}
+        X_val_previous = X_val if X_val_previous is None else X_val_previous
+        previous_auc = ScoreEvaluator(y_val, estimator.predict_proba(X_val_previous)[:, 1]).roc_auc()
+        logger.info(f"Incremental training of {self.model_name} on {len(y_new)} new rows")
+
+        start = time.perf_counter()
+        if self.model_name == "gbm":
+            booster = estimator.get_booster()
+            best = booster.attr("best_iteration")
+            if best is not None:
+                # Continue from the trees predict_proba uses, not the ones past the early-stopping point
+                booster = booster[:int(best) + 1]
+            updated = clone(estimator).set_params(n_estimators=max_rounds, early_stopping_rounds=None)
+            updated.fit(X_new, y_new, xgb_model=booster, **fit_params)
+        elif self.model_name == "logistic_regression":
+            # Solving the penalized loss to convergence on the batch alone would forget the
+            # history (the problem is convex), so only a few SGD passes start from the old
+            # coefficients; the LogisticRegression (solver included) keeps its parameters
+            penalty = estimator.penalty if estimator.penalty in ("l1", "l2") else None
+            sgd = SGDClassifier(loss="log_loss", penalty=penalty, alpha=1.0 / (estimator.C * len(y_new)),
+                                learning_rate="constant", eta0=_SGD_ETA0, max_iter=max_epochs, tol=None,
+                                random_state=42)
+            # Copies: SGD updates its initial coefficients in place
+            sgd.fit(X_new, y_new, coef_init=estimator.coef_.copy(), intercept_init=estimator.intercept_.copy(),
+                    **fit_params)
+            updated = copy.deepcopy(estimator)
+            updated.coef_, updated.intercept_ = sgd.coef_.copy(), sgd.intercept_.copy()
+        else:
+            raise ValueError(f"Incremental training is not supported for {self.model_name}")
+        incremental_seconds = time.perf_counter() - start
+        incremental_auc = ScoreEvaluator(y_val, updated.predict_proba(X_val)[:, 1]).roc_auc()
+
+        report = {
+            "mode": "incremental",
+            "previous_auc": previous_auc,
+            "incremental_auc": incremental_auc,
+            "rows": len(y_new),
+            "incremental_seconds": incremental_seconds,
+        }
+        if incremental_auc >= previous_auc - max_auc_drop:
+            self.model = updated
+        elif fallback is not None:
+            logger.warning(f"Incremental update lowered validation AUC from {previous_auc:.4f} to "
+                           f"{incremental_auc:.4f}; retraining {self.model_name} from scratch")
+            start = time.perf_counter()
+            self.model = self._init_model()
+            self.train(**(fallback() if callable(fallback) else fallback))
+            report["mode"] = "full_retrain"
+            report["full_seconds"] = time.perf_counter() - start
+        else:
+            logger.warning(f"Incremental update lowered validation AUC from {previous_auc:.4f} to "
+                           f"{incremental_auc:.4f}; keeping the previous model")
+            report["mode"] = "kept_previous"
+
+        if report["mode"] == "kept_previous":
+            # The previous model still expects the previous features
+            report["auc"] = previous_auc
+        else:
+            report["auc"] = ScoreEvaluator(y_val, self.predict_proba(X_val)).roc_auc()
+        logger.info(f"{self.model_name}: {report['mode']}, validation AUC {previous_auc:.4f} -> {report['auc']:.4f} "
+                    f"(incremental {incremental_seconds:.1f}s)")
+        return report
+
+    @profiled("calibrate", rows="X_cal")
+    def calibrate(self, X_cal, y_cal, method="isotonic", cost_fp=1.0, cost_fn=1.0):
+        """
+        Wraps the trained model with a probability calibrator and a cost-minimizing
+        decision threshold fitted on held-out (not resampled) data. Afterwards
+        predict_proba is calibrated, predict uses the threshold, and both are
+        saved with the model.
+        """
+        estimator = self.model.estimator if isinstance(self.model, CalibratedModel) else self.model
+        logger.info(f"Calibrating {self.model_name} on {len(y_cal)} held-out rows")
+        self.model, point = fit_calibration(estimator, X_cal, y_cal, method=method,
+                                            cost_fp=cost_fp, cost_fn=cost_fn)
+        return point
+
+    @profiled("predict", rows="X")
     def predict(self, X):
-        logger.info("Running predictions")
+        sampled_logger.info("Running predictions")
         return self.model.predict(X)
 
+    @profiled("predict", rows="X")
     def predict_proba(self, X):
-        logger.info("Calculating prediction probabilities")
+        sampled_logger.info("Calculating prediction probabilities")
         return self.model.predict_proba(X)[:, 1]
 
     def save_model(self, filepath):
         logger.info(f"Saving model to {filepath}")
         joblib.dump(self.model, filepath)
-        return filepath
\ No newline at end of file
+        return filepath
+
+    def export_model(self, path):
+        """
+        Writes the model as a native artifact (XGBoost booster / logistic
+        regression coefficients, see src.models.native) that
+        src.models.native.load_model scores without sklearn.
+        """
+        logger.info(f"Exporting native model to {path}")
+        return export_model(self.model, path)
@@ -0,0 +1,252 @@
+import json
+import logging
+import os
+
+import numpy as np
+
+# Workers load artifacts through this module alone: keep sklearn (and src modules importing it) out
+
+logger = logging.getLogger(__name__)
+
+NATIVE_FORMAT = "fraud-native-model"
+NATIVE_VERSION = 1
+MANIFEST_FILE = "model.json"
+BOOSTER_FILE = "booster.ubj"
+TREES_FILE = "trees.npz"
+COEF_FILE = "coef.npy"
+
+# Rows per pass of the NumPy tree evaluator, bounding its (rows x trees) buffers
+_TREE_BATCH = 8192
+
+_EPS = 1e-12
+
+
+def _logit(p):
+    p = np.clip(np.asarray(p, dtype=np.float64), _EPS, 1 - _EPS)
+    return np.log(p) - np.log1p(-p)
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _calibration_spec(calibrator):
+    if calibrator.method == "isotonic":
+        return {"method": "isotonic", "x": calibrator.x_.tolist(), "y": calibrator.y_.tolist()}
+    return {"method": "platt", "a": calibrator.a_, "b": calibrator.b_}
+
+
+def _tree_arrays(booster):
+    """
+    Flattens a binary:logistic gbtree booster into node arrays for the NumPy
+    evaluator: all trees concatenated, leaves pointing at themselves.
+
+    Returns:
+    - (arrays dict, base margin in log-odds)
+    """
+    learner = json.loads(bytes(booster.save_raw("json")))["learner"]
+    if learner["objective"]["name"] != "binary:logistic" or learner["gradient_booster"]["name"] != "gbtree":
+        raise ValueError("Native tree export supports binary:logistic gbtree boosters only")
+    model = learner["gradient_booster"]["model"]
+    trees = model["trees"]
+    best = booster.attr("best_iteration")
+    if best is not None:
+        # Same tree range XGBClassifier.predict_proba uses after early stopping
+        trees = trees[:model["iteration_indptr"][int(best) + 1]]
+
+    roots, left, right, feature, threshold, default_left = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        if any(tree["split_type"]):
+            raise ValueError("Native tree export does not support categorical splits")
+        n_nodes = len(tree["left_children"])
+        node = np.arange(offset, offset + n_nodes)
+        tree_left = np.asarray(tree["left_children"], dtype=np.int64)
+        leaf = tree_left < 0
+        roots.append(offset)
+        left.append(np.where(leaf, node, tree_left + offset))
+        right.append(np.where(leaf, node, np.asarray(tree["right_children"], dtype=np.int64) + offset))
+        feature.append(np.where(leaf, 0, tree["split_indices"]))
+        # Leaves keep their value in split_conditions
+        threshold.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+        default_left.append(np.asarray(tree["default_left"], dtype=bool) | leaf)
+        offset += n_nodes
+
+    arrays = {
+        "roots": np.asarray(roots, dtype=np.int64),
+        "left": np.concatenate(left),
+        "right": np.concatenate(right),
+        "feature": np.concatenate(feature).astype(np.int64),
+        "threshold": np.concatenate(threshold),
+        "default_left": np.concatenate(default_left),
+    }
+    # base_score is a probability; XGBoost starts from its log-odds in float32
+    base_score = np.float32(learner["learner_model_param"]["base_score"].strip("[]"))
+    return arrays, float(-np.log(np.float32(1) / base_score - np.float32(1)))
+
+
+def export_model(model, path):
+    """
+    Writes a trained model as a native artifact directory: model.json plus
+    booster.ubj (XGBoost's own format) and trees.npz (flattened trees) for
+    XGBoost, or coef.npy for logistic regression.
+
+    Parameters:
+    - model: fitted XGBClassifier or LogisticRegression, optionally wrapped in a CalibratedModel
+    - path: directory to create
+
+    Returns:
+    - path of the artifact directory
+    """
+    # Duck-typed so this module stays importable without sklearn
+    calibrator = getattr(model, "calibrator", None)
+    estimator = model.estimator if calibrator is not None else model
+    manifest = {"format": NATIVE_FORMAT, "format_version": NATIVE_VERSION}
+    os.makedirs(path, exist_ok=True)
+
+    if hasattr(estimator, "get_booster"):
+        booster = estimator.get_booster()
+        arrays, manifest["base_margin"] = _tree_arrays(booster)
+        manifest["kind"] = "xgboost"
+        manifest["n_trees"] = len(arrays["roots"])
+        booster.save_model(os.path.join(path, BOOSTER_FILE))
+        np.savez(os.path.join(path, TREES_FILE), **arrays)
+    elif hasattr(estimator, "coef_") and np.ndim(estimator.coef_) == 2 and estimator.coef_.shape[0] == 1:
+        manifest["kind"] = "logistic_regression"
+        manifest["intercept"] = float(estimator.intercept_[0])
+        np.save(os.path.join(path, COEF_FILE), np.ascontiguousarray(estimator.coef_[0], dtype=np.float64))
+    else:
+        raise ValueError(f"No native export for {type(estimator).__name__}; "
+                         "supported: XGBoost and binary logistic regression")
+
+    manifest["n_features"] = int(getattr(estimator, "n_features_in_", 0)) or None
+    if calibrator is not None:
+        manifest["calibration"] = _calibration_spec(calibrator)
+        # JSON has no infinity: a threshold that flags nothing is written as null
+        manifest["threshold"] = float(model.threshold) if np.isfinite(model.threshold) else None
+    with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Exported {manifest['kind']} model to {path}")
+    return path
+
+
+class NativeModel:
+    """
+    Scorer for an export_model artifact: logistic regression coefficients or
+    XGBoost trees, plus the calibration and decision threshold of a
+    CalibratedModel. It has the predict_proba/predict interface of the
+    estimator it replaces, so it can stand in for ModelTrainer.model.
+
+    With engine="numpy" (default) trees are evaluated level by level over
+    the flattened node arrays, so loading needs NumPy only: importing xgboost
+    also imports sklearn and pandas. engine="xgboost" loads booster.ubj and
+    predicts with inplace_predict, faster on large batches.
+    """
+
+    def __init__(self, manifest, arrays=None, booster=None):
+        self.manifest = manifest
+        self.kind = manifest["kind"]
+        self.arrays = arrays
+        self.booster = booster
+        self.calibration = manifest.get("calibration")
+        self.threshold = manifest.get("threshold", 0.5)
+        if self.threshold is None:
+            self.threshold = np.inf
+        self.classes_ = np.array([0, 1])
+        if self.kind == "xgboost" and arrays is not None:
+            # Right and left child of node i at 2i and 2i + 1, indexed by the split outcome
+            self._children = np.empty(2 * len(arrays["left"]), dtype=np.int64)
+            self._children[0::2] = arrays["right"]
+            self._children[1::2] = arrays["left"]
+        if self.calibration is not None and self.calibration["method"] == "isotonic":
+            self._iso_x = np.asarray(self.calibration["x"], dtype=np.float64)
+            self._iso_y = np.asarray(self.calibration["y"], dtype=np.float64)
+
+    @classmethod
+    def load(cls, path, engine="numpy", nthread=None):
+        """
+        Loads an export_model directory.
+
+        Parameters:
+        - path: artifact directory
+        - engine: "numpy" or "xgboost", for XGBoost artifacts
+        - nthread: booster threads with engine="xgboost" (e.g. 1 per worker process)
+        """
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != NATIVE_FORMAT:
+            raise ValueError(f"{path} is not a native model artifact")
+        if manifest["format_version"] > NATIVE_VERSION:
+            raise ValueError(f"Unsupported native model version {manifest['format_version']} (max {NATIVE_VERSION})")
+
+        if manifest["kind"] == "logistic_regression":
+            return cls(manifest, arrays={"coef": np.load(os.path.join(path, COEF_FILE))})
+        if engine == "xgboost":
+            import xgboost as xgb
+
+            booster = xgb.Booster(model_file=os.path.join(path, BOOSTER_FILE))
+            if nthread is not None:
+                booster.set_param({"nthread": nthread})
+            return cls(manifest, booster=booster)
+        if engine != "numpy":
+            raise ValueError(f"Unknown engine: {engine}")
+        with np.load(os.path.join(path, TREES_FILE)) as trees:
+            return cls(manifest, arrays=dict(trees))
+
+    def _tree_margin(self, X):
+        a = self.arrays
+        X = np.ascontiguousarray(X)
+        margin = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), _TREE_BATCH):
+            chunk = X[start:start + _TREE_BATCH]
+            flat = chunk.ravel()
+            row_offset = (np.arange(len(chunk), dtype=np.int64) * chunk.shape[1])[:, None]
+            node = np.broadcast_to(a["roots"], (len(chunk), len(a["roots"])))
+            # Every step moves each (row, tree) one level down; leaves point at themselves
+            while True:
+                x = np.take(flat, row_offset + np.take(a["feature"], node))
+                go_left = x < np.take(a["threshold"], node)
+                missing = np.isnan(x)
+                if missing.any():
+                    go_left = np.where(missing, np.take(a["default_left"], node), go_left)
+                child = np.take(self._children, 2 * node + go_left)
+                if np.array_equal(child, node):
+                    break
+                node = child
+            # cumsum adds tree by tree in float32, XGBoost's order, so the margins match it bit for bit
+            leaves = np.empty((len(chunk), node.shape[1] + 1), dtype=np.float32)
+            leaves[:, 0] = self.manifest["base_margin"]
+            leaves[:, 1:] = np.take(a["threshold"], node)
+            margin[start:start + len(chunk)] = np.cumsum(leaves, axis=1)[:, -1]
+        return margin
+
+    def _raw_proba(self, X):
+        if self.booster is not None:
+            return self.booster.inplace_predict(X, iteration_range=self._iteration_range())
+        if self.kind == "xgboost":
+            # Boosters see float32 features, like XGBoost itself
+            margin = self._tree_margin(np.asarray(X, dtype=np.float32))
+            # XGBoost's float32 sigmoid, with exp rounded from float64 (within one ulp of it)
+            one = np.float32(1)
+            return one / (one + np.exp(-margin.astype(np.float64)).astype(np.float32))
+        return _sigmoid(np.asarray(X, dtype=np.float64) @ self.arrays["coef"] + self.manifest["intercept"])
+
+    def _iteration_range(self):
+        return (0, self.manifest["n_trees"])
+
+    def predict_proba(self, X):
+        p = self._raw_proba(X)
+        if self.calibration is not None:
+            if self.calibration["method"] == "isotonic":
+                p = np.interp(p, self._iso_x, self._iso_y)
+            else:
+                p = _sigmoid(self.calibration["a"] * _logit(p) + self.calibration["b"])
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] >= self.threshold).astype(np.int64)
+
+
+def load_model(path, engine="numpy", nthread=None):
+    """Loads a native model artifact written by export_model."""
+    return NativeModel.load(path, engine=engine, nthread=nthread)
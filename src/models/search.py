@@ -0,0 +1,168 @@
+import logging
+import math
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+logger = logging.getLogger(__name__)
+
+
+def _is_xgboost(estimator):
+    return type(estimator).__name__ in ("XGBClassifier", "XGBRegressor")
+
+
+def _fit_and_score(estimator, params, X, y, train_idx, val_idx, n_rounds, early_stopping_rounds, sample_weight=None):
+    """Fits one candidate on one fold within its budget and returns (val AUC, boosting rounds used)."""
+    model = clone(estimator).set_params(**params)
+    fit_params = {}
+    if n_rounds is not None:
+        # Budget in boosting rounds, stopped early on the validation fold
+        model.set_params(n_estimators=n_rounds, early_stopping_rounds=early_stopping_rounds)
+        fit_params = {"eval_set": [(X[val_idx], y[val_idx])], "verbose": False}
+    if sample_weight is not None:
+        fit_params["sample_weight"] = sample_weight[train_idx]
+    model.fit(X[train_idx], y[train_idx], **fit_params)
+
+    y_val = y[val_idx]
+    if len(np.unique(y_val)) < 2:
+        return float("nan"), None
+    score = roc_auc_score(y_val, model.predict_proba(X[val_idx])[:, 1])
+    rounds = getattr(model, "best_iteration", None) if n_rounds is not None else None
+    return score, (rounds + 1 if rounds is not None else n_rounds)
+
+
+class HalvingSearch:
+    """
+    Successive-halving hyperparameter search run on a joblib process pool.
+
+    Every candidate starts on a small budget; after each rung only the best
+    1/factor by mean validation ROC AUC move on to a factor-times larger
+    budget. The budget is boosting rounds for XGBoost (with early stopping on
+    the validation fold) and training rows for other estimators. Folds are
+    built once and the arrays are memory-mapped into the workers, so they are
+    not re-split or re-pickled per candidate.
+
+    Exposes best_params_, best_score_, best_estimator_ and cv_results_ like
+    the sklearn search classes.
+    """
+
+    def __init__(self, estimator, param_grid, cv=2, factor=3, resource="auto", min_resource=None,
+                 max_resource=None, early_stopping_rounds=20, n_iter=None, n_jobs=-1, random_state=42):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.factor = factor
+        self.resource = resource
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.early_stopping_rounds = early_stopping_rounds
+        self.n_iter = n_iter
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _candidates(self, param_grid):
+        if self.n_iter is not None:
+            return list(ParameterSampler(param_grid, self.n_iter, random_state=self.random_state))
+        return list(ParameterGrid(param_grid))
+
+    def fit(self, X, y, sample_weight=None):
+        start = time.perf_counter()
+        # np.require keeps np.memmap inputs mapped, so workers share the file instead of a copy;
+        # float32 inputs stay float32
+        X = np.asanyarray(X)
+        X = np.require(X, dtype=X.dtype if X.dtype.kind == "f" else np.float64, requirements="C")
+        y = np.asarray(y)
+        if sample_weight is not None:
+            sample_weight = np.asarray(sample_weight)
+
+        resource = self.resource
+        if resource == "auto":
+            resource = "n_estimators" if _is_xgboost(self.estimator) else "n_samples"
+        param_grid = dict(self.param_grid)
+        if resource == "n_estimators":
+            # Early stopping picks the number of rounds, so n_estimators is the budget, not a grid axis
+            grid_rounds = param_grid.pop("n_estimators", None)
+            max_resource = self.max_resource or max(grid_rounds or [self.estimator.get_params()["n_estimators"] or 100])
+        else:
+            max_resource = self.max_resource or len(y) * (self.cv - 1) // self.cv
+        candidates = self._candidates(param_grid)
+
+        # Enough rungs to cut the candidates down to one, ending at the full budget
+        n_rungs = max(1, math.ceil(math.log(len(candidates), self.factor)) + 1) if len(candidates) > 1 else 1
+        min_resource = self.min_resource or max(1, max_resource // self.factor ** (n_rungs - 1))
+
+        # Folds are split once; each rung's row budget is a stratified prefix of a fixed shuffle
+        rng = np.random.default_rng(self.random_state)
+        folds = [(rng.permutation(train_idx), val_idx)
+                 for train_idx, val_idx in StratifiedKFold(n_splits=self.cv).split(X, y)]
+
+        base_params = {}
+        if "n_jobs" in self.estimator.get_params():
+            # One thread per model; the pool provides the parallelism
+            base_params["n_jobs"] = 1
+
+        self.cv_results_ = []
+        parallel = Parallel(n_jobs=self.n_jobs, max_nbytes="1M")
+        for rung in range(n_rungs):
+            budget = max_resource if rung == n_rungs - 1 else min(max_resource, min_resource * self.factor ** rung)
+            tasks = []
+            for params in candidates:
+                for train_idx, val_idx in folds:
+                    if resource == "n_samples":
+                        train_idx = self._stratified_prefix(train_idx, y, budget)
+                    tasks.append(delayed(_fit_and_score)(
+                        self.estimator, {**base_params, **params}, X, y, train_idx, val_idx,
+                        budget if resource == "n_estimators" else None, self.early_stopping_rounds, sample_weight))
+            outcomes = parallel(tasks)
+
+            scores = []
+            for i, params in enumerate(candidates):
+                fold_outcomes = outcomes[i * self.cv:(i + 1) * self.cv]
+                score = np.nanmean([s for s, _ in fold_outcomes]) if any(
+                    not np.isnan(s) for s, _ in fold_outcomes) else -np.inf
+                rounds = [r for _, r in fold_outcomes if r is not None]
+                scores.append(score)
+                self.cv_results_.append({
+                    "rung": rung, "resource": budget, "params": params, "mean_test_score": score,
+                    "n_rounds": int(np.mean(rounds)) if rounds else None,
+                })
+            logger.info(f"Rung {rung}: {len(candidates)} candidates at {resource}={budget}, "
+                        f"best AUC {max(scores):.4f}")
+
+            if rung < n_rungs - 1:
+                keep = max(1, math.ceil(len(candidates) / self.factor))
+                order = np.argsort(scores, kind="stable")[::-1][:keep]
+                candidates = [candidates[i] for i in order]
+
+        last = [r for r in self.cv_results_ if r["rung"] == n_rungs - 1]
+        best = max(last, key=lambda r: r["mean_test_score"])
+        self.best_params_ = dict(best["params"])
+        self.best_score_ = best["mean_test_score"]
+        if resource == "n_estimators":
+            self.best_params_["n_estimators"] = best["n_rounds"] or budget
+
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        self.best_estimator_.fit(X, y, **({} if sample_weight is None else {"sample_weight": sample_weight}))
+        self.n_candidates_ = len(self._candidates(param_grid))
+        self.n_rungs_ = n_rungs
+        self.wall_time_ = time.perf_counter() - start
+        logger.info(f"Halving search: {self.n_candidates_} candidates, {n_rungs} rungs, "
+                    f"{len(self.cv_results_) * self.cv} fits in {self.wall_time_:.1f}s")
+        return self
+
+    @staticmethod
+    def _stratified_prefix(train_idx, y, n_rows):
+        """First n_rows of a shuffled fold, taking each class in proportion."""
+        if n_rows >= len(train_idx):
+            return train_idx
+        labels = y[train_idx]
+        picked = []
+        for label in np.unique(labels):
+            members = train_idx[labels == label]
+            take = max(1, round(n_rows * len(members) / len(train_idx)))
+            picked.append(members[:take])
+        return np.concatenate(picked)
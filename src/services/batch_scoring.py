@@ -0,0 +1,302 @@
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.settings import CREDITCARD_DTYPES, FRAUD_FEATURE_DTYPES
+from src.services.inference_bundle import load_bundle
+
+logger = logging.getLogger(__name__)
+
+JOB_FILE = "_job.json"
+PART_FILE = "part-{:05d}.parquet"
+
+# Bytes read per step of the CSV newline scan
+_SCAN_BLOCK = 1 << 26
+
+_worker = None
+
+
+class Partition:
+    """
+    A contiguous slice of the input: rows [start_row, start_row + n_rows),
+    located by byte range for CSV or by row range for Parquet.
+    """
+
+    def __init__(self, index, start_row, n_rows, byte_range=None):
+        self.index = index
+        self.start_row = start_row
+        self.n_rows = n_rows
+        self.byte_range = byte_range
+
+
+def _input_format(path):
+    return "parquet" if path.endswith((".parquet", ".pq")) else "csv"
+
+
+def csv_partitions(path, partition_rows):
+    """
+    Splits a CSV file into partitions of partition_rows data rows (the last
+    one shorter) with one vectorized newline scan, so workers can read their
+    byte range directly. Quoted fields containing newlines are not supported.
+
+    Returns:
+    - (header bytes, list of Partition)
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        pos = f.tell()
+        bounds = [pos]
+        rows_open = 0
+        while True:
+            block = f.read(_SCAN_BLOCK)
+            if not block:
+                break
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+            # Newlines closing a partition: the one completing the open partition, then every partition_rows-th
+            ends = newlines[partition_rows - rows_open - 1::partition_rows]
+            bounds.extend((pos + ends + 1).tolist())
+            rows_open = (rows_open + len(newlines)) % partition_rows
+            pos += len(block)
+            last_byte = block[-1:]
+    if pos > bounds[-1]:
+        # Rows after the last full partition, the final one possibly without a newline
+        rows_open += last_byte != b"\n"
+        bounds.append(pos)
+    partitions = []
+    for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        n_rows = partition_rows if stop != bounds[-1] or rows_open == 0 else rows_open
+        partitions.append(Partition(i, i * partition_rows, n_rows, (start, stop)))
+    return header, partitions
+
+
+def parquet_partitions(path, partition_rows):
+    """Splits a Parquet file into partitions of partition_rows rows (the last one shorter)."""
+    n_rows = pq.ParquetFile(path).metadata.num_rows
+    return [Partition(i, start, min(partition_rows, n_rows - start))
+            for i, start in enumerate(range(0, n_rows, partition_rows))]
+
+
+def _read_parquet_rows(path, start, n_rows, columns):
+    # Reads only the row groups overlapping [start, start + n_rows)
+    parquet = pq.ParquetFile(path)
+    sizes = [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)]
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    groups = [i for i in range(len(sizes)) if offsets[i] < start + n_rows and offsets[i + 1] > start]
+    table = parquet.read_row_groups(groups, columns=columns)
+    return table.slice(start - offsets[groups[0]], n_rows).to_pandas()
+
+
+def _csv_dtypes(preprocessor, columns):
+    """
+    Configured dtypes of the columns the bundle's mode reads, so every
+    partition parses them alike. Integer columns are read as float64: a
+    blank value is NaN there, where an integer dtype would fail the job.
+    """
+    dtypes = FRAUD_FEATURE_DTYPES if preprocessor.mode == "fraud_data" else CREDITCARD_DTYPES
+    return {col: ("float64" if pd.api.types.is_integer_dtype(dtypes[col]) else dtypes[col])
+            for col in columns if col in dtypes}
+
+
+class _Worker:
+    """Per-process scoring state: the bundle, loaded once, and the input it reads from."""
+
+    def __init__(self, bundle_path, input_path, header, columns, keep_columns, native):
+        self.bundle = load_bundle(bundle_path, native=native)
+        model = getattr(self.bundle.trainer.model, "estimator", self.bundle.trainer.model)
+        # One thread per worker: the pool provides the parallelism
+        if hasattr(model, "get_params") and "n_jobs" in model.get_params():
+            model.set_params(n_jobs=1)
+        self.input_path = input_path
+        self.header = header
+        self.columns = columns
+        self.keep_columns = keep_columns
+        # Per-partition type inference could read a column as int in one partition and float in another
+        self.dtypes = _csv_dtypes(self.bundle.preprocessor, columns)
+
+    def read(self, partition):
+        if partition.byte_range is None:
+            return _read_parquet_rows(self.input_path, partition.start_row, partition.n_rows, self.columns)
+        start, stop = partition.byte_range
+        with open(self.input_path, "rb") as f:
+            f.seek(start)
+            data = f.read(stop - start)
+        return pd.read_csv(io.BytesIO(self.header + data), usecols=self.columns, dtype=self.dtypes)
+
+    def score(self, partition, path):
+        df = self.read(partition)
+        if len(df) != partition.n_rows:
+            raise ValueError(f"Partition {partition.index} has {len(df)} rows, expected {partition.n_rows} "
+                             "(blank lines or quoted newlines in the input?)")
+        scores = self.bundle.score({col: df[col].to_numpy() for col in df.columns})
+        columns = {
+            "row": np.arange(partition.start_row, partition.start_row + len(df), dtype=np.int64),
+            "score": np.asarray(scores, dtype=np.float64),
+            "flagged": scores >= self.bundle.threshold,
+        }
+        columns.update({col: df[col].to_numpy() for col in self.keep_columns})
+        # Written under a dot-prefixed name and renamed, so a part file on disk is always complete
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        pq.write_table(pa.table(columns), tmp_path)
+        os.replace(tmp_path, path)
+        return partition.index, len(df)
+
+
+def _init_worker(*args):
+    global _worker
+    _worker = _Worker(*args)
+
+
+def _score_partition(partition, path):
+    return _worker.score(partition, path)
+
+
+def _job_spec(input_path, partition_rows, bundle_path, keep_columns, native):
+    stat = os.stat(input_path)
+    with open(os.path.join(bundle_path, "manifest.json")) as f:
+        model_version = json.load(f)["model_version"]
+    return {
+        "input": os.path.abspath(input_path),
+        "input_size": stat.st_size,
+        "input_mtime_ns": stat.st_mtime_ns,
+        "partition_rows": partition_rows,
+        "bundle": os.path.abspath(bundle_path),
+        "model_version": model_version,
+        "keep_columns": list(keep_columns),
+        "native": native,
+    }
+
+
+def _start_job(output_dir, spec, overwrite):
+    # A finished part is only reused when it was written for the same input, partitioning and model
+    os.makedirs(output_dir, exist_ok=True)
+    job_path = os.path.join(output_dir, JOB_FILE)
+    if os.path.exists(job_path):
+        with open(job_path) as f:
+            previous = json.load(f)
+        if {k: previous.get(k) for k in spec} != spec:
+            if not overwrite:
+                raise ValueError(f"{output_dir} holds scores of a different job; pass overwrite=True "
+                                 "or choose another output directory")
+            for name in os.listdir(output_dir):
+                if name.startswith(("part-", ".part-")):
+                    os.remove(os.path.join(output_dir, name))
+    with open(job_path, "w") as f:
+        json.dump(spec, f, indent=2)
+    return job_path
+
+
+def score_file(bundle_path, input_path, output_dir, workers=None, partition_rows=200_000, keep_columns=(),
+               native=False, overwrite=False):
+    """
+    Scores a CSV or Parquet file with an inference bundle on a process pool.
+    The input is split into partitions of partition_rows rows that workers
+    read themselves, each worker loading the bundle once. Every partition is
+    written to output_dir as its own Parquet part (row, score, flagged and
+    keep_columns) as soon as it is scored, so a rerun after a crash resumes
+    with the partitions that have no part file yet. read_scores returns the
+    parts concatenated in input order.
+
+    Parameters:
+    - bundle_path: inference bundle directory written by save_bundle
+    - input_path: .csv or .parquet file with the bundle's input columns; CSV partitions are
+      parsed with the configured dtypes of the bundle's mode (config.settings), integer
+      columns as float64 so blanks are NaN
+    - output_dir: directory for the part files and the job manifest
+    - workers: worker processes (defaults to all cores); 1 scores in this process
+    - partition_rows: rows per partition and per part file
+    - keep_columns: input columns copied to the output, e.g. a transaction id
+    - native: score with the bundle's native model artifact instead of the pickled model
+    - overwrite: discard the parts of a different earlier job in output_dir instead of raising
+
+    Returns:
+    - dict with rows, partitions, skipped (already scored), seconds and rows_per_s
+    """
+    start = time.perf_counter()
+    keep_columns = list(keep_columns)
+    spec = _job_spec(input_path, partition_rows, bundle_path, keep_columns, native)
+    job_path = _start_job(output_dir, spec, overwrite)
+
+    with open(os.path.join(bundle_path, "manifest.json")) as f:
+        input_columns = json.load(f)["feature_schema"]["input_columns"]
+    columns = list(dict.fromkeys(input_columns + keep_columns))
+    if _input_format(input_path) == "parquet":
+        header, partitions = None, parquet_partitions(input_path, partition_rows)
+    else:
+        header, partitions = csv_partitions(input_path, partition_rows)
+
+    paths = {p.index: os.path.join(output_dir, PART_FILE.format(p.index)) for p in partitions}
+    pending = [p for p in partitions if not os.path.exists(paths[p.index])]
+    if len(pending) < len(partitions):
+        logger.info(f"Resuming: {len(partitions) - len(pending)} of {len(partitions)} partitions already scored")
+
+    workers = min(workers or os.cpu_count() or 1, max(len(pending), 1))
+    init_args = (bundle_path, input_path, header, columns, keep_columns, native)
+    rows = 0
+    if workers == 1:
+        worker = _Worker(*init_args)
+        for partition in pending:
+            rows += worker.score(partition, paths[partition.index])[1]
+            logger.info(f"Scored partition {partition.index + 1}/{len(partitions)}")
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=init_args) as pool:
+            futures = [pool.submit(_score_partition, p, paths[p.index]) for p in pending]
+            for future in as_completed(futures):
+                index, n_rows = future.result()
+                rows += n_rows
+                logger.info(f"Scored partition {index + 1}/{len(partitions)}")
+
+    seconds = time.perf_counter() - start
+    summary = {
+        "rows": rows,
+        "partitions": len(partitions),
+        "skipped": len(partitions) - len(pending),
+        "workers": workers,
+        "seconds": seconds,
+        "rows_per_s": rows / seconds if seconds else None,
+    }
+    with open(job_path, "w") as f:
+        json.dump({**spec, "completed": True, "n_rows": sum(p.n_rows for p in partitions)}, f, indent=2)
+    logger.info(f"Scored {rows} rows in {seconds:.1f} s ({summary['rows_per_s']:,.0f} rows/s) with "
+                f"{workers} workers into {output_dir}")
+    return summary
+
+
+def read_scores(output_dir, columns=None):
+    """Reads the part files of a score_file job as one DataFrame, in input row order."""
+    parts = sorted(name for name in os.listdir(output_dir) if name.startswith("part-"))
+    return pd.concat([pd.read_parquet(os.path.join(output_dir, name), columns=columns) for name in parts],
+                     ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file with an inference bundle.")
+    parser.add_argument("--bundle", required=True, help="inference bundle directory written by save_bundle")
+    parser.add_argument("--input", required=True, help=".csv or .parquet file of transactions")
+    parser.add_argument("--output", required=True, help="output directory of Parquet part files")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (defaults to all cores)")
+    parser.add_argument("--partition-rows", type=int, default=200_000)
+    parser.add_argument("--keep-columns", nargs="*", default=[], help="input columns copied to the output")
+    parser.add_argument("--native-model", action="store_true",
+                        help="score with the bundle's native model artifact instead of the pickled model")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="replace the scores of a different earlier job in the output directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    score_file(args.bundle, args.input, args.output, args.workers, args.partition_rows, args.keep_columns,
+               args.native_model, args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
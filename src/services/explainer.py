@@ -0,0 +1,217 @@
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.models.calibration import CalibratedModel
+
+logger = logging.getLogger(__name__)
+
+# Engineered numeric features and the raw column they were encoded from
+SOURCE_COLUMNS = {"device_id_freq": "device_id", "country_encoded": "country"}
+
+_worker_booster = None
+
+
+def _load_booster(raw_model, nthread=None):
+    booster = xgb.Booster()
+    booster.load_model(bytearray(raw_model))
+    if nthread is not None:
+        booster.set_param({"nthread": nthread})
+    return booster
+
+
+def _init_worker(raw_model):
+    global _worker_booster
+    # One thread per worker: the pool provides the parallelism
+    _worker_booster = _load_booster(raw_model, nthread=1)
+
+
+def _tree_contributions(booster, X):
+    """TreeSHAP values of every feature plus the bias column, in log-odds."""
+    return booster.predict(xgb.DMatrix(X, feature_names=booster.feature_names), pred_contribs=True)
+
+
+def _worker_contributions(X):
+    return _tree_contributions(_worker_booster, X)
+
+
+def feature_groups(preprocessor):
+    """
+    Maps the preprocessor's output columns back to the original columns: the
+    one-hot columns of source/browser/sex to their categorical column and the
+    frequency/target encodings to device_id/country.
+
+    Returns:
+    - (list of original column names, int array with the group of each output column)
+    """
+    tables = preprocessor.scoring_tables
+    names = [SOURCE_COLUMNS.get(col, col) for col in tables['num_cols']]
+    bounds = list(tables['cat_offsets']) + [tables['n_features']]
+    for col, start, stop in zip(tables['cat_cols'], bounds[:-1], bounds[1:]):
+        names += [col] * (stop - start)
+    groups = list(dict.fromkeys(names))
+    return groups, np.array([groups.index(name) for name in names], dtype=np.int64)
+
+
+class ReasonCodeExplainer:
+    """
+    Batch TreeSHAP reason codes for a trained XGBoost model.
+
+    Contributions come from XGBoost's built-in TreeSHAP (pred_contribs), the
+    same values shap.TreeExplainer computes for tree models, and are summed
+    per original column. Rows are explained in chunks of batch_size on a
+    spawned process pool when n_jobs > 1. Results are cached per feature
+    vector (64-bit row hash) in an LRU of cache_size entries, so repeated
+    transactions and re-runs are not recomputed.
+    """
+
+    def __init__(self, model, preprocessor, top_k=3, n_jobs=1, batch_size=4096, cache_size=100_000):
+        estimator = model.estimator if isinstance(model, CalibratedModel) else model
+        if not hasattr(estimator, "get_booster"):
+            raise ValueError(f"Reason codes need a tree booster, got {type(estimator).__name__}")
+        self.model = model
+        self.preprocessor = preprocessor
+        self.top_k = top_k
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+
+        self._booster = estimator.get_booster()
+        self._raw_model = bytes(self._booster.save_raw("ubj"))
+        self.groups, group_of = feature_groups(preprocessor)
+        self._group_matrix = np.zeros((len(group_of), len(self.groups)), dtype=np.float32)
+        self._group_matrix[np.arange(len(group_of)), group_of] = 1.0
+        self.expected_value = None  # bias of the TreeSHAP decomposition, set on the first computation
+        self._cache = OrderedDict()
+        self._pool = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_bundle(cls, bundle, **kwargs):
+        """Explainer for the model and preprocessor of a loaded InferenceBundle."""
+        return cls(bundle.trainer.model, bundle.preprocessor, **kwargs)
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Spawned workers: XGBoost's OpenMP runtime is not fork-safe
+            self._pool = ProcessPoolExecutor(max_workers=self.n_jobs, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker, initargs=(self._raw_model,))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _compute(self, X):
+        chunks = [X[start:start + self.batch_size] for start in range(0, len(X), self.batch_size)]
+        if self.n_jobs > 1 and len(chunks) > 1:
+            results = list(self._get_pool().map(_worker_contributions, chunks))
+        else:
+            results = [_tree_contributions(self._booster, chunk) for chunk in chunks]
+        contributions = np.vstack(results)
+        if self.expected_value is None:
+            self.expected_value = float(contributions[0, -1])
+        return contributions[:, :-1] @ self._group_matrix
+
+    def contributions(self, X):
+        """
+        TreeSHAP contributions (log-odds) summed per original column.
+
+        Parameters:
+        - X: transformed feature matrix (array or DataFrame)
+
+        Returns:
+        - DataFrame with one column per original column; each row plus
+          expected_value sums to the model's raw margin
+        """
+        index = X.index if isinstance(X, pd.DataFrame) else None
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        keys = pd.util.hash_pandas_object(pd.DataFrame(X, copy=False), index=False).to_numpy()
+        grouped = np.empty((len(X), len(self.groups)), dtype=np.float32)
+
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self._cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                self._cache.move_to_end(key)
+                grouped[i] = cached
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            missing = np.asarray(missing)
+            # Duplicate rows inside the batch are explained once
+            unique_keys, first, inverse = np.unique(keys[missing], return_index=True, return_inverse=True)
+            computed = self._compute(X[missing[first]])
+            grouped[missing] = computed[inverse.ravel()]
+            if self.cache_size:
+                for key, row in zip(unique_keys[-self.cache_size:], computed[-self.cache_size:]):
+                    self._cache[key] = row
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return pd.DataFrame(grouped, columns=self.groups, index=index)
+
+    def explain(self, X, top_k=None):
+        """
+        Reason codes: the top_k original columns pushing each row towards
+        fraud, largest contribution first.
+
+        Returns:
+        - DataFrame with reason_i / contribution_i columns (i = 1..top_k) and
+          the raw margin (log-odds)
+        """
+        top_k = top_k or self.top_k
+        grouped = self.contributions(X)
+        values = grouped.to_numpy()
+        order = np.argsort(-values, axis=1, kind="stable")[:, :top_k]
+        names = np.asarray(self.groups, dtype=object)
+
+        result = {}
+        for i in range(order.shape[1]):
+            result[f"reason_{i + 1}"] = names[order[:, i]]
+            result[f"contribution_{i + 1}"] = np.take_along_axis(values, order[:, i:i + 1], axis=1)[:, 0]
+        result["margin"] = values.sum(axis=1, dtype=np.float64) + (self.expected_value or 0.0)
+        return pd.DataFrame(result, index=grouped.index)
+
+    def explain_flagged(self, X, threshold=None, top_k=None):
+        """
+        Scores raw transactions and explains the ones at or above threshold
+        (the calibrated decision threshold by default).
+
+        Parameters:
+        - X: raw feature frame, as passed to FraudPreprocessor.transform
+
+        Returns:
+        - reason-code DataFrame of the flagged rows (indexed like X) with their fraud_probability
+        """
+        if threshold is None:
+            threshold = getattr(self.model, "threshold", 0.5)
+        features = self.preprocessor.transform(X, output="float32")
+        probability = self.model.predict_proba(features)[:, 1]
+        flagged = probability >= threshold
+        logger.info(f"Explaining {int(flagged.sum())} of {len(X)} transactions flagged at threshold {threshold:.4f}")
+        result = self.explain(pd.DataFrame(features[flagged], index=X.index[flagged]), top_k=top_k)
+        result.insert(0, "fraud_probability", probability[flagged])
+        return result
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "max_size": self.cache_size}
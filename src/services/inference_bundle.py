@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import platform
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import psutil
+
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.calibration import CalibratedModel
+from src.models.model_trainer import ModelTrainer
+from src.models.native import load_model
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "fraud-inference-bundle"
+BUNDLE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.joblib"
+NATIVE_DIR = "native"
+ARRAYS_DIR = "arrays"
+
+
+class InferenceBundle:
+    """
+    A loaded inference bundle: a scoring-ready FraudPreprocessor, the trained
+    model wrapped in a ModelTrainer, the manifest, and load statistics.
+    """
+
+    def __init__(self, preprocessor, trainer, manifest, load_time_s=None, rss_delta_bytes=None):
+        self.preprocessor = preprocessor
+        self.trainer = trainer
+        self.manifest = manifest
+        self.load_time_s = load_time_s
+        self.rss_delta_bytes = rss_delta_bytes
+
+    @property
+    def feature_names(self):
+        return self.manifest["feature_schema"]["feature_names"]
+
+    @property
+    def model_version(self):
+        return self.manifest["model_version"]
+
+    @property
+    def threshold(self):
+        """Decision threshold on score(); the calibrated cost-optimal one when the model was calibrated."""
+        threshold = self.manifest.get("decision", {}).get("threshold", 0.5)
+        return np.inf if threshold is None else threshold
+
+    def score(self, batch):
+        """Returns fraud probabilities for a list of dicts or a columnar batch."""
+        features = self.preprocessor.transform_batch(batch)
+        return self.trainer.predict_proba(features)
+
+
+def save_bundle(path, preprocessor, trainer, model_version=None):
+    """
+    Writes a fitted preprocessor and trained model as a single versioned bundle
+    directory: manifest.json, one .npy file per preprocessor array and the model.
+
+    Parameters:
+    - path: bundle directory to create
+    - preprocessor: fitted FraudPreprocessor
+    - trainer: trained ModelTrainer
+    - model_version: identifier recorded in the manifest (defaults to a timestamp)
+
+    Returns:
+    - path of the bundle directory
+    """
+    logger.info(f"Saving inference bundle to {path}")
+    os.makedirs(os.path.join(path, ARRAYS_DIR), exist_ok=True)
+
+    meta, arrays = preprocessor.export_state()
+    for name, array in arrays.items():
+        np.save(os.path.join(path, ARRAYS_DIR, f"{name}.npy"), np.ascontiguousarray(array))
+
+    # Uncompressed so joblib can memory-map the model's NumPy arrays on load
+    joblib.dump(trainer.model, os.path.join(path, MODEL_FILE))
+    try:
+        trainer.export_model(os.path.join(path, NATIVE_DIR))
+        native_model = NATIVE_DIR
+    except ValueError as e:
+        logger.info(f"Bundle without native model: {e}")
+        native_model = None
+
+    created_at = datetime.now(timezone.utc)
+    input_columns = meta["num_cols"] + meta["cat_cols"]
+    if meta["mode"] == "fraud_data":
+        input_columns = [c for c in input_columns if c not in ("device_id_freq", "country_encoded")]
+        input_columns += ["device_id", "country"]
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "format_version": BUNDLE_VERSION,
+        "model_version": model_version or created_at.strftime("%Y%m%dT%H%M%S"),
+        "created_at": created_at.isoformat(),
+        "model_name": trainer.model_name,
+        "preprocessor": meta,
+        "arrays": sorted(arrays),
+        "native_model": native_model,
+        "feature_schema": {
+            "input_columns": input_columns,
+            "feature_names": meta["feature_names"],
+            "n_features": len(meta["feature_names"]),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "joblib": joblib.__version__,
+        },
+    }
+    if isinstance(trainer.model, CalibratedModel):
+        # The calibrator and threshold live inside model.joblib; recorded here for consumers
+        manifest["decision"] = {
+            "calibration": trainer.model.calibrator.method,
+            # null when flagging nothing is cheapest: JSON has no infinity
+            "threshold": float(trainer.model.threshold) if np.isfinite(trainer.model.threshold) else None,
+        }
+    with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return path
+
+
+def load_bundle(path, mmap=True, native=False):
+    """
+    Loads a bundle written by save_bundle. With mmap=True the preprocessor
+    arrays and the model's NumPy arrays are memory-mapped read-only, so worker
+    processes loading the same bundle share one copy of those pages. With
+    native=True the model is loaded from its native artifact (a NativeModel)
+    instead of being unpickled, when the bundle has one.
+
+    Returns:
+    - InferenceBundle with load_time_s and rss_delta_bytes recorded
+    """
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"{path} is not an inference bundle")
+    if manifest["format_version"] > BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version {manifest['format_version']} (max {BUNDLE_VERSION})")
+
+    mmap_mode = "r" if mmap else None
+    arrays = {
+        name: np.load(os.path.join(path, ARRAYS_DIR, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in manifest["arrays"]
+    }
+    preprocessor = FraudPreprocessor.from_state(manifest["preprocessor"], arrays)
+
+    trainer = ModelTrainer.__new__(ModelTrainer)
+    trainer.model_name = manifest["model_name"]
+    if native and manifest.get("native_model"):
+        trainer.model = load_model(os.path.join(path, manifest["native_model"]))
+    else:
+        trainer.model = joblib.load(os.path.join(path, MODEL_FILE), mmap_mode=mmap_mode)
+
+    load_time = time.perf_counter() - start
+    rss_delta = process.memory_info().rss - rss_before
+    logger.info(f"Loaded bundle {manifest['model_version']} in {load_time * 1000:.1f} ms "
+                f"(+{rss_delta / 2**20:.1f} MiB RSS)")
+    return InferenceBundle(preprocessor, trainer, manifest, load_time, rss_delta)
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import logging
+import numbers
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_VERSIONS_KEY = "__score_cache_versions__"
+
+
+def _canonical(value):
+    # 100, 100.0 and np.int64(100) are the same amount, NaN the same as a missing value
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, numbers.Number):
+        value = float(value)
+        return None if value != value else value
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def fingerprint(record, fields, model_version):
+    """
+    Stable cache key of a transaction: a 128-bit hash of the model version and
+    the canonicalized values of fields (the bundle's input columns), so
+    request ids, timestamps and other fields the model never sees do not
+    defeat the cache, and numerically equal values hash alike.
+    """
+    payload = json.dumps([model_version] + [_canonical(record.get(field)) for field in fields],
+                         separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class DiskCacheBackend:
+    """
+    Shared second level for ScoreCache on a diskcache.Cache directory (SQLite
+    underneath), so the workers of one host share scores. Entries expire
+    after ttl seconds and are tagged with their model version for invalidation.
+    Every version written or bound is recorded with the time it was first
+    seen, so invalidation only drops versions older than the bound one and a
+    worker still on the previous bundle during a rolling reload does not evict
+    the new version's entries.
+    """
+
+    def __init__(self, directory, ttl=300.0, size_limit=2**30):
+        import diskcache
+
+        self.directory = directory
+        self.ttl = ttl
+        self.cache = diskcache.Cache(directory, size_limit=size_limit, tag_index=True)
+
+    def get_many(self, keys):
+        return [self.cache.get(key) for key in keys]
+
+    def _record_version(self, model_version):
+        """First-seen time of model_version, recorded now if it is new (call inside a transaction)."""
+        versions = self.cache.get(_VERSIONS_KEY, {})
+        if model_version not in versions:
+            versions[model_version] = time.time()
+            self.cache.set(_VERSIONS_KEY, versions)
+        return versions[model_version]
+
+    def set_many(self, keys, scores, model_version):
+        with self.cache.transact():
+            self._record_version(model_version)
+            for key, score in zip(keys, scores):
+                self.cache.set(key, score, expire=self.ttl, tag=model_version)
+
+    def invalidate(self, keep_version):
+        """Drops the entries of the model versions first seen before keep_version; returns how many."""
+        with self.cache.transact():
+            first_seen = self._record_version(keep_version)
+            # Evicted versions stay recorded, so a late writer of one cannot pass for a newer version
+            versions = self.cache.get(_VERSIONS_KEY)
+            removed = sum(self.cache.evict(version) for version, seen in versions.items() if seen < first_seen)
+        return removed
+
+    def clear(self):
+        self.cache.clear()
+
+    def close(self):
+        self.cache.close()
+
+
+class ScoreCache:
+    """
+    Scoring-result cache keyed by fingerprint(): an in-process LRU of
+    max_size entries that expire ttl seconds after they were scored, in front
+    of an optional shared backend (DiskCacheBackend). bind(model_version)
+    switches the cache to a newly loaded bundle and drops the entries of
+    other (shared: older) versions. Hits, misses, LRU evictions and TTL expirations are
+    counted for cache_info(). Safe to share between scoring threads.
+    """
+
+    def __init__(self, max_size=100_000, ttl=300.0, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self.model_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def bind(self, model_version):
+        """
+        Points the cache at model_version, dropping the in-process entries of
+        any other version and the shared entries of older versions.
+        """
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            dropped = len(self._entries)
+            self._entries.clear()
+            if self.backend is not None:
+                dropped += self.backend.invalidate(model_version)
+            if self.model_version is not None or dropped:
+                logger.info(f"Score cache bound to model {model_version}; invalidated {dropped} entries")
+            self.model_version = model_version
+
+    def get_many(self, keys):
+        """Cached scores of keys, None where missing or expired."""
+        now = time.monotonic()
+        scores = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    scores[i] = entry[0]
+
+        if missing and self.backend is not None:
+            found = self.backend.get_many([keys[i] for i in missing])
+            shared = [(i, score) for i, score in zip(missing, found) if score is not None]
+            for i, score in shared:
+                scores[i] = score
+            self._store([keys[i] for i, _ in shared], [score for _, score in shared], now)
+            missing = [i for i, score in zip(missing, found) if score is None]
+        else:
+            shared = []
+
+        with self._lock:
+            self.backend_hits += len(shared)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        return scores
+
+    def set_many(self, keys, scores):
+        scores = [float(score) for score in scores]
+        self._store(keys, scores, time.monotonic())
+        if self.backend is not None:
+            self.backend.set_many(keys, scores, self.model_version)
+
+    def _store(self, keys, scores, now):
+        if not self.max_size:
+            return
+        expires = now + self.ttl
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._entries[key] = (score, expires)
+                self._entries.move_to_end(key)
+            overflow = max(len(self._entries) - self.max_size, 0)
+            for _ in range(overflow):
+                self._entries.popitem(last=False)
+            self.evictions += overflow
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def cache_info(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "model_version": self.model_version,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+        }
+
+
+class CachedScorer:
+    """
+    Scores transactions with an InferenceBundle through a ScoreCache: cached
+    records skip transform_batch and predict_proba, and identical records
+    within one batch (e.g. a retried authorization) are scored once.
+    """
+
+    def __init__(self, bundle, cache):
+        self.cache = cache
+        self.set_bundle(bundle)
+
+    def set_bundle(self, bundle):
+        """Switches to a newly loaded bundle; the cache drops the previous model version's scores."""
+        self.bundle = bundle
+        self.fields = bundle.manifest["feature_schema"]["input_columns"]
+        self.cache.bind(bundle.model_version)
+
+    def score(self, records):
+        records = list(records)
+        bundle, fields = self.bundle, self.fields
+        keys = [fingerprint(record, fields, bundle.model_version) for record in records]
+        scores = self.cache.get_many(keys)
+        missing = {}
+        for i, (key, score) in enumerate(zip(keys, scores)):
+            if score is None:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            computed = bundle.score([records[rows[0]] for rows in missing.values()])
+            self.cache.set_many(list(missing), computed)
+            for rows, score in zip(missing.values(), computed):
+                for i in rows:
+                    scores[i] = float(score)
+        return np.asarray(scores, dtype=np.float64)
@@ -0,0 +1,295 @@
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from aiohttp import web
+
+from src.core.drift import DriftMonitor
+from src.services.inference_bundle import load_bundle
+from src.services.score_cache import CachedScorer, DiskCacheBackend, ScoreCache
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+LATENCY_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    """Fixed-bucket histogram: counts[i] is the number of values <= bounds[i]; the last slot is overflow."""
+
+    def __init__(self, bounds):
+        self.bounds = np.asarray(bounds, dtype=np.float64)
+        self.counts = np.zeros(len(bounds) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[np.searchsorted(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self):
+        labels = [f"le_{b:g}" for b in self.bounds] + ["overflow"]
+        return {
+            "buckets": dict(zip(labels, self.counts.tolist())),
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+        }
+
+
+class MicroBatcher:
+    """
+    Groups individually submitted records into micro-batches and scores each
+    batch with one call to score_fn(records) -> scores on a worker pool.
+
+    A batch is dispatched once it holds max_batch_size records or max_wait_ms
+    has passed since its first record arrived. At most n_workers batches are
+    scored at a time; while all workers are busy requests keep queueing, so
+    batches grow with load. Queue depth, batch size and latency histograms are
+    recorded for /metrics.
+
+    If scoring a batch raises, its records are rescored one by one, so only
+    the records that fail themselves get the exception. observe_fn(records),
+    if given, sees every batch once before it is scored (e.g. drift monitoring).
+    """
+
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=2.0, n_workers=2, observe_fn=None):
+        self.score_fn = score_fn
+        self.observe_fn = observe_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.n_workers = n_workers
+        self.queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.batch_latency_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.request_latency_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.n_requests = 0
+        self.n_errors = 0
+        self._queue = None
+        self._executor = None
+        self._runner = None
+        self._inflight = set()
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.n_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix="scoring")
+        self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, *self._inflight, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Scoring service stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def submit(self, record):
+        """Queues one record and waits for its score."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((record, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Take a worker slot first, so the next batch keeps filling while all workers are busy
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            self.queue_depth.observe(self._queue.qsize())
+            self.batch_size.observe(len(batch))
+            task = loop.create_task(self._score(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    def _score_batch(self, records):
+        if self.observe_fn is not None:
+            self.observe_fn(records)
+        try:
+            return list(self.score_fn(records))
+        except Exception as exc:
+            if len(records) == 1:
+                return [exc]
+            logger.warning(f"Scoring a batch of {len(records)} failed ({exc!r}); rescoring its records one by one")
+        results = []
+        for record in records:
+            try:
+                results.append(self.score_fn([record])[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    async def _score(self, batch):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(self._executor, self._score_batch, [r for r, _, _ in batch])
+        except Exception as exc:
+            logger.exception(f"Scoring a batch of {len(batch)} failed")
+            results = [exc] * len(batch)
+        finally:
+            self._slots.release()
+
+        done = time.perf_counter()
+        self.batch_latency_ms.observe((done - start) * 1000)
+        for (_, future, enqueued), result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.n_errors += 1
+                if not future.done():
+                    future.set_exception(result)
+                continue
+            self.request_latency_ms.observe((done - enqueued) * 1000)
+            self.n_requests += 1
+            if not future.done():
+                future.set_result(float(result))
+
+    def metrics(self):
+        return {
+            "requests": self.n_requests,
+            "errors": self.n_errors,
+            "queue_depth_now": self._queue.qsize() if self._queue is not None else 0,
+            "queue_depth": self.queue_depth.to_dict(),
+            "batch_size": self.batch_size.to_dict(),
+            "batch_latency_ms": self.batch_latency_ms.to_dict(),
+            "request_latency_ms": self.request_latency_ms.to_dict(),
+        }
+
+
+def create_app(bundle, max_batch_size=64, max_wait_ms=2.0, n_workers=2, monitor_drift=True, drift_sample_every=1,
+               score_cache=None):
+    """
+    aiohttp application scoring single transactions from an InferenceBundle.
+    With a ScoreCache, retried and duplicate transactions are answered from
+    the cache (bound to the bundle's model version) instead of being rescored.
+
+    Routes:
+    - POST /score: one transaction as a JSON object -> {"fraud_probability", "is_fraud", "model_version"};
+      422 if the transaction cannot be scored (e.g. an unseen category)
+    - GET /metrics: request counters, queue-depth / batch-size / latency histograms and score cache counters
+    - GET /drift: DriftMonitor report against the bundle's fit-time reference
+    - GET /health
+    """
+    monitor = None
+    if monitor_drift and getattr(bundle.preprocessor, "reference_profile", None) is not None:
+        monitor = DriftMonitor.from_preprocessor(bundle.preprocessor, sample_every=drift_sample_every)
+
+    scorer = CachedScorer(bundle, score_cache) if score_cache is not None else bundle
+
+    # Drift is observed before scoring, so records that fail to score are still counted
+    batcher = MicroBatcher(scorer.score, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                           n_workers=n_workers, observe_fn=monitor.update if monitor is not None else None)
+    required = bundle.manifest["feature_schema"]["input_columns"]
+    threshold = bundle.threshold
+
+    async def score(request):
+        try:
+            record = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Body must be a JSON object")
+        if not isinstance(record, dict):
+            raise web.HTTPBadRequest(text="Body must be a JSON object")
+        missing = [col for col in required if col not in record]
+        if missing:
+            raise web.HTTPBadRequest(text=f"Missing fields: {missing}")
+        try:
+            probability = await batcher.submit(record)
+        except ValueError as exc:
+            # Invalid values such as a category the preprocessor has never seen
+            raise web.HTTPUnprocessableEntity(text=str(exc))
+        return web.json_response({"fraud_probability": probability, "is_fraud": probability >= threshold,
+                                  "model_version": bundle.model_version})
+
+    async def metrics(request):
+        metrics = batcher.metrics()
+        if score_cache is not None:
+            metrics["score_cache"] = score_cache.cache_info()
+        return web.json_response(metrics)
+
+    async def drift(request):
+        if monitor is None:
+            raise web.HTTPNotFound(text="Drift monitoring is disabled or the bundle has no reference profile")
+        return web.json_response(monitor.report())
+
+    async def health(request):
+        return web.json_response({"status": "ok", "model_version": bundle.model_version})
+
+    async def on_startup(app):
+        await batcher.start()
+
+    async def on_cleanup(app):
+        await batcher.stop()
+
+    app = web.Application()
+    app["batcher"] = batcher
+    app["drift_monitor"] = monitor
+    app["score_cache"] = score_cache
+    app.router.add_post("/score", score)
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/drift", drift)
+    app.router.add_get("/health", health)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching fraud scoring server.")
+    parser.add_argument("--bundle", required=True, help="inference bundle directory written by save_bundle")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--no-drift", action="store_true", help="disable the /drift monitor")
+    parser.add_argument("--drift-sample-every", type=int, default=1, help="monitor every k-th request")
+    parser.add_argument("--native-model", action="store_true",
+                        help="score with the bundle's native model artifact instead of the pickled model")
+    parser.add_argument("--cache-size", type=int, default=100_000,
+                        help="in-process score cache entries (0 disables the in-process level)")
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="seconds a cached score stays valid")
+    parser.add_argument("--cache-dir", default=None,
+                        help="diskcache directory shared by the servers of one host")
+    parser.add_argument("--no-cache", action="store_true", help="score every request, without the score cache")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    bundle = load_bundle(args.bundle, native=args.native_model)
+    score_cache = None
+    if not args.no_cache:
+        backend = DiskCacheBackend(args.cache_dir, ttl=args.cache_ttl) if args.cache_dir else None
+        score_cache = ScoreCache(max_size=args.cache_size, ttl=args.cache_ttl, backend=backend)
+    web.run_app(create_app(bundle, args.max_batch_size, args.max_wait_ms, args.workers, not args.no_drift,
+                           args.drift_sample_every, score_cache),
+                host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import joblib
+import matplotlib.pyplot as plt
+import numpy as np
+
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.cascade import CascadeModel
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import save_bundle
+from src.utils.evaluation import classification_metrics, confusion_counts
+from src.utils.profiling import profiler
+from src.utils.utils import load_data
+from src.utils.training_and_evaluation_utils import (
+    train_test_split_data,
+    evaluate_model,
+    plot_confusion_matrix
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimings:
+    """Collects wall-clock seconds per (dataset, model, stage) from any thread."""
+
+    def __init__(self):
+        self.records = []
+
+    @contextmanager
+    def stage(self, dataset, model, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(dataset, model, stage, time.perf_counter() - start)
+
+    def add(self, dataset, model, stage, seconds):
+        self.records.append({"dataset": dataset, "model": model, "stage": stage, "seconds": round(seconds, 4)})
+
+    def summary(self):
+        """Total seconds per stage, largest first."""
+        totals = {}
+        for record in self.records:
+            totals[record["stage"]] = totals.get(record["stage"], 0.0) + record["seconds"]
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def share_arrays(arrays, directory):
+    """
+    Writes arrays as .npy files and reopens them memory-mapped, so worker
+    processes map the same pages instead of receiving pickled copies.
+    """
+    shared = {}
+    for name, array in arrays.items():
+        path = os.path.join(directory, f"{name}.npy")
+        np.save(path, np.ascontiguousarray(array))
+        shared[name] = path
+    return shared
+
+
+def _train_model(dataset, model_key, model_config, array_paths, n_jobs, calibration=None, profile=None):
+    """
+    Process-pool task: trains one model on a shared, memory-mapped dataset and scores its test set.
+    With profile (profiler.enable kwargs) the worker profiles its stages and returns the records.
+    """
+    logging.basicConfig(level=logging.INFO)
+    if profile is not None:
+        profiler.enable(**profile)
+    arrays = {name: np.load(path, mmap_mode="r") for name, path in array_paths.items()}
+    timings = {}
+
+    start = time.perf_counter()
+    trainer = ModelTrainer(model_config["model"])
+    if "n_jobs" in trainer.model.get_params():
+        trainer.model.set_params(n_jobs=n_jobs)
+    trainer.train(arrays["X_train"], np.asarray(arrays["y_train"]), param_grid=model_config.get("param_grid"),
+                  search_type=model_config.get("search_type", "grid"), n_jobs=n_jobs,
+                  sample_weight=arrays.get("w_train"))
+    timings["train"] = time.perf_counter() - start
+
+    if calibration:
+        start = time.perf_counter()
+        trainer.calibrate(arrays["X_cal"], np.asarray(arrays["y_cal"]), method=calibration.get("method", "isotonic"),
+                          cost_fp=calibration.get("cost_fp", 1.0), cost_fn=np.asarray(arrays["cost_cal"]))
+        timings["calibrate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = trainer.predict(arrays["X_test"])
+    y_proba = trainer.predict_proba(arrays["X_test"])
+    timings["predict"] = time.perf_counter() - start
+    profile_records = (profiler.records, profiler._origin) if profile is not None else None
+    return trainer, y_pred, y_proba, timings, profile_records
+
+
+class TrainingOrchestrator:
+    """
+    Trains every (dataset, model) pair from a declarative config such as
+    config.settings.TRAINING_CONFIG.
+
+    Each dataset is loaded, preprocessed and resampled once, then shared with
+    the training processes as memory-mapped arrays. Models train concurrently
+    in a process pool under a core budget: at most n_cores models at a time,
+    each search getting n_cores // concurrency cores. Evaluation plots and
+    artifact writes run on a single background thread so they never block
+    training. Wall-clock seconds per stage are collected in self.timings.
+    """
+
+    def __init__(self, config, root=".", n_cores=None):
+        self.config = config
+        self.root = root
+        self.n_cores = n_cores or os.cpu_count() or 1
+        self.timings = StageTimings()
+        self.results = {}
+        self.cascades = {}
+
+    def _path(self, relative):
+        return os.path.join(self.root, relative)
+
+    def _jobs(self, datasets=None, models=None):
+        jobs = []
+        for dataset, spec in self.config["datasets"].items():
+            if datasets and dataset not in datasets:
+                continue
+            for model_key in spec.get("models", list(self.config["models"])):
+                if not models or model_key in models:
+                    jobs.append((dataset, model_key))
+        return jobs
+
+    def prepare_dataset(self, dataset, shared_dir):
+        """Loads, fits the preprocessor, splits, transforms and resamples one dataset, then shares it."""
+        spec = self.config["datasets"][dataset]
+        target = spec["target"]
+        preprocessor = FraudPreprocessor(mode=spec["mode"], sampler=spec.get("sampler", "auto"))
+
+        with self.timings.stage(dataset, None, "load"):
+            df = load_data(self._path(spec["path"]), columns=preprocessor.input_columns() + [target],
+                           cache=spec.get("cache", True))
+            X, y = df.drop(columns=target), df[target]
+
+        with self.timings.stage(dataset, None, "fit_preprocessor"):
+            preprocessor.fit(X, y)
+            if spec.get("mappings_path"):
+                mappings_path = self._path(spec["mappings_path"])
+                os.makedirs(os.path.dirname(mappings_path), exist_ok=True)
+                with open(mappings_path, "w") as f:
+                    json.dump(preprocessor.save_mappings(), f)
+            if spec.get("preprocessor_path"):
+                # With its online encoders, so the encodings can be updated by incremental retraining
+                joblib.dump(preprocessor, self._path(spec["preprocessor_path"]))
+
+        calibration = spec.get("calibration")
+        with self.timings.stage(dataset, None, "transform_sample"):
+            X_train, X_test, y_train, y_test = train_test_split_data(X, y, stratify=y)
+            if calibration:
+                # Calibration rows keep the original class balance, so they are split off before resampling
+                X_train, X_cal, y_train, y_cal = train_test_split_data(
+                    X_train, y_train, test_size=calibration.get("size", 0.2), stratify=y_train)
+            X_test_transformed = preprocessor.transform(X_test, output="float32")
+            X_train_sampled, y_train_sampled = preprocessor.sample(preprocessor.transform(X_train), y_train)
+
+        with self.timings.stage(dataset, None, "share"):
+            directory = os.path.join(shared_dir, dataset)
+            os.makedirs(directory, exist_ok=True)
+            X_train_values = np.asarray(X_train_sampled)
+            if X_train_values.dtype.kind != "f":
+                X_train_values = X_train_values.astype(np.float64)
+            arrays = {
+                "X_train": X_train_values,  # float32 samplers stay float32
+                "y_train": np.asarray(y_train_sampled),
+                "X_test": X_test_transformed,
+                "y_test": np.asarray(y_test),
+            }
+            weights = preprocessor.sample_weight(y_train_sampled)
+            if weights is not None:
+                arrays["w_train"] = weights
+            if calibration:
+                arrays["X_cal"] = preprocessor.transform(X_cal, output="float32")
+                arrays["y_cal"] = np.asarray(y_cal)
+                arrays["cost_cal"] = X_cal[calibration["cost_column"]].to_numpy(dtype=np.float64)
+            array_paths = share_arrays(arrays, directory)
+        return preprocessor, array_paths, np.asarray(y_test)
+
+    def _write_artifacts(self, dataset, model_key, preprocessor, trainer, y_test, y_pred, y_proba):
+        """Background task: evaluation, plots, model file and inference bundle."""
+        spec = self.config["datasets"][dataset]
+        models_dir = self._path(spec["output_dir"])
+        plot_dir = os.path.join(models_dir, "plots")
+        os.makedirs(plot_dir, exist_ok=True)
+        name = f"{model_key} ({dataset})"
+
+        with self.timings.stage(dataset, model_key, "evaluate_plot"):
+            metrics = evaluate_model(y_test, y_pred, y_proba, model_name=name,
+                                     save_roc_path=f"{plot_dir}/roc_{model_key}.png")
+            plot_confusion_matrix(y_test, y_pred, model_name=name, save_path=f"{plot_dir}/cm_{model_key}.png")
+            plt.close("all")
+
+        with self.timings.stage(dataset, model_key, "save_artifacts"):
+            trainer.save_model(f"{models_dir}/{model_key}_{spec['suffix']}.pkl")
+            save_bundle(f"{models_dir}/{model_key}_{spec['suffix']}.bundle", preprocessor, trainer)
+        self.results[(dataset, model_key)] = metrics
+
+    def _write_cascade(self, dataset, screen, model, array_paths):
+        """
+        Background task: fits the screen -> model cascade bands on the
+        calibration rows, evaluates them on the test set and saves them.
+        """
+        spec = self.config["datasets"][dataset]
+        cascade_spec = spec["cascade"]
+        arrays = {name: np.load(path, mmap_mode="r") for name, path in array_paths.items()}
+        with self.timings.stage(dataset, "cascade", "fit_cascade"):
+            cascade = CascadeModel.fit(screen.model, model.model, arrays["X_cal"], np.asarray(arrays["y_cal"]),
+                                       target_recall=cascade_spec.get("target_recall"))
+            y_test = np.asarray(arrays["y_test"])
+            y_pred = cascade.predict(arrays["X_test"])
+            test = classification_metrics(*confusion_counts(y_test, y_pred))
+            test["escalation_rate"] = cascade.escalation_rate
+            cascade.report["test"] = test
+            suffix = spec["suffix"]
+            cascade.save(os.path.join(self._path(spec["output_dir"]), f"cascade_{suffix}.json"),
+                         f"{cascade_spec['screen']}_{suffix}.pkl", f"{cascade_spec['model']}_{suffix}.pkl")
+        logger.info(f"Cascade ({dataset}): {test['escalation_rate']:.1%} of test rows escalated, "
+                    f"recall {test['recall']:.4f}, precision {test['precision']:.4f}")
+        self.cascades[dataset] = cascade.report
+
+    def run(self, datasets=None, models=None):
+        """
+        Trains the selected datasets x models (all by default) and returns the
+        stage timings as a list of dicts. Also writes them to config["timings_path"].
+        """
+        start = time.perf_counter()
+        jobs = self._jobs(datasets, models)
+        concurrency = max(1, min(len(jobs), self.n_cores))
+        n_jobs = max(1, self.n_cores // concurrency)
+        logger.info(f"Training {len(jobs)} models, {concurrency} at a time with {n_jobs} cores each")
+
+        # With the module profiler enabled, workers profile their stages too
+        profile = {"track_memory": profiler.track_memory} if profiler.enabled else None
+        shared_dir = tempfile.mkdtemp(prefix="fraud_training_")
+        # Spawned workers: forking a process that runs a plotting thread is not safe
+        context = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(max_workers=concurrency, mp_context=context) as pool, \
+                    ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifacts") as artifacts:
+                pending = {}
+                dataset_arrays = {}
+                for dataset in dict.fromkeys(d for d, _ in jobs):
+                    # Models of this dataset start training while the next one is prepared
+                    preprocessor, array_paths, y_test = self.prepare_dataset(dataset, shared_dir)
+                    dataset_arrays[dataset] = array_paths
+                    for job_dataset, model_key in jobs:
+                        if job_dataset == dataset:
+                            future = pool.submit(_train_model, dataset, model_key, self.config["models"][model_key],
+                                                 array_paths, n_jobs, self.config["datasets"][dataset].get("calibration"),
+                                                 profile)
+                            pending[future] = (dataset, model_key, preprocessor, y_test)
+
+                # Artifacts of each model are written as soon as it finishes
+                artifact_futures = []
+                trained = {}
+                for future in as_completed(pending):
+                    dataset, model_key, preprocessor, y_test = pending[future]
+                    trainer, y_pred, y_proba, worker_timings, profile_records = future.result()
+                    if profile_records is not None:
+                        profiler.merge(*profile_records)
+                    for stage, seconds in worker_timings.items():
+                        self.timings.add(dataset, model_key, stage, seconds)
+                    artifact_futures.append(artifacts.submit(
+                        self._write_artifacts, dataset, model_key, preprocessor, trainer, y_test, y_pred, y_proba))
+                    trained[(dataset, model_key)] = trainer
+                    cascade_spec = self.config["datasets"][dataset].get("cascade")
+                    if cascade_spec and model_key in (cascade_spec["screen"], cascade_spec["model"]):
+                        screen = trained.get((dataset, cascade_spec["screen"]))
+                        model = trained.get((dataset, cascade_spec["model"]))
+                        if screen is not None and model is not None and "X_cal" in dataset_arrays[dataset]:
+                            artifact_futures.append(artifacts.submit(
+                                self._write_cascade, dataset, screen, model, dataset_arrays[dataset]))
+                for future in artifact_futures:
+                    future.result()
+        finally:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+        self.timings.add(None, None, "total", time.perf_counter() - start)
+        for stage, seconds in self.timings.summary().items():
+            logger.info(f"⏱️ {stage}: {seconds:.2f}s")
+
+        if self.config.get("timings_path"):
+            timings_path = self._path(self.config["timings_path"])
+            os.makedirs(os.path.dirname(timings_path) or ".", exist_ok=True)
+            with open(timings_path, "w") as f:
+                json.dump({"n_cores": self.n_cores, "stages": self.timings.records}, f, indent=2)
+        return self.timings.records
@@ -0,0 +1,190 @@
+import numpy as np
+
+# np.trapz was renamed np.trapezoid in NumPy 2.0
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def confusion_counts(y_true, y_pred):
+    """
+    Confusion counts of binary labels and predictions in one pass.
+
+    Returns:
+    - (tn, fp, fn, tp) as ints
+    """
+    codes = 2 * np.asarray(y_true, dtype=np.int64) + np.asarray(y_pred, dtype=np.int64)
+    tn, fp, fn, tp = np.bincount(codes, minlength=4)[:4]
+    return int(tn), int(fp), int(fn), int(tp)
+
+
+def _ratio(num, den):
+    """num / den with 0 where den is 0 (sklearn's zero_division=0), for scalars or arrays."""
+    num, den = np.asarray(num, dtype=np.float64), np.asarray(den, dtype=np.float64)
+    out = np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+    return out if out.ndim else float(out)
+
+
+def classification_metrics(tn, fp, fn, tp):
+    """Accuracy, precision, recall and F1 of the positive class from confusion counts."""
+    precision, recall = _ratio(tp, tp + fp), _ratio(tp, tp + fn)
+    return {
+        "accuracy": _ratio(tp + tn, tn + fp + fn + tp),
+        "precision": precision,
+        "recall": recall,
+        "f1": _ratio(2 * tp, 2 * tp + fp + fn),
+    }
+
+
+def classification_report_text(tn, fp, fn, tp, digits=2):
+    """Text report in the layout of sklearn's classification_report, built from confusion counts."""
+    rows = []
+    for label, (hit, false_pos, miss) in (("0", (tn, fn, fp)), ("1", (tp, fp, fn))):
+        p, r = _ratio(hit, hit + false_pos), _ratio(hit, hit + miss)
+        rows.append((label, p, r, _ratio(2 * hit, 2 * hit + false_pos + miss), hit + miss))
+    support = np.array([row[4] for row in rows], dtype=np.float64)
+    scores = np.array([row[1:4] for row in rows])
+    total = int(support.sum())
+
+    width = max(len("weighted avg"), digits)
+    header = " " * width + " " + "".join(f"{h:>10}" for h in ("precision", "recall", "f1-score", "support"))
+    lines = [header, ""]
+    for label, p, r, f, s in rows:
+        lines.append(f"{label:>{width}} {p:>10.{digits}f}{r:>10.{digits}f}{f:>10.{digits}f}{s:>10}")
+    lines.append("")
+    lines.append(f"{'accuracy':>{width}} {'':>10}{'':>10}{_ratio(tn + tp, total):>10.{digits}f}{total:>10}")
+    for name, avg in (("macro avg", scores.mean(axis=0)), ("weighted avg", support @ scores / max(total, 1))):
+        lines.append(f"{name:>{width}} " + "".join(f"{v:>10.{digits}f}" for v in avg) + f"{total:>10}")
+    return "\n".join(lines) + "\n"
+
+
+class ScoreEvaluator:
+    """
+    Exact ranking metrics of binary scores from a single sort.
+
+    The scores are sorted once (descending) and the true/false positive
+    counts at every distinct threshold come from cumulative sums, so ROC and
+    PR curves, ROC AUC, average precision and the confusion counts at any
+    threshold (predict positive when score >= threshold) need no further
+    passes over the data. Results match sklearn's roc_curve
+    (drop_intermediate=False), roc_auc_score and average_precision_score.
+    """
+
+    def __init__(self, y_true, y_score):
+        y_true = np.asarray(y_true).ravel()
+        y_score = np.asarray(y_score, dtype=np.float64).ravel()
+        if len(y_true) != len(y_score):
+            raise ValueError(f"y_true has {len(y_true)} rows but y_score has {len(y_score)}")
+
+        order = np.argsort(-y_score, kind="mergesort")
+        scores = y_score[order]
+        labels = (y_true[order] == 1).astype(np.int64)
+        # Last index of each run of tied scores
+        distinct = np.flatnonzero(np.diff(scores)) if len(scores) else np.array([], dtype=np.int64)
+        ends = np.r_[distinct, len(scores) - 1] if len(scores) else distinct
+
+        self.thresholds = scores[ends]
+        self._order, self._ends, self._labels = order, ends, labels
+        self.tps = np.cumsum(labels)[ends]
+        self.fps = ends + 1 - self.tps
+        self.n_pos = int(labels.sum())
+        self.n_neg = len(labels) - self.n_pos
+
+    def roc_curve(self):
+        """(fpr, tpr, thresholds), starting at (0, 0) with threshold inf as sklearn does."""
+        tps, fps = np.r_[0, self.tps], np.r_[0, self.fps]
+        return _ratio(fps, self.n_neg), _ratio(tps, self.n_pos), np.r_[np.inf, self.thresholds]
+
+    def roc_auc(self):
+        if self.n_pos == 0 or self.n_neg == 0:
+            raise ValueError("ROC AUC is undefined with only one class in y_true")
+        fpr, tpr, _ = self.roc_curve()
+        return float(_trapezoid(tpr, fpr))
+
+    def pr_curve(self):
+        """(precision, recall, thresholds) with increasing thresholds, ending at (1, 0) like sklearn."""
+        precision = _ratio(self.tps, self.tps + self.fps)
+        recall = _ratio(self.tps, self.n_pos)
+        return np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0], self.thresholds[::-1]
+
+    def average_precision(self):
+        """Step-wise area under the PR curve (sklearn's average_precision_score)."""
+        precision, recall, _ = self.pr_curve()
+        return float(-np.sum(np.diff(recall) * precision[:-1]))
+
+    def confusion_at(self, threshold):
+        """(tn, fp, fn, tp) when predicting positive for score >= threshold."""
+        # thresholds are descending; count the distinct scores >= threshold
+        k = np.searchsorted(-self.thresholds, -threshold, side="right")
+        tp = int(self.tps[k - 1]) if k else 0
+        fp = int(self.fps[k - 1]) if k else 0
+        return self.n_neg - fp, fp, self.n_pos - tp, tp
+
+    def threshold_sweep(self, cost_fp=1.0, cost_fn=1.0):
+        """
+        Confusion counts, precision, recall, F1 and expected cost at every
+        distinct threshold, vectorized.
+
+        Parameters:
+        - cost_fp: cost of flagging a legitimate transaction
+        - cost_fn: cost of missing a fraudulent one
+        Either may be a per-row array (in y_score order), e.g. the transaction
+        amount as cost_fn, to get the monetary loss at each threshold.
+
+        Returns:
+        - dict of equal-length arrays, starting with the "flag nothing" point (threshold inf)
+        """
+        tp, fp = np.r_[0, self.tps], np.r_[0, self.fps]
+        fn, tn = self.n_pos - tp, self.n_neg - fp
+        if np.ndim(cost_fp) or np.ndim(cost_fn):
+            cost = self._row_cost(cost_fp, cost_fn)
+        else:
+            cost = cost_fp * fp + cost_fn * fn
+        return {
+            "threshold": np.r_[np.inf, self.thresholds],
+            "tn": tn, "fp": fp, "fn": fn, "tp": tp,
+            "precision": _ratio(tp, tp + fp),
+            "recall": _ratio(tp, self.n_pos),
+            "f1": _ratio(2 * tp, 2 * tp + fp + fn),
+            "cost": cost,
+        }
+
+    def _row_cost(self, cost_fp, cost_fn):
+        """Loss at each threshold when every row carries its own FP/FN cost."""
+        n = len(self._order)
+        cost_fp = np.broadcast_to(np.asarray(cost_fp, dtype=np.float64), n)[self._order]
+        cost_fn = np.broadcast_to(np.asarray(cost_fn, dtype=np.float64), n)[self._order]
+        flagged_fp = np.r_[0.0, np.cumsum(cost_fp * (1 - self._labels))[self._ends]]
+        caught_fn = np.r_[0.0, np.cumsum(cost_fn * self._labels)[self._ends]]
+        return flagged_fp + (cost_fn * self._labels).sum() - caught_fn
+
+    def operating_points(self, cost_fp=1.0, cost_fn=1.0):
+        """
+        Cost-optimal and F1-optimal thresholds from threshold_sweep.
+
+        Returns:
+        - {"min_cost": {...}, "max_f1": {...}}, each a row of the sweep as scalars
+        """
+        sweep = self.threshold_sweep(cost_fp, cost_fn)
+
+        def row(i):
+            return {k: (float(v[i]) if v.dtype.kind == "f" else int(v[i])) for k, v in sweep.items()}
+
+        return {"min_cost": row(int(np.argmin(sweep["cost"]))), "max_f1": row(int(np.argmax(sweep["f1"])))}
+
+    def plot_roc(self, model_name="Model", save_path=None):
+        """Draws the ROC curve from the cached counts; matplotlib is imported only here."""
+        import matplotlib.pyplot as plt
+
+        fpr, tpr, _ = self.roc_curve()
+        fig = plt.figure(figsize=(6, 6))
+        plt.plot(fpr, tpr, label=f'AUC = {self.roc_auc():.2f}')
+        plt.plot([0, 1], [0, 1], 'k--')
+        plt.xlabel('False Positive Rate')
+        plt.ylabel('True Positive Rate')
+        plt.title(f'ROC Curve: {model_name}')
+        plt.legend(loc="lower right")
+        if save_path:
+            plt.savefig(save_path)
+            plt.close(fig)
+        else:
+            plt.show()
+        return fig
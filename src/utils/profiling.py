@@ -0,0 +1,261 @@
+import functools
+import inspect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+
+class SampledLogger:
+    """
+    Logs the first call and then every `every`-th call of a hot path, with
+    lazy %-style formatting, so per-row code does not pay for string
+    formatting and handler I/O on every call.
+    """
+
+    def __init__(self, logger, every=1000):
+        self.logger = logger
+        self.every = every
+        self._calls = itertools.count()
+
+    def _log(self, level, msg, args):
+        n = next(self._calls)
+        if n % self.every == 0 and self.logger.isEnabledFor(level):
+            self.logger.log(level, msg + " (call %d, logged every %d)", *args, n + 1, self.every)
+
+    def debug(self, msg, *args):
+        self._log(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        self._log(logging.INFO, msg, args)
+
+
+def _count_rows(value):
+    shape = getattr(value, "shape", None)
+    if shape:
+        return int(shape[0])
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class _NullStage:
+    """Shared no-op stage returned while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_rows(self, rows):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+
+    def set_rows(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        self.profiler._push(self)
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu_start
+        self.profiler._pop(self, wall, cpu)
+        return False
+
+
+class Profiler:
+    """
+    Per-stage wall time, CPU time (all threads of the process), rows and peak
+    traced memory. Disabled by default: stage() then returns a shared no-op
+    context manager and @profiled functions run after a single attribute
+    check. Enable with enable() or FRAUD_PROFILE=1, then export the run with
+    to_json() or to_chrome_trace() (chrome://tracing, Perfetto).
+
+    Peak memory comes from tracemalloc (NumPy buffers included) and is
+    tracked per stage, nested stages included; tracing slows
+    allocation-heavy code, so enable(track_memory=False) for timing only.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.records = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+
+    def enable(self, track_memory=True):
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+        return self
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+            self._origin = time.perf_counter()
+
+    def stage(self, name, rows=None):
+        """Context manager timing one stage; rows can also be set later with .set_rows(n)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, stage):
+        stack = self._stack()
+        stage.depth = len(stack)
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Fold the peak so far into the enclosing stage before resetting it
+                stack[-1].mem_peak = max(stack[-1].mem_peak, peak)
+            tracemalloc.reset_peak()
+            stage.mem_start = stage.mem_peak = current
+        stack.append(stage)
+
+    def _pop(self, stage, wall, cpu):
+        stack = self._stack()
+        stack.pop()
+        peak_mib = None
+        if self.track_memory and tracemalloc.is_tracing():
+            stage.mem_peak = max(stage.mem_peak, tracemalloc.get_traced_memory()[1])
+            peak_mib = (stage.mem_peak - stage.mem_start) / 2**20
+            if stack:
+                stack[-1].mem_peak = max(stack[-1].mem_peak, stage.mem_peak)
+            tracemalloc.reset_peak()
+        record = {
+            "stage": stage.name,
+            "start_s": stage.start - self._origin,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "rows": stage.rows,
+            "peak_mib": peak_mib,
+            "depth": stage.depth,
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def merge(self, records, origin):
+        """
+        Adds records collected by another process's profiler (e.g. a pool
+        worker), re-basing their start times from that profiler's origin.
+        perf_counter is a system-wide monotonic clock on Linux, so the
+        stages line up on one timeline.
+        """
+        shift = origin - self._origin
+        with self._lock:
+            self.records.extend({**r, "start_s": r["start_s"] + shift} for r in records)
+
+    def summary(self):
+        """Totals per stage: calls, wall/CPU seconds, rows, rows/s and the largest peak."""
+        stages = {}
+        for record in self.records:
+            s = stages.setdefault(record["stage"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0,
+                                                    "peak_mib": None})
+            s["calls"] += 1
+            s["wall_s"] += record["wall_s"]
+            s["cpu_s"] += record["cpu_s"]
+            s["rows"] += record["rows"] or 0
+            if record["peak_mib"] is not None:
+                s["peak_mib"] = max(s["peak_mib"] or 0.0, record["peak_mib"])
+        for s in stages.values():
+            s["rows_per_s"] = s["rows"] / s["wall_s"] if s["rows"] and s["wall_s"] else None
+        return stages
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "records": self.records}, f, indent=2)
+        logger.info(f"Profile written to {path}")
+        return path
+
+    def to_chrome_trace(self, path):
+        """Writes the records as complete ("X") events of the Chrome trace event format."""
+        events = [{
+            "name": r["stage"],
+            "cat": "stage",
+            "ph": "X",
+            "ts": r["start_s"] * 1e6,
+            "dur": r["wall_s"] * 1e6,
+            "pid": r["pid"],
+            "tid": r["thread"],
+            "args": {"rows": r["rows"], "cpu_ms": r["cpu_s"] * 1000, "peak_mib": r["peak_mib"]},
+        } for r in self.records]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Chrome trace written to {path}")
+        return path
+
+
+profiler = Profiler()
+if os.environ.get("FRAUD_PROFILE"):
+    profiler.enable()
+
+
+def stage(name, rows=None):
+    """Times a block as `name` on the module profiler (no-op while it is disabled)."""
+    return profiler.stage(name, rows)
+
+
+def profiled(name, rows=None):
+    """
+    Decorator recording each call as a stage of the module profiler.
+
+    Parameters:
+    - name: stage name, e.g. "transform"
+    - rows: argument whose length is the number of rows processed, or
+      "result" to count the rows of the return value
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn) if rows not in (None, "result") else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            n_rows = None
+            if signature is not None:
+                n_rows = _count_rows(signature.bind_partial(*args, **kwargs).arguments.get(rows))
+            with profiler.stage(name, n_rows) as timed:
+                result = fn(*args, **kwargs)
+                if rows == "result":
+                    timed.set_rows(_count_rows(result))
+            return result
+        return wrapper
+    return decorator
@@ -1,17 +1,13 @@
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    roc_auc_score,
-    classification_report,
-    roc_curve,
-    auc,
-    ConfusionMatrixDisplay,
-)
-import matplotlib.pyplot as plt
+from sklearn.metrics import ConfusionMatrixDisplay
 import logging
+from src.utils.evaluation import (
+    ScoreEvaluator,
+    classification_metrics,
+    classification_report_text,
+    confusion_counts,
+)
+from src.utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
@@ -26,50 +22,41 @@ def train_test_split_data(X, y, test_size=0.2, random_state=42, stratify=None):
     )
 
 
-def evaluate_model(y_true, y_pred, y_proba, model_name="Model", save_roc_path=None):
+@profiled("evaluate", rows="y_true")
+def evaluate_model(y_true, y_pred, y_proba, model_name="Model", save_roc_path=None, plot=True):
     """
     Computes and prints standard classification metrics and plots ROC curve.
-    Saves ROC plot if save_roc_path is provided.
+    Saves ROC plot if save_roc_path is provided; plot=False skips the figure.
+
+    All metrics come from one confusion count of y_pred and one sort of
+    y_proba (ScoreEvaluator) instead of a separate sklearn pass per metric.
     """
-    acc = accuracy_score(y_true, y_pred)
-    prec = precision_score(y_true, y_pred)
-    rec = recall_score(y_true, y_pred)
-    f1 = f1_score(y_true, y_pred)
-    rocauc = roc_auc_score(y_true, y_proba)
+    counts = confusion_counts(y_true, y_pred)
+    evaluator = ScoreEvaluator(y_true, y_proba)
+    metrics = classification_metrics(*counts)
+    rocauc = evaluator.roc_auc()
+    average_precision = evaluator.average_precision()
 
     logger.info(f"Evaluating model: {model_name}")
     print(f"\n📌 ====== {model_name} Evaluation ======")
-    print(f"Accuracy: {acc:.4f}")
-    print(f"Precision: {prec:.4f}")
-    print(f"Recall: {rec:.4f}")
-    print(f"F1 Score: {f1:.4f}")
+    print(f"Accuracy: {metrics['accuracy']:.4f}")
+    print(f"Precision: {metrics['precision']:.4f}")
+    print(f"Recall: {metrics['recall']:.4f}")
+    print(f"F1 Score: {metrics['f1']:.4f}")
     print(f"ROC AUC: {rocauc:.4f}")
+    print(f"PR AUC (average precision): {average_precision:.4f}")
     print("\nClassification Report:")
-    print(classification_report(y_true, y_pred))
-
-    fpr, tpr, _ = roc_curve(y_true, y_proba)
-    roc_auc = auc(fpr, tpr)
+    print(classification_report_text(*counts))
 
-    plt.figure(figsize=(6, 6))
-    plt.plot(fpr, tpr, label=f'AUC = {roc_auc:.2f}')
-    plt.plot([0, 1], [0, 1], 'k--')
-    plt.xlabel('False Positive Rate')
-    plt.ylabel('True Positive Rate')
-    plt.title(f'ROC Curve: {model_name}')
-    plt.legend(loc="lower right")
-
-    if save_roc_path:
-        plt.savefig(save_roc_path)
-        logger.info(f"ROC curve saved to: {save_roc_path}")
-    else:
-        plt.show()
+    if plot:
+        evaluator.plot_roc(model_name=model_name, save_path=save_roc_path)
+        if save_roc_path:
+            logger.info(f"ROC curve saved to: {save_roc_path}")
 
     return {
-        "accuracy": acc,
-        "precision": prec,
-        "recall": rec,
-        "f1": f1,
+        **metrics,
         "roc_auc": rocauc,
+        "average_precision": average_precision,
     }
 
 
@@ -77,6 +64,8 @@ def plot_confusion_matrix(y_true, y_pred, model_name="Model", save_path=None):
     """
     Displays or saves confusion matrix plot.
     """
+    import matplotlib.pyplot as plt
+
     logger.info(f"Plotting confusion matrix: {model_name}")
     plt.figure(figsize=(6, 6))
     ConfusionMatrixDisplay.from_predictions(
@@ -1,44 +1,275 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+
+import numpy as np
 import pandas as pd 
+from pandas.tseries.api import guess_datetime_format
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-def load_data(file_path):
+from src.utils.profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+# Target columns of the fraud and credit card datasets, stored as int8 in the cache
+LABEL_COLUMNS = ("class", "Class")
+
+@profiled("load", rows="result")
+def load_data(file_path, columns=None, cache=False):
     """
     Load data from a CSV file into a pandas DataFrame.
     
     Parameters:
     file_path (str): The path to the CSV file.
+    columns (list): Optional subset of columns to load.
+    cache (bool): Keep a content-hashed Parquet copy of the CSV next to it
+        (with compact dtypes) and read from it while the CSV is unchanged.
     
     Returns:
     pd.DataFrame: DataFrame containing the loaded data.
     """
     try:
-        data = pd.read_csv(file_path)
+        if cache:
+            return _load_cached(file_path, columns)
+        data = pd.read_csv(file_path, usecols=columns)
         return data
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
-    
 
-def clean_data(df, time_column=[]):
+def file_digest(file_path):
+    """
+    Returns the BLAKE2b content hash of a file. The hash is memoized in a
+    `<file>.digest.json` sidecar keyed on size and mtime, so unchanged files
+    are not re-read on every call.
     """
-    Clean data by removing null values and converting time column to datetime.
+    stat = os.stat(file_path)
+    sidecar = f"{file_path}.digest.json"
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            memo = json.load(f)
+        if memo.get("size") == stat.st_size and memo.get("mtime_ns") == stat.st_mtime_ns:
+            return memo["digest"]
+
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with open(sidecar, "w") as f:
+        json.dump({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}, f)
+    return digest
+
+def compact_dtypes(df):
+    """
+    Downcast a freshly parsed frame for columnar storage: low-cardinality strings
+    become categoricals, PCA components (V1..V28) float32, labels int8 and the
+    remaining integers the smallest integer type that fits.
+    """
+    for col in df.columns:
+        series = df[col]
+        if col in LABEL_COLUMNS:
+            df[col] = series.astype("int8")
+        elif series.dtype == object:
+            if series.nunique() <= len(series) // 2:
+                df[col] = series.astype("category")
+        elif re.fullmatch(r"V\d+", col) and series.dtype == np.float64:
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+    return df
+
+def _load_cached(file_path, columns):
+    digest = file_digest(file_path)
+    cache_path = f"{file_path}.{digest}.parquet"
+    if not os.path.exists(cache_path):
+        logger.info(f"Building columnar cache {cache_path}")
+        df = compact_dtypes(pd.read_csv(file_path))
+        tmp_path = f"{cache_path}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        # Drop caches of earlier versions of the CSV
+        for stale in glob.glob(f"{glob.escape(file_path)}.*.parquet"):
+            if stale != cache_path:
+                os.remove(stale)
+        return df[columns] if columns else df
+    return pd.read_parquet(cache_path, columns=columns)
     
+
+# Timestamp formats numpy's ISO 8601 parser reads like pd.to_datetime, several times faster
+_ISO_FORMATS = {"%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d"}
+
+def parse_datetime(values, time_format=None, epoch=False):
+    """
+    Parse timestamp strings with a known format instead of per-value inference.
+
+    Parameters:
+    - values: Series or array of timestamp strings (nulls become NaT)
+    - time_format: strftime format; guessed once from the first non-null value when None
+    - epoch: return int64 seconds since the epoch instead of datetime64[ns]
+
+    Returns:
+    - (parsed array, format used)
+    """
+    values = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if values.dtype != object:
+        parsed = pd.to_datetime(values).to_numpy()
+    else:
+        present = pd.notna(values)
+        if time_format is None and present.any():
+            time_format = guess_datetime_format(str(values[present.argmax()]))
+        parsed = None
+        if time_format in _ISO_FORMATS:
+            try:
+                if present.all():
+                    parsed = values.astype("datetime64[ns]")
+                else:
+                    parsed = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+                    parsed[present] = values[present].astype("datetime64[ns]")
+            except (TypeError, ValueError):
+                parsed = None
+        if parsed is None:
+            parsed = pd.to_datetime(values, format=time_format).to_numpy()
+    return (_to_epoch(parsed) if epoch else parsed), time_format
+
+def _to_epoch(parsed):
+    # NaT becomes the smallest int64; cleaned frames have none
+    return parsed.astype("datetime64[s]").view(np.int64)
+
+def _time_formats(time_column, time_format):
+    if isinstance(time_format, dict):
+        return dict(time_format)
+    return dict.fromkeys(time_column, time_format)
+
+def _null_mask(df, skip=()):
+    mask = np.zeros(len(df), dtype=bool)
+    for col, series in df.items():
+        # Plain integer and boolean columns cannot hold nulls
+        if col in skip or isinstance(series.dtype, np.dtype) and series.dtype.kind in "iub":
+            continue
+        mask |= series.isna().to_numpy()
+    return mask
+
+def _parse_and_hash(df, time_column, formats, epoch):
+    """Shallow copy of df with parsed time columns, its null-row mask and 64-bit row hashes."""
+    time_column = [col for col in time_column if col in df.columns]
+    result = df.copy(deep=False)
+    # Parsed time columns are checked for NaT instead of scanning the strings twice
+    null = _null_mask(df, skip=time_column)
+    for col in time_column:
+        parsed, formats[col] = parse_datetime(df[col], formats.get(col))
+        null |= np.isnat(parsed)
+        result[col] = _to_epoch(parsed) if epoch else parsed
+    # Time columns are hashed after parsing: int64 hashing is far cheaper than strings
+    hashes = pd.util.hash_pandas_object(result, index=False).to_numpy()
+    return result, null, hashes
+
+def _count_rows(stats, rows_in, null_rows, duplicate_rows):
+    if stats is None:
+        return
+    counts = {"rows_in": rows_in, "null_rows": null_rows, "duplicate_rows": duplicate_rows,
+              "rows_out": rows_in - null_rows - duplicate_rows}
+    for key, n in counts.items():
+        stats[key] = stats.get(key, 0) + n
+
+@profiled("clean", rows="df")
+def clean_data(df, time_column=[], time_format=None, epoch=False, stats=None):
+    """
+    Clean data by removing null values and duplicates and converting time columns to datetime.
+
+    Nulls and duplicates are found with masks over a single shallow copy:
+    duplicates by 64-bit row hash instead of full-row comparison, and the
+    rows are copied once. At 10^7 rows a hash collision dropping a distinct
+    row has a probability of about 3e-6. The result never shares data with df.
+
+    Unlike the original dropna / drop_duplicates / to_datetime sequence,
+    duplicates are found after the time columns are parsed: rows whose time
+    strings differ only in formatting (e.g. "2015-01-01 00:00" and
+    "2015-01-01 00:00:00") now count as duplicates, and with epoch=True so
+    do rows whose times differ by less than a second.
+
     Parameters:
     df (pd.DataFrame): DataFrame to clean.
-    time_column (str): Name of the time column to convert to datetime.
-    """
-    df_temp = df.copy()
-    # Remove null values
-    df_temp.dropna(inplace=True)
-    # Remove duplicates
-    df_temp.drop_duplicates(inplace=True)
-    # Convert time column to datetime if any
-    if time_column:
-        for col in time_column:
-            if col in df_temp.columns:
-                df_temp[col] = pd.to_datetime(df_temp[col])
-    return df_temp
+    time_column (list): Names of the time columns to convert to datetime.
+    time_format (str or dict): strftime format of the time columns, or one per column;
+        guessed from the first value of each column when omitted.
+    epoch (bool): Convert the time columns to int64 seconds since the epoch instead.
+    stats (dict): Optional dict in which rows_in, null_rows, duplicate_rows and rows_out are accumulated.
+    """
+    formats = _time_formats(time_column, time_format)
+    result, null, hashes = _parse_and_hash(df, time_column, formats, epoch)
+    rows = np.flatnonzero(~null)
+    n_not_null = len(rows)
+    rows = rows[~pd.Series(hashes[rows]).duplicated().to_numpy()]
+    # take() copies; without dropped rows the shallow copy must not hand out df's columns
+    result = result.take(rows) if len(rows) < len(result) else result.copy()
+
+    _count_rows(stats, len(df), len(df) - n_not_null, n_not_null - len(rows))
+    logger.info(f"clean_data: {len(df)} rows, {len(df) - n_not_null} with nulls, "
+                f"{n_not_null - len(rows)} duplicates, {len(rows)} kept")
+    return result
+
+def load_data_chunks(file_path, chunksize=100_000, dtype=None, usecols=None):
+    """
+    Lazily load a CSV file as an iterator of DataFrame chunks.
+
+    Parameters:
+    - file_path: path to the CSV file
+    - chunksize: number of rows per chunk
+    - dtype: explicit column dtypes (see config.settings), avoids per-chunk inference
+    - usecols: optional subset of columns to read
+
+    Returns:
+    - Iterator of pd.DataFrame chunks
+    """
+    return pd.read_csv(file_path, chunksize=chunksize, dtype=dtype, usecols=usecols)
+
+def clean_data_chunks(chunks, time_column=[], time_format=None, epoch=False, stats=None):
+    """
+    Streaming equivalent of clean_data: drops nulls and duplicates chunk by chunk.
+    Duplicates are detected across chunks with 64-bit row hashes, so the only
+    state kept between chunks is a sorted uint64 array (8 bytes per unique row).
+    Time formats guessed on the first chunk are reused for the following ones.
+
+    Parameters:
+    - chunks: iterable of DataFrames, e.g. from load_data_chunks
+    - time_column, time_format, epoch: as for clean_data
+    - stats: optional dict in which the row counts of all chunks are accumulated
+
+    Returns:
+    - Generator of cleaned DataFrame chunks
+    """
+    formats = _time_formats(time_column, time_format)
+    totals = {}
+    seen = np.empty(0, dtype=np.uint64)
+    for chunk in chunks:
+        result, null, hashes = _parse_and_hash(chunk, time_column, formats, epoch)
+        rows = np.flatnonzero(~null)
+        keep = _first_seen_mask(hashes[rows], seen)
+        # Both inputs are sorted runs, so the stable sort is a linear merge
+        seen = np.sort(np.concatenate([seen, np.sort(hashes[rows][keep])]), kind="stable")
+
+        _count_rows(totals, len(chunk), len(chunk) - len(rows), int((~keep).sum()))
+        rows = rows[keep]
+        yield result.take(rows) if len(rows) < len(result) else result.copy()
+
+    _count_rows(stats, totals.get("rows_in", 0), totals.get("null_rows", 0), totals.get("duplicate_rows", 0))
+    logger.info(f"clean_data_chunks: {totals.get('rows_in', 0)} rows, {totals.get('null_rows', 0)} with nulls, "
+                f"{totals.get('duplicate_rows', 0)} duplicates, {totals.get('rows_out', 0)} kept")
+
+def _first_seen_mask(hashes, seen):
+    # First occurrence within the chunk ...
+    mask = np.zeros(len(hashes), dtype=bool)
+    mask[np.unique(hashes, return_index=True)[1]] = True
+    # ... that was not already seen in an earlier chunk
+    if len(seen):
+        pos = np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)
+        mask &= seen[pos] != hashes
+    return mask
 
 def plot_distribution(data, column_name, bins=30, kde=True, color='skyblue', log_scale= False):
     """
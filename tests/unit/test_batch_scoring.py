@@ -0,0 +1,103 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.batch_scoring import csv_partitions, read_scores, score_file
+from src.services.inference_bundle import load_bundle, save_bundle
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def make_bundle(path):
+    df = make_fraud_frame()
+    y = [0, 1, 0, 1]
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(pre.transform(df), y)
+    return save_bundle(path, pre, trainer, model_version="v1")
+
+def make_transactions(n_copies=250):
+    df = pd.concat([make_fraud_frame()] * n_copies, ignore_index=True)
+    df["purchase_value"] = np.arange(len(df)) % 500
+    df.insert(0, "txn_id", np.arange(len(df)) * 10)
+    return df
+
+def test_score_file_matches_bundle_and_resumes():
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle_path = make_bundle(f"{tmp}/model.bundle")
+        df = make_transactions()
+        expected = load_bundle(bundle_path).score(df.to_dict(orient="records"))
+        df.to_csv(f"{tmp}/in.csv", index=False)
+        df.to_parquet(f"{tmp}/in.parquet", index=False, row_group_size=300)
+
+        summary = score_file(bundle_path, f"{tmp}/in.csv", f"{tmp}/out", workers=2, partition_rows=128,
+                             keep_columns=["txn_id"])
+        assert summary["rows"] == len(df) and summary["partitions"] == 8 and summary["workers"] == 2
+        scores = read_scores(f"{tmp}/out")
+        assert np.array_equal(scores["row"], np.arange(len(df)))
+        assert np.array_equal(scores["txn_id"], df["txn_id"])
+        assert np.allclose(scores["score"], expected)
+        assert np.array_equal(scores["flagged"], expected >= 0.5)
+
+        # After a crash only the partitions without a part file are scored again
+        os.remove(f"{tmp}/out/part-00002.parquet")
+        os.remove(f"{tmp}/out/part-00007.parquet")
+        summary = score_file(bundle_path, f"{tmp}/in.csv", f"{tmp}/out", workers=1, partition_rows=128,
+                             keep_columns=["txn_id"])
+        assert summary["skipped"] == 6 and summary["rows"] == 128 + len(df) - 7 * 128
+        assert read_scores(f"{tmp}/out").equals(scores)
+
+        # Parts of a different job are never mixed in
+        with pytest.raises(ValueError):
+            score_file(bundle_path, f"{tmp}/in.csv", f"{tmp}/out", workers=1, partition_rows=100)
+
+        score_file(bundle_path, f"{tmp}/in.parquet", f"{tmp}/out", workers=1, partition_rows=128,
+                   native=True, overwrite=True)
+        parquet_scores = read_scores(f"{tmp}/out")
+        assert list(parquet_scores.columns) == ["row", "score", "flagged"]
+        assert np.allclose(parquet_scores["score"], expected)
+    print("✅ test_score_file_matches_bundle_and_resumes passed.")
+
+def test_csv_partitions_share_configured_dtypes():
+    # Numeric-looking device ids: a partition with a missing one would be inferred as float ("1001.0")
+    df = make_fraud_frame()
+    df["device_id"] = ["1001", "1002", "1001", "1003"]
+    y = [0, 1, 0, 1]
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("gbm")
+    trainer.train(pre.transform(df), y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle_path = save_bundle(f"{tmp}/model.bundle", pre, trainer, model_version="v1")
+        transactions = pd.concat([df] * 4, ignore_index=True)
+        transactions.loc[1, "device_id"] = None
+        # Blank purchase_value (configured int32) in a later partition; XGBoost scores the NaN
+        transactions.loc[9, "purchase_value"] = None
+        transactions.to_csv(f"{tmp}/in.csv", index=False)
+        expected = load_bundle(bundle_path).score(transactions.to_dict(orient="records"))
+
+        score_file(bundle_path, f"{tmp}/in.csv", f"{tmp}/out", workers=1, partition_rows=4)
+        assert np.allclose(read_scores(f"{tmp}/out")["score"], expected)
+    print("✅ test_csv_partitions_share_configured_dtypes passed.")
+
+def test_csv_partitions():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/in.csv"
+        for body, n_rows in (("1\n2\n3\n4\n5\n", [2, 2, 1]), ("1\n2\n3\n4\n5", [2, 2, 1]),
+                             ("1\n2\n3\n4\n", [2, 2]), ("", [])):
+            with open(path, "w") as f:
+                f.write("a\n" + body)
+            header, partitions = csv_partitions(path, 2)
+            assert header == b"a\n"
+            assert [p.n_rows for p in partitions] == n_rows
+            assert [p.start_row for p in partitions] == [0, 2, 4][:len(n_rows)]
+            with open(path, "rb") as f:
+                data = f.read()
+            assert b"".join(data[slice(*p.byte_range)] for p in partitions) == body.encode()
+    print("✅ test_csv_partitions passed.")
+
+if __name__ == "__main__":
+    test_score_file_matches_bundle_and_resumes()
+    test_csv_partitions_share_configured_dtypes()
+    test_csv_partitions()
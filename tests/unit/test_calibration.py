@@ -0,0 +1,90 @@
+import json
+import tempfile
+import numpy as np
+from imblearn.under_sampling import RandomUnderSampler
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.calibration import CalibratedModel
+from src.models.model_trainer import ModelTrainer
+from src.models.native import load_model
+from src.services.inference_bundle import load_bundle, save_bundle
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def test_calibration_and_cost_threshold():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(6000, 3))
+    y = (X[:, 0] + rng.normal(0, 1, 6000) > 2.0).astype(int)
+    amount = rng.gamma(2, 40, 6000)
+    X_fit, y_fit = RandomUnderSampler(sampling_strategy=0.25, random_state=0).fit_resample(X[:3000], y[:3000])
+    X_cal, y_cal, cost_fn = X[3000:], y[3000:], amount[3000:]
+
+    for method in ("isotonic", "platt"):
+        trainer = ModelTrainer("logistic_regression")
+        trainer.train(X_fit, y_fit)
+        raw = trainer.predict_proba(X_cal)
+        point = trainer.calibrate(X_cal, y_cal, method=method, cost_fp=10.0, cost_fn=cost_fn)
+        calibrated = trainer.predict_proba(X_cal)
+
+        # Undersampling inflates probabilities; calibration brings them back to the real rate
+        assert abs(calibrated.mean() - y_cal.mean()) < abs(raw.mean() - y_cal.mean())
+        pred = trainer.predict(X_cal)
+        loss = 10.0 * ((pred == 1) & (y_cal == 0)).sum() + cost_fn[(pred == 0) & (y_cal == 1)].sum()
+        assert np.isclose(loss, point["cost"])
+        # No single threshold on the calibrated scores does better
+        for t in np.unique(calibrated)[::50]:
+            flagged = calibrated >= t
+            assert loss <= 10.0 * (flagged & (y_cal == 0)).sum() + cost_fn[~flagged & (y_cal == 1)].sum() + 1e-6
+    print("✅ test_calibration_and_cost_threshold passed.")
+
+def test_calibrated_model_travels_in_bundle():
+    df = make_fraud_frame()
+    y = np.array([0, 1, 0, 1])
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(pre.transform(df).to_numpy(), y)
+    trainer.calibrate(pre.transform(df).to_numpy(), y, cost_fp=1.0, cost_fn=df["purchase_value"].to_numpy())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_bundle(f"{tmp}/model.bundle", pre, trainer)
+        bundle = load_bundle(f"{tmp}/model.bundle")
+        assert isinstance(bundle.trainer.model, CalibratedModel)
+        assert bundle.threshold == trainer.model.threshold
+        assert bundle.manifest["decision"]["calibration"] == "isotonic"
+        assert np.allclose(bundle.score(df.to_dict(orient="records")), trainer.predict_proba(pre.transform(df)))
+        del bundle
+    print("✅ test_calibrated_model_travels_in_bundle passed.")
+
+def test_flag_nothing_threshold_is_valid_json():
+    df = make_fraud_frame()
+    y = np.array([0, 1, 0, 1])
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    X = pre.transform(df).to_numpy()
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(X, y)
+    # Every row is also seen with the other label and false alerts cost far more than
+    # missed fraud, so flagging nothing is cheapest
+    point = trainer.calibrate(np.vstack([X, X]), np.concatenate([y, 1 - y]), cost_fp=1e9, cost_fn=1.0)
+    assert np.isinf(point["threshold"]) and np.isinf(trainer.model.threshold)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_bundle(f"{tmp}/model.bundle", pre, trainer)
+        with open(f"{tmp}/model.bundle/manifest.json") as f:
+            text = f.read()
+        # Strict JSON: no Infinity literal
+        assert "Infinity" not in text and json.loads(text)["decision"]["threshold"] is None
+        bundle = load_bundle(f"{tmp}/model.bundle")
+        assert np.isinf(bundle.threshold)
+        assert not (bundle.score(df.to_dict(orient="records")) >= bundle.threshold).any()
+        del bundle
+
+        trainer.export_model(f"{tmp}/native")
+        with open(f"{tmp}/native/model.json") as f:
+            text = f.read()
+        assert "Infinity" not in text and json.loads(text)["threshold"] is None
+        native = load_model(f"{tmp}/native")
+        assert np.isinf(native.threshold) and not native.predict(X).any()
+    print("✅ test_flag_nothing_threshold_is_valid_json passed.")
+
+if __name__ == "__main__":
+    test_calibration_and_cost_threshold()
+    test_calibrated_model_travels_in_bundle()
+    test_flag_nothing_threshold_is_valid_json()
@@ -0,0 +1,66 @@
+import math
+import numpy as np
+import pandas as pd
+from src.models.cascade import CascadeModel, choose_bands
+from src.models.model_trainer import ModelTrainer
+
+def test_choose_bands_holds_recall():
+    rng = np.random.default_rng(0)
+    y = (rng.random(20000) < 0.02).astype(int)
+    # The model separates the classes better than the screen
+    screen = np.clip(0.1 + 0.5 * y + rng.normal(0, 0.15, len(y)), 0, 1)
+    model = np.clip(0.1 + 0.8 * y + rng.normal(0, 0.1, len(y)), 0, 1)
+
+    report = choose_bands(screen, model, y, threshold=0.5, target_recall=0.95)
+    escalate = (screen >= report["low"]) & (screen < report["high"])
+    flagged = np.where(escalate, model >= 0.5, screen >= report["high"])
+    assert flagged[y == 1].mean() >= 0.95
+    assert math.isclose(report["recall"], flagged[y == 1].mean())
+    assert math.isclose(report["escalation_rate"], escalate.mean())
+    assert report["escalation_rate"] < 0.5
+    # Holding the model's own recall by default
+    assert choose_bands(screen, model, y)["recall"] >= report["model_recall"] - 1e-12
+    print("✅ test_choose_bands_holds_recall passed.")
+
+def test_cascade_model_escalates_band_only():
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(4000, 4)), columns=list("abcd"))
+    y = ((X["a"] + X["b"] ** 2 + rng.normal(0, 0.5, len(X))) > 2.5).astype(int)
+    screen, model = ModelTrainer("logistic_regression"), ModelTrainer("gbm")
+    screen.train(X[:3000], y[:3000])
+    model.train(X[:3000], y[:3000])
+
+    cascade = CascadeModel.fit(screen.model, model.model, X[3000:], y[3000:])
+    proba = cascade.predict_proba(X[3000:])[:, 1]
+    screen_proba = screen.predict_proba(X[3000:])
+    escalate = (screen_proba >= cascade.low) & (screen_proba < cascade.high)
+    assert np.allclose(proba[escalate], model.predict_proba(X[3000:])[escalate])
+    cleared, flagged = screen_proba < cascade.low, screen_proba >= cascade.high
+    assert np.allclose(proba[cleared], np.minimum(screen_proba[cleared], cascade.threshold - 1e-12))
+    assert np.allclose(proba[flagged], np.maximum(screen_proba[flagged], cascade.threshold))
+    assert cascade.n_escalated == escalate.sum() and cascade.escalation_rate == escalate.mean()
+    assert cascade.predict(X[3000:])[y[3000:].to_numpy() == 1].mean() >= cascade.report["target_recall"] - 1e-12
+    print("✅ test_cascade_model_escalates_band_only passed.")
+
+def test_cascade_predict_agrees_with_thresholded_proba():
+    rng = np.random.default_rng(2)
+    X = pd.DataFrame(rng.normal(size=(4000, 4)), columns=list("abcd"))
+    y = ((X["a"] + X["b"] ** 2 + rng.normal(0, 0.5, len(X))) > 2.5).astype(int)
+    screen, model = ModelTrainer("logistic_regression"), ModelTrainer("gbm")
+    screen.train(X[:3000], y[:3000])
+    model.train(X[:3000], y[:3000])
+
+    # Bands whose screen-decided rows sit on the wrong side of the threshold
+    screen_proba = screen.predict_proba(X[3000:])
+    for low, high in ((0.02, 0.3), (0.6, 0.9), (-math.inf, math.inf), (0.5, 0.5)):
+        cascade = CascadeModel(screen.model, model.model, low, high, threshold=0.4)
+        proba = cascade.predict_proba(X[3000:])[:, 1]
+        assert np.array_equal(cascade.predict(X[3000:]), (proba >= cascade.threshold).astype(np.int64))
+        assert np.all((proba >= 0) & (proba <= 1))
+    assert ((screen_proba >= 0.3) & (screen_proba < 0.4)).any() and (screen_proba < 0.02).any()
+    print("✅ test_cascade_predict_agrees_with_thresholded_proba passed.")
+
+if __name__ == "__main__":
+    test_choose_bands_holds_recall()
+    test_cascade_model_escalates_band_only()
+    test_cascade_predict_agrees_with_thresholded_proba()
@@ -1,9 +1,10 @@
+import numpy as np
 import pandas as pd
 from src.core.DataTransformer import FraudPreprocessor
 
-def test_fraud_preprocessor_fit_transform():
+def make_fraud_frame():
     # Minimal fraud-like data
-    df = pd.DataFrame({
+    return pd.DataFrame({
         "device_id": ["dev1", "dev2", "dev1", "dev3"],
         "country": ["US", "UK", "US", "CA"],
         "purchase_value": [100, 200, 150, 120],
@@ -17,6 +18,9 @@ def test_fraud_preprocessor_fit_transform():
         "browser": ["chrome", "safari", "chrome", "firefox"],
         "sex": ["M", "F", "M", "F"]
     })
+
+def test_fraud_preprocessor_fit_transform():
+    df = make_fraud_frame()
     y = [0, 1, 0, 1]
 
     pre = FraudPreprocessor(mode="fraud_data")
@@ -26,5 +30,79 @@ def test_fraud_preprocessor_fit_transform():
     assert X_trans.shape[0] == 4
     print("✅ test_fraud_preprocessor_fit_transform passed.")
 
+def test_transform_batch_matches_transform():
+    df = make_fraud_frame()
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, [0, 1, 0, 1])
+
+    # Unseen device/country fall back to 0 and the global fraud rate
+    query = df.copy()
+    query.loc[0, "device_id"] = "dev_unseen"
+    query.loc[1, "country"] = "FR"
+
+    expected = pre.transform(query).to_numpy()
+    from_records = pre.transform_batch(query.to_dict(orient="records"))
+    from_columns = pre.transform_batch({col: query[col].tolist() for col in query.columns})
+    assert np.array_equal(expected, from_records)
+    assert np.array_equal(expected, from_columns)
+    assert np.array_equal(expected[:1], pre.transform_for_inference(query.iloc[0].to_dict()))
+    print("✅ test_transform_batch_matches_transform passed.")
+
+def test_fit_chunks_matches_fit():
+    df = make_fraud_frame()
+    df["class"] = [0, 1, 0, 1]
+    X, y = df.drop(columns="class"), df["class"]
+
+    full = FraudPreprocessor(mode="fraud_data").fit(X, y)
+    chunked = FraudPreprocessor(mode="fraud_data").fit_chunks([df.iloc[:3], df.iloc[3:]])
+    assert chunked.device_freq_map == full.device_freq_map
+    assert chunked.country_fraud_map == full.country_fraud_map
+    assert chunked.global_fraud_rate == full.global_fraud_rate
+    assert list(chunked.transform(X).columns) == list(full.transform(X).columns)
+    assert np.allclose(chunked.transform(X).to_numpy(), full.transform(X).to_numpy())
+    print("✅ test_fit_chunks_matches_fit passed.")
+
+def test_transform_array_outputs():
+    df = make_fraud_frame()
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, [0, 1, 0, 1])
+    expected = pre.transform(df)
+
+    dense = pre.transform(df, output="float32")
+    assert dense.dtype == np.float32
+    assert np.array_equal(dense, expected.to_numpy().astype(np.float32))
+    sparse = pre.transform(df, output="sparse")
+    assert sparse.format == "csr" and sparse.dtype == np.float32
+    assert np.array_equal(sparse.toarray(), dense)
+    # Numeric values plus one entry per non-dropped category, in column order
+    n_num = len(pre.num_cols)
+    assert sparse.nnz == len(df) * n_num + np.count_nonzero(dense[:, n_num:])
+    assert sparse.has_sorted_indices
+    assert list(pre.get_feature_names_out()) == list(expected.columns)
+
+    # copy=False writes the encoded columns into the input frame
+    inplace = df.copy()
+    assert np.array_equal(pre.transform(inplace, copy=False).to_numpy(), expected.to_numpy())
+    assert "device_id_freq" in inplace.columns and "device_id_freq" not in df.columns
+    print("✅ test_transform_array_outputs passed.")
+
+def test_transform_without_cached_tables():
+    # A preprocessor pickled before the scoring tables were cached has no scoring_tables attribute
+    df = make_fraud_frame()
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, [0, 1, 0, 1])
+    expected = pre.transform(df)
+    del pre.scoring_tables
+
+    frame = pre.transform(df)
+    assert list(frame.columns) == list(expected.columns)
+    assert np.array_equal(frame.to_numpy(), expected.to_numpy())
+    assert list(pre.get_feature_names_out()) == list(expected.columns)
+    # Array outputs compile the tables on first use
+    assert np.array_equal(pre.transform(df, output="float32"), expected.to_numpy().astype(np.float32))
+    assert pre.scoring_tables is not None
+    print("✅ test_transform_without_cached_tables passed.")
+
 if __name__ == "__main__":
-    test_fraud_preprocessor_fit_transform()
\ No newline at end of file
+    test_fraud_preprocessor_fit_transform()
+    test_transform_batch_matches_transform()
+    test_fit_chunks_matches_fit()
+    test_transform_array_outputs()
+    test_transform_without_cached_tables()
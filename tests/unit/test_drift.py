@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from src.core.DataTransformer import FraudPreprocessor
+from src.core.drift import DriftMonitor, population_stability_index
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def make_traffic(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.concat([make_fraud_frame()] * (n // 4), ignore_index=True)
+    df["purchase_value"] = rng.integers(10, 200, len(df))
+    return df
+
+def test_no_drift_on_reference_like_traffic():
+    df = make_traffic(4000)
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, np.arange(len(df)) % 2)
+    monitor = DriftMonitor.from_preprocessor(pre, flush_rows=500)
+
+    # Mixed batch types, as the scoring path sees them
+    traffic = make_traffic(2000, seed=1)
+    monitor.update(traffic.iloc[:1000])
+    monitor.update(traffic.iloc[1000:1500].to_dict(orient="records"))
+    monitor.update({col: traffic[col].iloc[1500:].tolist() for col in traffic.columns})
+    report = monitor.report()
+
+    assert report["n_rows"] == 2000
+    assert report["drifted"] == []
+    assert report["features"]["purchase_value"]["psi"] < 0.05
+    assert report["unseen_rate"] == {"device_id": 0.0, "country": 0.0}
+    assert abs(monitor.quantiles("purchase_value", (0.5,))[0.5] - traffic["purchase_value"].median()) < 10
+    print("✅ test_no_drift_on_reference_like_traffic passed.")
+
+def test_shift_and_unseen_categories_are_flagged():
+    df = make_traffic(4000)
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, np.arange(len(df)) % 2)
+    monitor = DriftMonitor.from_preprocessor(pre)
+
+    traffic = make_traffic(1000, seed=2)
+    traffic["purchase_value"] += 150
+    traffic.loc[:499, "country"] = "FR"
+    traffic.loc[:99, "browser"] = "opera"
+    monitor.update(traffic)
+    report = monitor.report()
+
+    assert {"purchase_value", "country_encoded", "browser"} <= set(report["drifted"])
+    assert report["unseen_rate"]["country"] == 0.5
+    assert report["features"]["browser"]["unseen_rate"] == 0.1
+    # Unknown countries are binned at the global fraud rate the model receives
+    assert report["features"]["country_encoded"]["psi"] > 0.2
+    print("✅ test_shift_and_unseen_categories_are_flagged passed.")
+
+def test_sampling_keeps_every_kth_row():
+    df = make_traffic(400)
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, np.arange(len(df)) % 2)
+    monitor = DriftMonitor.from_preprocessor(pre, sample_every=10)
+    records = df.to_dict(orient="records")
+    for i in range(0, len(records), 7):
+        monitor.update(records[i:i + 7])
+    report = monitor.report()
+    assert report["n_rows"] == 40 and report["sample_every"] == 10
+    assert report["unseen_rate"]["device_id"] == 0.0
+    print("✅ test_sampling_keeps_every_kth_row passed.")
+
+def test_reference_travels_with_exported_state():
+    df = make_traffic(400)
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, np.arange(len(df)) % 2)
+    meta, arrays = pre.export_state()
+    restored = FraudPreprocessor.from_state(meta, arrays)
+    assert restored.reference_profile == pre.reference_profile
+    assert population_stability_index([0.5, 0.5], [0.5, 0.5]) == 0.0
+    print("✅ test_reference_travels_with_exported_state passed.")
+
+def test_unseen_keys_flagged_on_fit_chunks_preprocessor():
+    df = make_traffic(4000)
+    df["class"] = np.arange(len(df)) % 2
+    pre = FraudPreprocessor(mode="fraud_data").fit_chunks([df.iloc[:100], df.iloc[100:]])
+    # The reference covers all chunks and the encoded columns
+    assert pre.reference_profile["n_rows"] == len(df)
+    assert {"device_id_freq", "country_encoded"} <= set(pre.reference_profile["numeric"])
+    # A bounded sample still draws from every chunk
+    shifted = df.copy()
+    shifted.loc[2000:, "purchase_value"] += 1000
+    sampled = FraudPreprocessor(mode="fraud_data").fit_chunks([shifted.iloc[:2000], shifted.iloc[2000:]],
+                                                              reference_rows=500)
+    spec = sampled.reference_profile["numeric"]["purchase_value"]
+    assert spec["min"] < 200 and spec["max"] > 1000
+
+    traffic = make_traffic(1000, seed=3)
+    traffic["device_id"] = "dev_new"
+    traffic["country"] = "FR"
+    monitor = DriftMonitor.from_preprocessor(pre)
+    monitor.update(traffic)
+    report = monitor.report()
+    assert report["unseen_rate"] == {"device_id": 1.0, "country": 1.0}
+    assert {"device_id_freq", "country_encoded"} <= set(report["drifted"])
+
+    # Counted even without reference edges for the encoded columns
+    for col in ("device_id_freq", "country_encoded"):
+        del pre.reference_profile["numeric"][col]
+    monitor = DriftMonitor.from_preprocessor(pre)
+    monitor.update(traffic)
+    assert monitor.report()["unseen_rate"] == {"device_id": 1.0, "country": 1.0}
+    print("✅ test_unseen_keys_flagged_on_fit_chunks_preprocessor passed.")
+
+if __name__ == "__main__":
+    test_no_drift_on_reference_like_traffic()
+    test_shift_and_unseen_categories_are_flagged()
+    test_sampling_keeps_every_kth_row()
+    test_reference_travels_with_exported_state()
+    test_unseen_keys_flagged_on_fit_chunks_preprocessor()
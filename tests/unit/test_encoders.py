@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.encoders import CountMinFrequencyEncoder, FrequencyEncoder, SmoothedTargetEncoder, _CountingEncoder
+from src.core.DataTransformer import FraudPreprocessor
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def test_online_encoders_match_batch_statistics():
+    keys = pd.Series(["a", "b", "a", "c", "a", "b"])
+    y = pd.Series([1, 0, 0, 1, 1, 0])
+
+    freq = FrequencyEncoder().partial_fit(keys[:2]).partial_fit(keys[2:])
+    target = SmoothedTargetEncoder().partial_fit(keys[:4], y[:4]).partial_fit(keys[4:], y[4:])
+    assert freq.to_dict() == keys.value_counts(normalize=True).to_dict()
+    assert target.to_dict() == y.groupby(keys).mean().to_dict()
+    assert target.prior == y.mean()
+    assert np.array_equal(target.lookup(["c", "zz"], default=-1.0), [1.0, -1.0])
+
+    # Smoothing pulls the single-row key "c" towards the prior
+    smoothed = SmoothedTargetEncoder(smoothing=2.0).partial_fit(keys, y)
+    assert smoothed["c"] == (1 + 2.0 * y.mean()) / (1 + 2.0)
+
+    # Decay halves the weight of the first batch before the second is added
+    decayed = FrequencyEncoder(decay=0.5).partial_fit(["a", "a"]).partial_fit(["b"])
+    assert decayed["a"] == decayed["b"] == 0.5
+    print("✅ test_online_encoders_match_batch_statistics passed.")
+
+def test_preprocessor_partial_fit_matches_full_fit():
+    df = make_fraud_frame()
+    y = pd.Series([0, 1, 0, 1])
+    full = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    online = FraudPreprocessor(mode="fraud_data").fit(df.iloc[:2], y.iloc[:2])
+    online.partial_fit(df.iloc[2:], y.iloc[2:])
+    assert online.device_freq_map == full.device_freq_map
+    assert online.country_fraud_map == full.country_fraud_map
+    assert online.global_fraud_rate == full.global_fraud_rate
+    print("✅ test_preprocessor_partial_fit_matches_full_fit passed.")
+
+def test_key_lookups_do_not_encode_every_key():
+    class NoFullPass(SmoothedTargetEncoder):
+        @property
+        def values_(self):
+            raise AssertionError("single-key access must not encode every key")
+
+    keys = pd.Series(["a", "b", "a", "c"])
+    y = pd.Series([1, 0, 0, 1])
+    encoder = NoFullPass(smoothing=1.0).partial_fit(keys, y)
+    expected = SmoothedTargetEncoder(smoothing=1.0).partial_fit(keys, y).to_dict()
+    assert {key: encoder[key] for key in encoder} == expected
+    assert encoder.get("zz", -1.0) == -1.0 and "a" in encoder
+    assert np.allclose(encoder.lookup(["c", "zz", None], -1.0), [expected["c"], -1.0, -1.0])
+    with pytest.raises(TypeError):
+        _CountingEncoder()
+    print("✅ test_key_lookups_do_not_encode_every_key passed.")
+
+def test_count_min_encoder_bounds():
+    rng = np.random.default_rng(0)
+    keys = pd.Series(np.char.add("dev", rng.zipf(1.5, 20000).astype(str)))
+    exact = FrequencyEncoder().partial_fit(keys)
+    sketch = CountMinFrequencyEncoder(top_k=50, memory_mb=0.01)
+    sketch.partial_fit(keys[:10000]).partial_fit(keys[10000:])
+
+    expected = exact.lookup(keys, 0.0)
+    estimated = sketch.lookup(keys, 0.0)
+    assert len(sketch.heavy) == 50
+    assert np.all(estimated >= expected - 1e-12)  # never underestimates
+    assert np.mean(estimated - expected) <= sketch.epsilon
+    top = keys.value_counts().index[0]
+    assert sketch.get(top) == exact[top]  # heavy hitters are exact
+    print("✅ test_count_min_encoder_bounds passed.")
+
+def test_count_min_encoder_survives_long_decay():
+    sketch = CountMinFrequencyEncoder(top_k=1, memory_mb=0.01, decay=0.9)
+    for _ in range(2000):
+        sketch.partial_fit(["a", "a", "b"])
+
+    assert np.all(np.isfinite(sketch.sketch)) and np.isfinite(sketch._total)
+    assert all(np.isfinite(v) for v in sketch.heavy.values())
+    # "a" from the exact table, "b" from the sketch: the steady-state frequencies
+    assert np.allclose(sketch.lookup(["a", "b"], 0.0), [2 / 3, 1 / 3], rtol=1e-4)
+    print("✅ test_count_min_encoder_survives_long_decay passed.")
+
+if __name__ == "__main__":
+    test_online_encoders_match_batch_statistics()
+    test_preprocessor_partial_fit_matches_full_fit()
+    test_key_lookups_do_not_encode_every_key()
+    test_count_min_encoder_bounds()
+    test_count_min_encoder_survives_long_decay()
@@ -0,0 +1,34 @@
+import numpy as np
+from sklearn.metrics import (
+    average_precision_score, classification_report, f1_score, precision_recall_curve, roc_auc_score, roc_curve,
+)
+from src.utils.evaluation import ScoreEvaluator, classification_report_text, confusion_counts
+from src.utils.training_and_evaluation_utils import evaluate_model
+
+def test_score_evaluator_matches_sklearn():
+    rng = np.random.default_rng(0)
+    y = (rng.random(2000) < 0.1).astype(int)
+    scores = np.round(rng.random(2000) + 0.3 * y, 2)  # rounded so there are ties
+    y_pred = (scores > 0.5).astype(int)
+    evaluator = ScoreEvaluator(y, scores)
+
+    fpr, tpr, thresholds = roc_curve(y, scores, drop_intermediate=False)
+    assert all(np.allclose(a, b) for a, b in zip(evaluator.roc_curve(), (fpr, tpr, thresholds)))
+    assert all(np.allclose(a, b) for a, b in zip(evaluator.pr_curve(), precision_recall_curve(y, scores)))
+    assert np.isclose(evaluator.roc_auc(), roc_auc_score(y, scores))
+    assert np.isclose(evaluator.average_precision(), average_precision_score(y, scores))
+    assert evaluator.confusion_at(0.51) == confusion_counts(y, y_pred)
+    assert classification_report_text(*confusion_counts(y, y_pred)) == classification_report(y, y_pred)
+
+    # The sweep's cost-optimal point is the brute-force optimum over all thresholds
+    best = evaluator.operating_points(cost_fp=1, cost_fn=20)["min_cost"]
+    brute = min((1 * fp + 20 * fn, t) for t in np.unique(scores)
+                for _, fp, fn, _ in [confusion_counts(y, scores >= t)])
+    assert best["cost"] == brute[0]
+
+    metrics = evaluate_model(y, y_pred, scores, plot=False)
+    assert np.isclose(metrics["f1"], f1_score(y, y_pred))
+    print("✅ test_score_evaluator_matches_sklearn passed.")
+
+if __name__ == "__main__":
+    test_score_evaluator_matches_sklearn()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.explainer import ReasonCodeExplainer, feature_groups
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def make_model():
+    df = pd.concat([make_fraud_frame()] * 50, ignore_index=True)
+    rng = np.random.default_rng(0)
+    df["purchase_value"] = rng.integers(10, 500, len(df))
+    y = ((df["browser"] == "safari") | (df["purchase_value"] > 400)).astype(int)
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("gbm")
+    trainer.model.set_params(n_estimators=20)
+    trainer.train(pre.transform(df, output="float32"), y)
+    return df, pre, trainer
+
+def test_feature_groups_map_back_to_original_columns():
+    _, pre, _ = make_model()
+    groups, group_of = feature_groups(pre)
+    assert len(group_of) == len(pre.get_feature_names_out())
+    for col in ("source", "browser", "sex", "device_id", "country"):
+        assert col in groups
+    assert "device_id_freq" not in groups
+    print("✅ test_feature_groups_map_back_to_original_columns passed.")
+
+def test_reason_codes_and_cache():
+    df, pre, trainer = make_model()
+    X = pre.transform(df, output="float32")
+    explainer = ReasonCodeExplainer(trainer.model, pre, top_k=2, batch_size=64)
+
+    grouped = explainer.contributions(X)
+    margin = trainer.model.get_booster().predict(xgb.DMatrix(X), output_margin=True)
+    assert np.allclose(grouped.sum(axis=1) + explainer.expected_value, margin, atol=1e-4)
+    assert explainer.misses == len(X) and explainer.cache_info()["size"] < len(X)
+
+    reasons = explainer.explain(X)
+    assert explainer.hits == len(X)
+    assert list(reasons.columns) == ["reason_1", "contribution_1", "reason_2", "contribution_2", "margin"]
+    assert set(reasons["reason_1"]) <= set(explainer.groups)
+    assert (reasons["contribution_1"] >= reasons["contribution_2"]).all()
+    # Expensive purchases on otherwise legitimate devices are flagged for their value
+    expensive = (df["purchase_value"] > 400) & (df["browser"] != "safari")
+    assert (reasons.loc[expensive, "reason_1"] == "purchase_value").all()
+
+    flagged = explainer.explain_flagged(df)
+    assert (flagged["fraud_probability"] >= 0.5).all()
+    assert len(flagged) == (trainer.predict_proba(X) >= 0.5).sum()
+    print("✅ test_reason_codes_and_cache passed.")
+
+def test_process_pool_matches_in_process():
+    df, pre, trainer = make_model()
+    X = pre.transform(df, output="float32")
+    expected = ReasonCodeExplainer(trainer.model, pre, cache_size=0).contributions(X)
+    with ReasonCodeExplainer(trainer.model, pre, n_jobs=2, batch_size=16, cache_size=0) as explainer:
+        assert np.allclose(explainer.contributions(X), expected)
+    print("✅ test_process_pool_matches_in_process passed.")
+
+if __name__ == "__main__":
+    test_feature_groups_map_back_to_original_columns()
+    test_reason_codes_and_cache()
+    test_process_pool_matches_in_process()
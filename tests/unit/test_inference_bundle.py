@@ -0,0 +1,35 @@
+import tempfile
+import numpy as np
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.models.native import NativeModel
+from src.services.inference_bundle import save_bundle, load_bundle
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def test_bundle_round_trip():
+    df = make_fraud_frame()
+    y = [0, 1, 0, 1]
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(pre.transform(df), y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_bundle(f"{tmp}/model.bundle", pre, trainer, model_version="v1")
+        bundle = load_bundle(f"{tmp}/model.bundle")
+
+        records = df.to_dict(orient="records")
+        assert bundle.model_version == "v1"
+        assert bundle.feature_names == list(pre.transform(df).columns)
+        assert np.array_equal(bundle.preprocessor.transform_batch(records), pre.transform(df).to_numpy())
+        assert np.array_equal(bundle.score(records), trainer.predict_proba(pre.transform(df)))
+        assert bundle.load_time_s is not None
+
+        # Same scores from the native artifact, loaded without unpickling
+        native = load_bundle(f"{tmp}/model.bundle", native=True)
+        assert isinstance(native.trainer.model, NativeModel)
+        assert np.allclose(native.score(records), bundle.score(records))
+        del bundle, native
+    print("✅ test_bundle_round_trip passed.")
+
+if __name__ == "__main__":
+    test_bundle_round_trip()
@@ -0,0 +1,32 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from src.core.ip_index import IpRangeIndex, map_ip_to_country
+from src.utils.utils import map_ip_to_city
+
+def test_ip_index_matches_merge_asof():
+    ip_map = pd.DataFrame({
+        "lower_bound_ip_address": [200.0, 10.0, 500.0],
+        "upper_bound_ip_address": [300, 50, 600],
+        "country": ["UK", "US", "CA"]
+    })
+    # Unsorted input, fractional IPs, a gap, an IP past the last range and a NaN
+    fraud = pd.DataFrame({"ip_address": [550.0, 12.5, 50.5, 100.0, 299.9, 9.0, 700.0, np.nan]})
+
+    index = IpRangeIndex.from_frame(ip_map)
+    mapped = map_ip_to_country(fraud, index)
+    assert mapped["country"].tolist() == ["CA", "US", "Unknown", "Unknown", "UK", "Unknown", "Unknown", "Unknown"]
+
+    merged = map_ip_to_city(fraud.dropna(), ip_map)
+    assert sorted(mapped["country"].iloc[:-1]) == sorted(merged["country"])
+    assert index.lookup_one(299.9) == "UK" and index.lookup_one(50.5) == "Unknown"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(f"{tmp}/ip_index")
+        loaded = IpRangeIndex.load(f"{tmp}/ip_index")
+        assert np.array_equal(loaded.lookup(fraud["ip_address"]), mapped["country"].to_numpy())
+        del loaded
+    print("✅ test_ip_index_matches_merge_asof passed.")
+
+if __name__ == "__main__":
+    test_ip_index_matches_merge_asof()
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from src.models.model_trainer import ModelTrainer
+
+def make_data(n_rows, seed, flip=False):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 5)), columns=[f"f{i}" for i in range(5)])
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=n_rows) > 1.0).astype(int)
+    return X, (1 - y) if flip else y
+
+def test_train_incremental_continues_previous_model():
+    X_old, y_old = make_data(3000, 0)
+    X_new, y_new = make_data(1000, 1)
+    X_val, y_val = make_data(1000, 2)
+
+    trainer = ModelTrainer("gbm")
+    trainer.model.set_params(n_estimators=30, max_depth=3, learning_rate=0.1)
+    trainer.train(X_old, y_old)
+    report = trainer.train_incremental(X_new, y_new, X_val, y_val, max_rounds=10)
+    assert report["mode"] == "incremental" and report["rows"] == 1000
+    # The new trees are added to the previous booster
+    assert trainer.model.get_booster().num_boosted_rounds() == 40
+    assert report["auc"] == report["incremental_auc"] >= report["previous_auc"] - 0.005
+
+    trainer = ModelTrainer("logistic_regression")
+    trainer.model.set_params(solver="liblinear")
+    trainer.train(X_old, y_old)
+    calibrated_point = trainer.calibrate(X_val, y_val)
+    report = trainer.train_incremental(X_new, y_new, X_val, y_val)
+    assert calibrated_point is not None and report["mode"] == "incremental"
+    assert trainer.model.solver == "liblinear"
+    print("✅ test_train_incremental_continues_previous_model passed.")
+
+def test_incremental_logistic_update_depends_on_previous_model():
+    X_new, y_new = make_data(1000, 1)
+    X_val, y_val = make_data(1000, 2)
+    refit = ModelTrainer("logistic_regression")
+    refit.train(X_new, y_new)
+
+    updated = []
+    for seed, flip in ((0, False), (4, True)):
+        X_old, y_old = make_data(3000, seed, flip=flip)
+        trainer = ModelTrainer("logistic_regression")
+        trainer.train(X_old, y_old)
+        previous = trainer.model.coef_.copy()
+        trainer.train_incremental(X_new, y_new, X_val, y_val, max_auc_drop=1.0)
+        updated.append(trainer.model.coef_)
+        # A bounded step from the previous coefficients, not the refit on the batch alone
+        assert np.linalg.norm(trainer.model.coef_ - previous) < np.linalg.norm(refit.model.coef_ - previous)
+    assert not np.allclose(updated[0], updated[1], atol=0.05)
+    print("✅ test_incremental_logistic_update_depends_on_previous_model passed.")
+
+def test_train_incremental_gate():
+    X_old, y_old = make_data(3000, 0)
+    X_val, y_val = make_data(1000, 2)
+    # A batch with inverted labels must not replace the model
+    X_bad, y_bad = make_data(3000, 3, flip=True)
+
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(X_old, y_old)
+    previous = trainer.model
+    report = trainer.train_incremental(X_bad, y_bad, X_val, y_val)
+    assert report["mode"] == "kept_previous" and trainer.model is previous
+    assert report["incremental_auc"] < report["previous_auc"] and report["auc"] == report["previous_auc"]
+
+    # A fallback function is only called when the gate rejects the update
+    calls = []
+
+    def fallback():
+        calls.append(1)
+        return {"X_train": pd.concat([X_old, X_val]), "y_train": pd.concat([y_old, y_val])}
+
+    report = trainer.train_incremental(X_bad, y_bad, X_val, y_val, fallback=fallback)
+    assert report["mode"] == "full_retrain" and "full_seconds" in report and calls == [1]
+    assert report["auc"] > report["incremental_auc"]
+    report = trainer.train_incremental(X_val, y_val, X_val, y_val, fallback=fallback)
+    assert report["mode"] == "incremental" and calls == [1]
+
+    # The previous model is judged on its own features when the update changed them
+    report = trainer.train_incremental(X_val, y_val, X_val, y_val, max_auc_drop=1.0, X_val_previous=-X_val)
+    assert report["previous_auc"] < 0.5
+    print("✅ test_train_incremental_gate passed.")
+
+if __name__ == "__main__":
+    test_train_incremental_continues_previous_model()
+    test_incremental_logistic_update_depends_on_previous_model()
+    test_train_incremental_gate()
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from xgboost import XGBClassifier
+from src.models.calibration import fit_calibration
+from src.models.model_trainer import ModelTrainer
+from src.models.native import export_model, load_model
+
+def make_data(n_rows=4000):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 6)), columns=[f"f{i}" for i in range(6)])
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=n_rows) > 1.0).astype(int)
+    return X, y
+
+def test_native_export_matches_estimators():
+    X, y = make_data()
+    X_missing = X.copy()
+    X_missing.iloc[::7, 3] = np.nan
+
+    # Early-stopped booster, so only the best iteration's trees may be used
+    booster = XGBClassifier(eval_metric="logloss", n_estimators=200, early_stopping_rounds=5)
+    booster.fit(X_missing[:3000], y[:3000], eval_set=[(X_missing[3000:], y[3000:])], verbose=False)
+    calibrated, _ = fit_calibration(booster, X_missing[3000:], y[3000:], method="platt")
+
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model, X_eval in (("xgb", calibrated, X_missing), ("lr", trainer.model, X)):
+            export_model(model, f"{tmp}/{name}")
+            native = load_model(f"{tmp}/{name}")
+            assert np.allclose(native.predict_proba(X_eval), model.predict_proba(X_eval), atol=1e-6)
+            assert np.array_equal(native.predict(X_eval), model.predict(X_eval))
+
+        # The xgboost engine scores booster.ubj directly and matches exactly
+        engine = load_model(f"{tmp}/xgb", engine="xgboost")
+        assert np.array_equal(engine.predict_proba(X_missing), calibrated.predict_proba(X_missing))
+        assert load_model(f"{tmp}/xgb").threshold == calibrated.threshold
+
+        trainer.export_model(f"{tmp}/trainer")
+        assert os.path.exists(f"{tmp}/trainer/coef.npy")
+    print("✅ test_native_export_matches_estimators passed.")
+
+def test_native_loader_skips_sklearn():
+    X, y = make_data(1000)
+    model = XGBClassifier(eval_metric="logloss", n_estimators=20).fit(X, y)
+    with tempfile.TemporaryDirectory() as tmp:
+        export_model(model, tmp)
+        code = ("import sys, numpy as np\n"
+                "from src.models.native import load_model\n"
+                f"p = load_model({tmp!r}).predict_proba(np.zeros((1, 6)))\n"
+                "print(sorted(m for m in ('sklearn', 'xgboost', 'pandas') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        assert out.stdout.strip() == "[]"
+    print("✅ test_native_loader_skips_sklearn passed.")
+
+if __name__ == "__main__":
+    test_native_export_matches_estimators()
+    test_native_loader_skips_sklearn()
@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+import tempfile
+import numpy as np
+from src.utils.profiling import SampledLogger, profiled, profiler, stage
+
+@profiled("transform", rows="X")
+def double(X, factor=2):
+    return np.asarray(X) * factor
+
+@profiled("load", rows="result")
+def load(n):
+    return list(range(n))
+
+def test_disabled_profiler_records_nothing():
+    profiler.disable()
+    profiler.reset()
+    with stage("fit", rows=10) as timed:
+        timed.set_rows(20)
+    assert double([1, 2]).tolist() == [2, 4]
+    assert profiler.records == []
+    print("✅ test_disabled_profiler_records_nothing passed.")
+
+def test_nested_stages_and_exports():
+    profiler.reset()
+    profiler.enable()
+    try:
+        with stage("train") as outer:
+            outer.set_rows(5)
+            with stage("sample"):
+                block = np.ones(2**20)  # 8 MiB
+                del block
+            double(np.zeros((7, 3)))
+            load(4)
+    finally:
+        profiler.disable()
+
+    by_stage = {r["stage"]: r for r in profiler.records}
+    assert set(by_stage) == {"train", "sample", "transform", "load"}
+    assert by_stage["sample"]["peak_mib"] >= 7.9 and by_stage["train"]["peak_mib"] >= 7.9
+    assert by_stage["train"]["depth"] == 0 and by_stage["sample"]["depth"] == 1
+    assert by_stage["transform"]["rows"] == 7 and by_stage["load"]["rows"] == 4 and by_stage["train"]["rows"] == 5
+    assert by_stage["train"]["wall_s"] >= by_stage["sample"]["wall_s"]
+    assert profiler.summary()["transform"]["calls"] == 1
+
+    # Records from another process's profiler are re-based onto this timeline
+    profiler.merge([dict(by_stage["load"], start_s=0.0, pid=1)], origin=profiler._origin + 1.0)
+    assert profiler.records[-1]["start_s"] == 1.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler.to_json(os.path.join(tmp, "run.json"))
+        profiler.to_chrome_trace(os.path.join(tmp, "run.trace.json"))
+        with open(os.path.join(tmp, "run.trace.json")) as f:
+            events = json.load(f)["traceEvents"]
+    assert len(events) == 5 and all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    profiler.reset()
+    print("✅ test_nested_stages_and_exports passed.")
+
+def test_sampled_logger_logs_every_nth_call(caplog):
+    sampled = SampledLogger(logging.getLogger("test_profiling"), every=10)
+    with caplog.at_level(logging.INFO, logger="test_profiling"):
+        for i in range(25):
+            sampled.info("scored row %d", i)
+    assert [r.getMessage() for r in caplog.records] == [
+        "scored row 0 (call 1, logged every 10)",
+        "scored row 10 (call 11, logged every 10)",
+        "scored row 20 (call 21, logged every 10)",
+    ]
+    print("✅ test_sampled_logger_logs_every_nth_call passed.")
+
+if __name__ == "__main__":
+    test_disabled_profiler_records_nothing()
+    test_nested_stages_and_exports()
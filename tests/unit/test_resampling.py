@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.neighbors import NearestNeighbors
+from src.core.DataTransformer import FraudPreprocessor
+from src.core.resampling import MiniBatchSMOTE, balanced_sample_weight, partitioned_knn
+
+def test_minibatch_smote_and_weights():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(1000, 4)), columns=list("abcd"))
+    y = pd.Series((rng.random(1000) < 0.05).astype(int), name="Class")
+
+    # Exact neighbours below the partition size
+    minority = X[y == 1].to_numpy(dtype=np.float32)
+    expected = NearestNeighbors(n_neighbors=6).fit(minority).kneighbors(minority, return_distance=False)[:, 1:]
+    assert all(set(a) == set(b) for a, b in zip(partitioned_knn(minority, 5), expected))
+
+    smote = MiniBatchSMOTE(batch_size=100)
+    X_res, y_res = smote.fit_resample(X, y)
+    assert list(X_res.columns) == list("abcd") and X_res.dtypes.eq(np.float32).all()
+    assert y_res.sum() == (y == 0).sum() and len(X_res) == 2 * (y == 0).sum()
+    # Synthetic rows stay inside the minority bounding box (interpolations between minority points)
+    synthetic = X_res.to_numpy()[len(X):]
+    assert (synthetic >= minority.min(axis=0) - 1e-6).all() and (synthetic <= minority.max(axis=0) + 1e-6).all()
+    # Lazy batches hold the same rows as the materialized result
+    batches = list(smote.iter_batches(X, y))
+    assert max(len(b) for b, _ in batches) <= 100
+    assert np.array_equal(np.vstack([b for b, _ in batches]), X_res.to_numpy())
+
+    weights = balanced_sample_weight(y)
+    assert np.isclose(weights[y == 1].sum(), (y == 0).sum())
+    pre = FraudPreprocessor(mode="creditcard_data", sampler="weights")
+    X_w, y_w = pre.sample(X, y)
+    assert len(X_w) == len(X) and np.array_equal(pre.sample_weight(y_w), weights)
+    assert FraudPreprocessor(mode="creditcard_data").sample_weight(y) is None
+    print("✅ test_minibatch_smote_and_weights passed.")
+
+def test_minibatch_smote_with_too_few_minority_rows():
+    X = np.arange(20, dtype=np.float64).reshape(10, 2)
+    for n_minority in (0, 1):
+        y = np.zeros(10, dtype=int)
+        y[:n_minority] = 1
+        with pytest.raises(ValueError, match="at least 2 minority rows"):
+            MiniBatchSMOTE().fit_resample(X, y)
+
+    # Two rows are enough, and an already balanced set needs no neighbours at all
+    y = np.array([1, 1] + [0] * 8)
+    X_res, y_res = MiniBatchSMOTE().fit_resample(X, y)
+    assert y_res.sum() == 8 and ((X_res[10:] >= 0) & (X_res[10:] <= 3)).all()
+    X_res, y_res = MiniBatchSMOTE().fit_resample(X[:2], np.array([1, 0]))
+    assert len(X_res) == 2
+    print("✅ test_minibatch_smote_with_too_few_minority_rows passed.")
+
+if __name__ == "__main__":
+    test_minibatch_smote_and_weights()
+    test_minibatch_smote_with_too_few_minority_rows()
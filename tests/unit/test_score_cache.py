@@ -0,0 +1,93 @@
+import tempfile
+import time
+import numpy as np
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import load_bundle, save_bundle
+from src.services.score_cache import CachedScorer, DiskCacheBackend, ScoreCache, fingerprint
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def test_fingerprint_and_lru_ttl():
+    fields = ["amount", "country"]
+    key = fingerprint({"amount": 100, "country": "US"}, fields, "v1")
+    # Fields outside the model input and the numeric type do not matter; the model version does
+    assert fingerprint({"amount": np.int64(100), "country": "US", "request_id": "r2"}, fields, "v1") == key
+    assert fingerprint({"amount": 100.0, "country": "US"}, fields, "v1") == key
+    assert fingerprint({"amount": 101, "country": "US"}, fields, "v1") != key
+    assert fingerprint({"amount": 100, "country": "US"}, fields, "v2") != key
+
+    cache = ScoreCache(max_size=2, ttl=0.2)
+    cache.set_many(["a", "b"], [0.1, 0.2])
+    assert cache.get_many(["a"]) == [0.1]
+    cache.set_many(["c"], [0.3])
+    # "b" was the least recently used entry
+    assert cache.get_many(["a", "b", "c"]) == [0.1, None, 0.3]
+    time.sleep(0.25)
+    assert cache.get_many(["a", "c"]) == [None, None]
+    info = cache.cache_info()
+    assert (info["hits"], info["misses"], info["evictions"], info["expirations"]) == (3, 3, 1, 2)
+    assert info["size"] == 0
+    print("✅ test_fingerprint_and_lru_ttl passed.")
+
+def test_cached_scorer_shares_and_invalidates():
+    df = make_fraud_frame()
+    y = [0, 1, 0, 1]
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(pre.transform(df).to_numpy(), y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_bundle(f"{tmp}/v1.bundle", pre, trainer, model_version="v1")
+        save_bundle(f"{tmp}/v2.bundle", pre, trainer, model_version="v2")
+        bundle = load_bundle(f"{tmp}/v1.bundle")
+        scored = []
+        score = bundle.score
+        bundle.score = lambda records: scored.append(len(records)) or score(records)
+
+        records = df.to_dict(orient="records")
+        retries = records + [dict(records[0], request_id="retry")]
+        worker_a = CachedScorer(bundle, ScoreCache(backend=DiskCacheBackend(f"{tmp}/cache")))
+        assert np.allclose(worker_a.score(retries), score(retries))
+        assert np.allclose(worker_a.score(records), score(records))
+        # The retry inside the batch is scored once and the second call never reaches the model
+        assert scored == [4]
+        assert worker_a.cache.cache_info()["hits"] == 4 and worker_a.cache.cache_info()["misses"] == 5
+
+        # A second worker on the same cache directory reuses the first one's scores
+        worker_b = CachedScorer(bundle, ScoreCache(backend=DiskCacheBackend(f"{tmp}/cache")))
+        assert np.allclose(worker_b.score(records), score(records))
+        assert scored == [4] and worker_b.cache.cache_info()["backend_hits"] == 4
+
+        # Loading a new bundle drops the old version's entries, in process and on disk
+        worker_b.set_bundle(load_bundle(f"{tmp}/v2.bundle"))
+        assert worker_b.cache.cache_info()["size"] == 0
+        assert len(worker_b.cache.backend.cache) == 1
+        worker_a.cache.backend.close(), worker_b.cache.backend.close()
+        del bundle, worker_a, worker_b
+    print("✅ test_cached_scorer_shares_and_invalidates passed.")
+
+def test_disk_backend_evicts_only_older_versions():
+    with tempfile.TemporaryDirectory() as tmp:
+        worker_a, worker_b = DiskCacheBackend(f"{tmp}/cache"), DiskCacheBackend(f"{tmp}/cache")
+        # v1 is only ever written (never bound) by this worker; it is still recorded for eviction
+        worker_a.set_many(["a1"], [0.1], "v1")
+        time.sleep(0.01)
+        assert worker_b.invalidate("v2") == 1
+        worker_b.set_many(["b2"], [0.2], "v2")
+
+        # Rolling reload: a worker still on v1 binds after v2 and must not evict v2's entries
+        old = ScoreCache(backend=worker_a)
+        old.bind("v1")
+        old.set_many(["a1"], [0.1])
+        assert worker_b.get_many(["b2", "a1"]) == [0.2, 0.1]
+        # v1 entries written after the v2 bind are evicted by the next v2 bind
+        new = ScoreCache(backend=worker_b)
+        new.bind("v2")
+        assert worker_b.get_many(["b2", "a1"]) == [0.2, None]
+        worker_a.close(), worker_b.close()
+    print("✅ test_disk_backend_evicts_only_older_versions passed.")
+
+if __name__ == "__main__":
+    test_fingerprint_and_lru_ttl()
+    test_cached_scorer_shares_and_invalidates()
+    test_disk_backend_evicts_only_older_versions()
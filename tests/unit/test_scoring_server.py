@@ -0,0 +1,122 @@
+import asyncio
+import tempfile
+import numpy as np
+from aiohttp.test_utils import TestClient, TestServer
+from src.core.DataTransformer import FraudPreprocessor
+from src.models.model_trainer import ModelTrainer
+from src.services.inference_bundle import load_bundle, save_bundle
+from src.services.score_cache import ScoreCache
+from src.services.scoring_server import MicroBatcher, create_app
+from tests.unit.test_datatransformer import make_fraud_frame
+
+def test_micro_batcher_groups_concurrent_requests():
+    batches = []
+
+    def score_fn(records):
+        batches.append(len(records))
+        return [r["x"] * 2 for r in records]
+
+    async def run():
+        batcher = MicroBatcher(score_fn, max_batch_size=8, max_wait_ms=50, n_workers=1)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit({"x": i}) for i in range(20)))
+        await batcher.stop()
+        return results, batcher.metrics()
+
+    results, metrics = asyncio.run(run())
+    assert results == [2.0 * i for i in range(20)]
+    assert batches == [8, 8, 4]
+    assert metrics["requests"] == 20 and metrics["batch_size"]["count"] == 3
+    print("✅ test_micro_batcher_groups_concurrent_requests passed.")
+
+def test_micro_batcher_isolates_failing_records():
+    calls = []
+
+    def score_fn(records):
+        calls.append(len(records))
+        if any(r["x"] < 0 for r in records):
+            raise ValueError("negative x")
+        return [r["x"] * 2 for r in records]
+
+    async def run():
+        batcher = MicroBatcher(score_fn, max_batch_size=8, max_wait_ms=50, n_workers=1)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit({"x": x}) for x in [1, 2, -1, 3]), return_exceptions=True)
+        await batcher.stop()
+        return results, batcher.metrics()
+
+    results, metrics = asyncio.run(run())
+    assert results[:2] == [2.0, 4.0] and results[3] == 6.0
+    assert isinstance(results[2], ValueError)
+    assert calls == [4, 1, 1, 1, 1]
+    assert metrics["requests"] == 3 and metrics["errors"] == 1
+    print("✅ test_micro_batcher_isolates_failing_records passed.")
+
+def test_scoring_app_matches_bundle_score():
+    df = make_fraud_frame()
+    y = [0, 1, 0, 1]
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(pre.transform(df).to_numpy(), y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_bundle(f"{tmp}/model.bundle", pre, trainer, model_version="v1")
+        bundle = load_bundle(f"{tmp}/model.bundle")
+        records = df.to_dict(orient="records")
+
+        async def run():
+            async with TestClient(TestServer(create_app(bundle, max_wait_ms=20, score_cache=ScoreCache()))) as client:
+                responses = await asyncio.gather(*(client.post("/score", json=r) for r in records))
+                bodies = [await r.json() for r in responses]
+                # Retried requests are answered from the score cache
+                retried = [await (await client.post("/score", json=r)).json() for r in records]
+                assert retried == bodies
+                bad = await client.post("/score", json={"age": 30})
+                metrics = await (await client.get("/metrics")).json()
+                drift = await (await client.get("/drift")).json()
+                return bodies, bad.status, metrics, drift
+
+        bodies, bad_status, metrics, drift = asyncio.run(run())
+        assert np.allclose([b["fraud_probability"] for b in bodies], bundle.score(records))
+        assert {b["model_version"] for b in bodies} == {"v1"}
+        assert bad_status == 400
+        assert metrics["requests"] == 2 * len(records)
+        assert metrics["score_cache"]["hits"] == len(records) and metrics["score_cache"]["model_version"] == "v1"
+        assert drift["n_rows"] == 2 * len(records) and drift["unseen_rate"]["country"] == 0.0
+        del bundle
+    print("✅ test_scoring_app_matches_bundle_score passed.")
+
+def test_scoring_app_rejects_only_the_bad_record_of_a_batch():
+    df = make_fraud_frame()
+    y = [0, 1, 0, 1]
+    pre = FraudPreprocessor(mode="fraud_data").fit(df, y)
+    trainer = ModelTrainer("logistic_regression")
+    trainer.train(pre.transform(df).to_numpy(), y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_bundle(f"{tmp}/model.bundle", pre, trainer, model_version="v1")
+        bundle = load_bundle(f"{tmp}/model.bundle")
+        records = df.to_dict(orient="records")
+        records.append(dict(records[0], browser="Opera"))
+
+        async def run():
+            app = create_app(bundle, max_batch_size=8, max_wait_ms=50, n_workers=1)
+            async with TestClient(TestServer(app)) as client:
+                responses = await asyncio.gather(*(client.post("/score", json=r) for r in records))
+                metrics = await (await client.get("/metrics")).json()
+                drift = await (await client.get("/drift")).json()
+                return [r.status for r in responses], metrics, drift
+
+        statuses, metrics, drift = asyncio.run(run())
+        assert statuses == [200, 200, 200, 200, 422]
+        assert metrics["requests"] == 4 and metrics["errors"] == 1
+        # The failed batch is rescored record by record but observed for drift once
+        assert drift["n_rows"] == len(records)
+        del bundle
+    print("✅ test_scoring_app_rejects_only_the_bad_record_of_a_batch passed.")
+
+if __name__ == "__main__":
+    test_micro_batcher_groups_concurrent_requests()
+    test_micro_batcher_isolates_failing_records()
+    test_scoring_app_matches_bundle_score()
+    test_scoring_app_rejects_only_the_bad_record_of_a_batch()
@@ -0,0 +1,36 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+from src.models.search import HalvingSearch
+from src.models.model_trainer import ModelTrainer
+
+def make_data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(0, 0.5, n) > 0.8).astype(int)
+    return X, y
+
+def test_halving_search_boosting_rounds_and_rows():
+    X, y = make_data()
+    grid = {"n_estimators": [20, 60], "max_depth": [2, 3], "learning_rate": [0.1, 0.3]}
+    search = HalvingSearch(XGBClassifier(eval_metric="logloss"), grid, n_jobs=1).fit(X, y)
+    # n_estimators is the budget, chosen by early stopping rather than searched
+    assert search.n_candidates_ == 4
+    assert 1 <= search.best_params_["n_estimators"] <= 60
+    assert {r["resource"] for r in search.cv_results_} <= set(range(1, 61))
+    assert search.best_score_ > 0.8
+    assert search.best_estimator_.predict_proba(X).shape == (len(X), 2)
+
+    # Non-boosting models get row budgets; rungs keep the best third
+    rows = HalvingSearch(LogisticRegression(), {"C": [0.01, 0.1, 1, 10]}, n_jobs=1).fit(X, y)
+    rungs = [r["rung"] for r in rows.cv_results_]
+    assert rungs.count(0) == 4 and rungs.count(rows.n_rungs_ - 1) == 1
+    assert rows.cv_results_[-1]["resource"] == len(y) // 2
+
+    trainer = ModelTrainer("logistic_regression")
+    result = trainer.train(X, y, param_grid={"C": [0.1, 1]}, search_type="halving", n_jobs=1)
+    assert trainer.model is result.best_estimator_
+    print("✅ test_halving_search_boosting_rounds_and_rows passed.")
+
+if __name__ == "__main__":
+    test_halving_search_boosting_rounds_and_rows()
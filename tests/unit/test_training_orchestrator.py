@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+from benchmarks.synthetic import make_creditcard_data, make_fraud_data
+from src.models.cascade import load_cascade
+from src.services.inference_bundle import load_bundle
+from src.services.training_orchestrator import TrainingOrchestrator
+
+def test_orchestrator_trains_every_dataset_model_pair():
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(f"{root}/data")
+        make_fraud_data(2000, fraud_rate=0.2).to_csv(f"{root}/data/fraud.csv", index=False)
+        make_creditcard_data(2000, fraud_rate=0.05).to_csv(f"{root}/data/cc.csv", index=False)
+        config = {
+            "datasets": {
+                "fraud": {"path": "data/fraud.csv", "mode": "fraud_data", "target": "class", "output_dir": "out/fraud",
+                          "suffix": "fraud", "mappings_path": "out/fraud/maps.json", "cache": False,
+                          "calibration": {"method": "isotonic", "cost_column": "purchase_value", "cost_fp": 10.0},
+                          "cascade": {"screen": "logistic_regression", "model": "xgboost"}},
+                "creditcard": {"path": "data/cc.csv", "mode": "creditcard_data", "target": "Class",
+                               "output_dir": "out/cc", "suffix": "creditcard", "cache": False,
+                               "models": ["logistic_regression"]},
+            },
+            "models": {
+                "logistic_regression": {"model": "logistic_regression", "search_type": "halving",
+                                        "param_grid": {"C": [0.1, 1]}},
+                "xgboost": {"model": "gbm", "param_grid": None},
+            },
+            "timings_path": "out/timings.json",
+        }
+        orchestrator = TrainingOrchestrator(config, root=root, n_cores=2)
+        records = orchestrator.run()
+
+        assert set(orchestrator.results) == {("fraud", "logistic_regression"), ("fraud", "xgboost"),
+                                             ("creditcard", "logistic_regression")}
+        for path in ["out/fraud/xgboost_fraud.pkl", "out/fraud/plots/roc_xgboost.png", "out/fraud/maps.json",
+                     "out/cc/logistic_regression_creditcard.pkl"]:
+            assert os.path.exists(f"{root}/{path}")
+        assert load_bundle(f"{root}/out/cc/logistic_regression_creditcard.bundle").score(
+            make_creditcard_data(5).drop(columns="Class").to_dict(orient="records")).shape == (5,)
+
+        assert load_bundle(f"{root}/out/fraud/xgboost_fraud.bundle").manifest["decision"]["calibration"] == "isotonic"
+        cascade = load_cascade(f"{root}/out/fraud/cascade_fraud.json")
+        assert cascade.report["test"]["escalation_rate"] == orchestrator.cascades["fraud"]["test"]["escalation_rate"]
+        stages = {r["stage"] for r in records}
+        assert {"load", "fit_preprocessor", "train", "calibrate", "predict", "evaluate_plot", "save_artifacts", "total"} <= stages
+        with open(f"{root}/out/timings.json") as f:
+            assert json.load(f)["stages"] == records
+    print("✅ test_orchestrator_trains_every_dataset_model_pair passed.")
+
+if __name__ == "__main__":
+    test_orchestrator_trains_every_dataset_model_pair()
@@ -1,6 +1,7 @@
+import glob
 import os
 import pandas as pd
-from src.utils.utils import load_data, clean_data
+from src.utils.utils import load_data, clean_data, load_data_chunks, clean_data_chunks
 
 def test_load_and_clean_data():
     # Create a small dummy CSV for testing
@@ -25,5 +26,79 @@ def test_load_and_clean_data():
     os.remove(test_csv)
     print("✅ test_load_and_clean_data passed.")
 
+def test_chunked_load_and_clean_data():
+    test_csv = "test_chunked_data.csv"
+    df = pd.DataFrame({
+        "A": [1, 2, 2, None, 1],
+        "B": ["x", "y", "y", "z", "x"],
+        "time": ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03", "2024-01-01"]
+    })
+    df.to_csv(test_csv, index=False)
+
+    # Duplicates span chunk boundaries (chunks of 2 rows)
+    chunks = list(clean_data_chunks(load_data_chunks(test_csv, chunksize=2), time_column=["time"]))
+    cleaned = pd.concat(chunks)
+    expected = clean_data(load_data(test_csv), time_column=["time"])
+    assert cleaned.shape[0] == 2
+    assert cleaned.equals(expected)
+
+    os.remove(test_csv)
+    print("✅ test_chunked_load_and_clean_data passed.")
+
+def test_clean_data_formats_and_stats():
+    df = pd.DataFrame({
+        "A": [1, 2, 2, 3, 1],
+        "B": ["x", "y", "y", None, "x"],
+        "time": ["27/03/2015 07:30", "28/03/2015 08:00", "28/03/2015 08:00", "29/03/2015 09:00", "27/03/2015 07:30"]
+    })
+    original = df.copy()
+
+    stats = {}
+    cleaned = clean_data(df, time_column=["time"], time_format="%d/%m/%Y %H:%M", stats=stats)
+    assert stats == {"rows_in": 5, "null_rows": 1, "duplicate_rows": 2, "rows_out": 2}
+    assert cleaned.index.tolist() == [0, 1]
+    assert cleaned["time"].tolist() == [pd.Timestamp("2015-03-27 07:30"), pd.Timestamp("2015-03-28 08:00")]
+    assert df.equals(original)  # the input is left untouched
+
+    # Epoch seconds, with the ISO format guessed from the first value
+    epoch = clean_data(pd.DataFrame({"time": ["2015-03-27 07:30:24", "1970-01-01 00:01:00"]}), ["time"], epoch=True)
+    assert epoch["time"].tolist() == [1427441424, 60]
+
+    # Nothing dropped: the result is still a copy, so edits do not reach the input
+    clean = pd.DataFrame({"A": [1.0, 2.0], "B": ["x", "y"]})
+    result = clean_data(clean)
+    result.loc[0, "A"] = 99.0
+    result["B"].to_numpy()[1] = "z"
+    assert clean["A"].tolist() == [1.0, 2.0] and clean["B"].tolist() == ["x", "y"]
+    print("✅ test_clean_data_formats_and_stats passed.")
+
+def test_load_data_cache():
+    test_csv = "test_cached_data.csv"
+    pd.DataFrame({
+        "V1": [0.5, -1.25, 2.0, 0.0],
+        "Amount": [10.0, 20.5, 3.0, 7.25],
+        "Class": [0, 1, 0, 0]
+    }).to_csv(test_csv, index=False)
+
+    first = load_data(test_csv, cache=True)
+    cached = load_data(test_csv, columns=["V1", "Class"], cache=True)
+    assert len(glob.glob(f"{test_csv}.*.parquet")) == 1
+    assert list(cached.columns) == ["V1", "Class"]
+    assert str(cached["V1"].dtype) == "float32" and str(cached["Class"].dtype) == "int8"
+    assert cached["V1"].tolist() == first["V1"].tolist()
+
+    # Changing the CSV invalidates the cache and replaces the stale file
+    pd.DataFrame({"V1": [1.0], "Amount": [1.0], "Class": [1]}).to_csv(test_csv, index=False)
+    os.utime(test_csv, ns=(0, 0))
+    assert load_data(test_csv, cache=True).shape[0] == 1
+    assert len(glob.glob(f"{test_csv}.*.parquet")) == 1
+
+    for path in glob.glob(f"{test_csv}*"):
+        os.remove(path)
+    print("✅ test_load_data_cache passed.")
+
 if __name__ == "__main__":
-    test_load_and_clean_data()
\ No newline at end of file
+    test_load_and_clean_data()
+    test_chunked_load_and_clean_data()
+    test_clean_data_formats_and_stats()
+    test_load_data_cache()
\ No newline at end of file